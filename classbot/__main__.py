@@ -1,10 +1,33 @@
 import sys
+import time
 import signal
+from concurrent.futures import ThreadPoolExecutor
 
-from .utils import DiscordNotifier, env
-from .scripts.fsu_enroll import FSU_Enroller
+# Start the clock before any of our heavier imports
+_import_start = time.monotonic()
+
+# History queries don't need any of the bot's config, so skip it entirely
+if sys.argv[1:2] == ["history"]:
+    from .history.cli import main
+    sys.exit(main(sys.argv[2:]))
+
+# Docker's HEALTHCHECK, which asks a running bot's health endpoint (if any) how it's doing
+if sys.argv[1:2] == ["healthcheck"]:
+    from .healthcheck import check
+    sys.exit(check())
+
+# Benchmarks bring their own accounts and servers, so fill in config first
+if sys.argv[1:2] == ["bench"]:
+    from .bench import prepare_env
+    prepare_env()
+
+from .utils import DiscordNotifier, NotifierQueue, load_accounts, env
+from .utils.tracing import Tracer
+from .drivers import init_driver
 from .version import __version__, __author__, __email__
 
+_import_time = time.monotonic() - _import_start
+
 class Classbot:
 
     def __init__(self):
@@ -29,25 +52,89 @@ class Classbot:
             print("ERROR: Environment variable 'DISCORD_URL' not set.")
             return
 
+        # Time every part of startup, so slow boots are easy to pin down
+        self.startup = Tracer()
+        self.startup.record("imports", _import_time)
+
         # Init DiscordNotifier
-        self.notifier = DiscordNotifier(env.discord_url)
+        # If running in the background, wrap it so the loop never waits on it
+        with self.startup.span("notifier"):
+            self.notifier = DiscordNotifier(env.discord_url)
+            if env.discord_background:
+                self.notifier = NotifierQueue(self.notifier, env.discord_queue_size)
+
+        # Start the driver right away, it's by far the slowest part of booting
+        # NOTE: Everything else below overlaps with it
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="boot")
+        self.accounts = load_accounts(env.accounts_file) if env.accounts_file else None
+        driver_future = executor.submit(self.start_driver) \
+            if self.accounts is None else None
 
-        # Initialize our driver and start it up
-        self.driver = self.init_driver()
-        self.script = FSU_Enroller(self.driver, self.notifier)
+        # Notify discord that we're starting
+        # If we're not queueing notifications, send it on the side so we don't wait
+        boot_embed = dict(
+            title="Classbot-3.0 is booting up!",
+            description=(f"Username: `{env.username}`\n" if self.accounts is None \
+                else f"Accounts: `{len(self.accounts)}`\n") + \
+                f"Driver: `{env.driver}`",
+            color=DiscordNotifier.Colors.INFO
+        )
+        boot_future = executor.submit(self.notifier.send_embed, **boot_embed)
+
+        # Cache logged in sessions on disk, if we have a key to encrypt them with
+        self.session_store = None
+        if env.session_key:
+            from .utils.sessionstore import SessionStore
+            self.session_store = SessionStore(env.session_dir, env.session_key)
+
+        # Keep a history of every attempt, if asked to
+        self.history = None
+        if env.history_db:
+            from .history import AttemptHistory
+            self.history = AttemptHistory(env.history_db)
+
+        # If we have a list of accounts, supervise one worker per account
+        # Otherwise, wait on our driver and set up the enroller
+        with self.startup.span("script"):
+            if self.accounts is not None:
+                from .supervisor import Supervisor
+                self.driver = None
+                self.pool = None
+                self.script = Supervisor(self.notifier, self.accounts,
+                    session_store=self.session_store, history=self.history)
+            else:
+                from .scripts.fsu_enroll import FSU_Enroller
+                self.driver, self.pool = driver_future.result()
+                self.script = FSU_Enroller(self.driver, self.notifier,
+                    pool=self.pool, session_store=self.session_store,
+                    history=self.history)
+
+        # Serve health checks and metrics, if asked to
+        self.health = None
+        if env.health_port is not None:
+            from .utils.healthserver import HealthServer
+            self.health = HealthServer(
+                self.enrollers, self.notifier,
+                host=env.health_host, port=env.health_port, max_age=env.health_max_age,
+                start_grace=env.health_start_grace
+            ).start()
+            print(f"Serving health checks at {self.health.url}")
 
         # Register signal handlers
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
 
-        # Notify discord that we're starting
-        self.notifier.send_embed(
-            title="Classbot-3.0 is booting up!",
-            description=f"Username: `{env.username}`\n" + \
-                f"Driver: `{env.driver}`\n" + \
-                f"Script: `{self.script.__class__.__name__}`",
-            color=DiscordNotifier.Colors.INFO
+        # Report how long everything took
+        self.startup.record("total", time.monotonic() - _import_start)
+        breakdown = self.startup_breakdown()
+        print(f"Startup took {breakdown}")
+        self.notifier.update_embed(
+            boot_future.result(),
+            description=boot_embed["description"] + \
+                f"\nScript: `{self.script.__class__.__name__}`\n" + \
+                f"Startup: {breakdown}"
         )
+        executor.shutdown(wait=False)
 
     def run(self):
         """Run Classbot"""
@@ -59,24 +146,32 @@ class Classbot:
     def init_driver(self):
         """Initializes the driver, depending on env var"""
 
-        if env.driver.lower() == "firefox":
-            print("Using Firefox driver!")
-            from .drivers.firefox import FirefoxDriver
-            return FirefoxDriver().new_driver()
+        return init_driver()
 
-        elif env.driver.lower() == "browserless":
-            print("Using Browserless driver!")
-            from .drivers.browserless import BrowserlessDriver
-            return BrowserlessDriver().new_driver()
+    def start_driver(self):
+        """Starts the driver (and spare, if enabled), returns (driver, pool)"""
 
-        elif env.driver.lower() == "docker":
-            print("Using Docker driver!")
-            from .drivers.docker import DockerDriver
-            return DockerDriver().new_driver()
+        with self.startup.span("driver"):
+            if env.spare_driver:
+                from .drivers.pool import DriverPool
+                pool = DriverPool(self.init_driver)
+                return pool.active, pool
+            return self.init_driver(), None
 
-        if env.driver is None:
-            print("ERROR: Environment variable 'DRIVER' not set properly.")
-            return
+    def enrollers(self) -> list:
+        """Every live FSU_Enroller, for the health endpoint"""
+
+        if self.accounts is not None:
+            return self.script.enrollers()
+        return [self.script]
+
+    def startup_breakdown(self) -> str:
+        """One line summary of startup times"""
+
+        return ", ".join(
+            f"{name} `{hist.total:.2f}s`"
+            for name, hist in self.startup.histograms.items()
+        )
     
     def signal_handler(self, signal_num: int, _):
         """Handle SIGTERM"""
@@ -92,8 +187,11 @@ class Classbot:
                 "Regardless, shutting down...",
             color=DiscordNotifier.Colors.DANGER
         )
+        self.flush_notifier()
+        self.close_history()
+        self.dump_profile()
 
-        self.driver.quit()
+        self.quit_driver()
 
         sys.exit(0)
 
@@ -108,10 +206,45 @@ class Classbot:
                 f"`{exit_code}`!",
             color=DiscordNotifier.Colors.DANGER
         )
+        self.flush_notifier()
+        self.close_history()
+        self.dump_profile()
 
-        self.driver.quit()
+        self.quit_driver()
 
         sys.exit(exit_code)
 
+    def quit_driver(self):
+        """Close any open browser sessions"""
+
+        if self.pool is not None:
+            self.pool.quit()
+        elif self.driver is not None:
+            self.driver.quit()
+        elif self.accounts is not None:
+            self.script.quit()
+
+    def close_history(self):
+        """Make sure queued attempts are saved before we leave"""
+
+        if self.history is not None:
+            self.history.close()
+
+    def dump_profile(self):
+        """Write out the WebDriver command profile, if we kept one"""
+
+        if env.driver_profile:
+            from .drivers.profiler import dump
+            dump(env.driver_profile + ".folded")
+
+    def flush_notifier(self):
+        """Make sure queued notifications go out before we leave"""
+
+        if isinstance(self.notifier, NotifierQueue):
+            self.notifier.close(env.discord_flush_timeout)
+
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        from .bench.runner import main
+        sys.exit(main(sys.argv[2:]))
     Classbot().run()
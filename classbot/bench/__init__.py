@@ -0,0 +1,13 @@
+import os
+
+def prepare_env():
+    """
+    Fills in config the benchmark doesn't need from the user
+    - Must run before anything imports classbot.utils
+    """
+
+    os.environ.setdefault('FSU_USERNAME', 'bench')
+    os.environ.setdefault('FSU_PASSWORD', 'bench')
+    os.environ.setdefault('FSU_SEMESTER', 'fall')
+    os.environ.setdefault('DRIVER', 'firefox')
+    os.environ.setdefault('DRIVER_HEADLESS', 'true')
@@ -0,0 +1,85 @@
+import html
+from urllib.parse import urlparse
+
+from ..fakes.fakesoft import FakePeopleSoft
+
+# CAS-ish sign in page
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Sign In</title></head><body>
+<form method="post" action="/login">
+{error}
+<input id="username" name="username" type="text">
+<input id="password" name="password" type="password">
+<button id="fsu-login-button" type="submit">Sign In</button>
+</form>
+</body></html>"""
+
+# Duo prompt, which "approves" itself after a delay
+DUO_PAGE = """<!DOCTYPE html>
+<html><head><title>Duo</title></head><body>
+<iframe id="duo_iframe" src="about:blank" width="400" height="300"></iframe>
+<script>setTimeout(() => {{ window.location.href = "/dashboard"; }}, {delay_ms});</script>
+</body></html>"""
+
+# myFSU dashboard, with the "Future" tab hiding the enroll link
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html><head><title>myFSU</title></head><body>
+<a id="{tab_id}" href="#" onclick="document.getElementById('future').style.display = 'block'; return false;">Future</a>
+<div id="future" style="display: none">
+<img title="Enroll in a course" style="width: 32px; height: 32px; background: #782f40"
+    onclick="window.location.href = '/omni';">
+</div>
+</body></html>"""
+
+# OMNI shell, which loads PeopleSoft in a frame
+OMNI_PAGE = """<!DOCTYPE html>
+<html><head><title>OMNI</title></head><body>
+<iframe id="main_target_win0" name="main_target_win0" src="{src}" width="1000" height="800"></iframe>
+</body></html>"""
+
+class MockPortal(FakePeopleSoft):
+    """
+    The whole path FSU_Enroller walks, served locally
+    - CAS login, optional Duo, the dashboard, the OMNI frame, then
+      FakePeopleSoft's term select, cart, confirm and results pages
+    """
+
+    tab_id = 'kgoui_Rcontent_I0_Rcolumn1_I1_Rcontent_I0_Rtabs1_label'
+
+    def __init__(self, duo_delay: float = None, password: str = "bench", **kwargs):
+        """Initialize MockPortal"""
+
+        super().__init__(**kwargs)
+        self.duo_delay = duo_delay
+        self.password = password
+
+    @property
+    def login_url(self) -> str:
+        return self.base_url + "/"
+
+    def _handle(self, method: str, path: str, form: dict, cookies: str):
+        """Serves portal pages, handing PeopleSoft ones to FakePeopleSoft"""
+
+        route = urlparse(path).path
+
+        if route == "/" and method == "GET":
+            return 200, LOGIN_PAGE.format(error="")
+
+        if route == "/login" and method == "POST":
+            if form.get('password') != self.password:
+                return 200, LOGIN_PAGE.format(
+                    error='<div id="msg">Invalid credentials.</div>'
+                )
+            page = DUO_PAGE.format(delay_ms=int(self.duo_delay * 1000)) \
+                if self.duo_delay is not None else DASHBOARD_PAGE.format(tab_id=self.tab_id)
+            return 200, page, {
+                "Set-Cookie": f"{self.cookie_name}={self.token}; Path=/"
+            }
+
+        if route == "/dashboard":
+            return 200, DASHBOARD_PAGE.format(tab_id=self.tab_id)
+
+        if route == "/omni":
+            return 200, OMNI_PAGE.format(src=html.escape(self.cart_path + "?term=1"))
+
+        return super()._handle(method, path, form, cookies)
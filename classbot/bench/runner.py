@@ -0,0 +1,190 @@
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+
+from ..utils import DiscordNotifier, NotifierQueue, Account, env
+from ..fakes.fakehook import FakeWebhookServer
+from ..drivers import init_driver
+from ..scripts.fsu_enroll import FSU_Enroller
+from .portal import MockPortal
+
+# Spans worth reporting, in the order they happen
+REPORT_SPANS = [
+    "auth", "login", "duo", "nav", "cycle", "cart", "proceed", "submit",
+    "results", "start_over", "fastpath", "sleep"
+]
+
+def count_commands(driver) -> Counter:
+    """Counts every command a driver sends, by name (DevTools methods, for DRIVER=cdp)"""
+
+    counts = Counter()
+    name = "execute" if hasattr(driver, "execute") else "_execute"
+    execute = getattr(driver, name)
+
+    def counted(command, *args, **kwargs):
+        counts[command] += 1
+        return execute(command, *args, **kwargs)
+
+    setattr(driver, name, counted)
+    return counts
+
+def parse_args(argv: list):
+    """Parses benchmark options"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m classbot bench",
+        description="Runs FSU_Enroller against a local mock of the portal."
+    )
+    parser.add_argument("--latency", type=float, default=0.0,
+        help="seconds of server latency to add to every request")
+    parser.add_argument("--seat-open-after", type=float, default=10.0,
+        help="seconds after the loop starts to open every seat")
+    parser.add_argument("--courses", default="COP 3014,MAC 2311",
+        help="comma separated courses to put in the cart")
+    parser.add_argument("--duo-delay", type=float, default=None,
+        help="if set, show a Duo prompt that approves itself after this many seconds")
+    parser.add_argument("--max-time", type=float, default=120.0,
+        help="seconds before giving up, by emptying the cart")
+    parser.add_argument("--json", dest="json_path", default=None,
+        help="also write the report to this file")
+    return parser.parse_args(argv)
+
+def main(argv: list):
+    """Runs a benchmark and prints a report"""
+
+    args = parse_args(argv)
+    courses = [c.strip() for c in args.courses.split(",") if c.strip()]
+
+    # Start up our fakes
+    portal = MockPortal(
+        courses=courses, latency=args.latency,
+        duo_delay=args.duo_delay, password="bench"
+    ).start()
+    webhook = FakeWebhookServer().start()
+    notifier = DiscordNotifier(webhook.webhook_url(), url_base=webhook.url_base)
+    if env.discord_background:
+        notifier = NotifierQueue(notifier, env.discord_queue_size)
+    print(f"Mock portal at {portal.login_url}, fake webhook at {webhook.webhook_url()}")
+
+    # Real driver, real enroller
+    driver = init_driver()
+    commands = count_commands(driver)
+    enroller = FSU_Enroller(driver, notifier, account=Account("bench", "bench", "fall"))
+    enroller.login_url = portal.login_url
+
+    # Open seats once the loop has been going for a bit
+    opened = {}
+    def open_seats():
+        while "cycle" not in enroller.tracer.histograms:
+            time.sleep(0.05)
+        time.sleep(args.seat_open_after)
+        for course in courses:
+            opened[course] = time.time()
+            portal.open_seat(course)
+    threading.Thread(target=open_seats, daemon=True).start()
+
+    # Give up eventually, by emptying the cart out from under it
+    def watchdog():
+        time.sleep(args.max_time)
+        with portal._lock:
+            portal.cart.clear()
+    threading.Thread(target=watchdog, daemon=True).start()
+
+    # Run it
+    start = time.monotonic()
+    try:
+        exit_code = enroller.run()
+    finally:
+        elapsed = time.monotonic() - start
+        driver.quit()
+        if isinstance(notifier, NotifierQueue):
+            notifier.close(env.discord_flush_timeout)
+        portal.stop()
+        webhook.stop()
+        if env.driver_profile:
+            from ..drivers.profiler import dump
+            dump(env.driver_profile + ".folded")
+
+    # Build and print the report
+    report = build_report(enroller, portal, webhook, commands, opened, elapsed, exit_code)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if exit_code == 0 else 1
+
+def build_report(enroller, portal, webhook, commands, opened, elapsed, exit_code) -> dict:
+    """Collects everything worth knowing about a run"""
+
+    histograms = enroller.tracer.histograms
+    loops = histograms["cycle"].count if "cycle" in histograms else 0
+    loop_time = histograms["cycle"].total + histograms["sleep"].total \
+        if "cycle" in histograms and "sleep" in histograms else 0.0
+
+    return {
+        "exit_code": exit_code,
+        "elapsed": round(elapsed, 3),
+        "loops": loops,
+        "loops_per_sec": round(loops / loop_time, 3) if loop_time else 0.0,
+        "time_to_enroll": {
+            course: round(portal.enrolled_at[course] - opened[course], 3)
+            for course in opened if course in portal.enrolled_at
+        },
+        "spans": {
+            name: {
+                "count": histograms[name].count,
+                "p50": round(histograms[name].percentile(50), 4),
+                "p95": round(histograms[name].percentile(95), 4),
+                "p99": round(histograms[name].percentile(99), 4),
+            }
+            for name in REPORT_SPANS if name in histograms
+        },
+        "webdriver_commands": {
+            "total": sum(commands.values()),
+            "per_loop": round(sum(commands.values()) / loops, 1) if loops else None,
+            "by_command": dict(commands.most_common()),
+        },
+        "bytes_per_loop": {
+            "p50": enroller.bytes_per_loop.percentile(50),
+            "p95": enroller.bytes_per_loop.percentile(95),
+        } if enroller.bytes_per_loop.count else None,
+        "recoveries": {a.value: n for a, n in enroller.recovery.counts.items()},
+        "locators": enroller.locator_stats(),
+        "portal_requests": portal.requests,
+        "webhook_requests": len(webhook.requests),
+        "webhook_rejected": webhook.rejected,
+    }
+
+def print_report(report: dict):
+    """Pretty prints a report"""
+
+    print("\n\n===== Classbot Benchmark =====")
+    print(f"Exit code:        {report['exit_code']}")
+    print(f"Elapsed:          {report['elapsed']:.2f}s")
+    print(f"Loops:            {report['loops']} ({report['loops_per_sec']:.2f}/s)")
+    for course, seconds in report['time_to_enroll'].items():
+        print(f"Time to enroll:   {course} in {seconds:.2f}s after its seat opened")
+
+    print(f"\n{'span':<12}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, span in report['spans'].items():
+        print(f"{name:<12}{span['count']:>7}{span['p50']:>9.3f}{span['p95']:>9.3f}{span['p99']:>9.3f}")
+
+    wd = report['webdriver_commands']
+    print(f"\nWebDriver commands: {wd['total']} ({wd['per_loop']} per loop)")
+    for command, count in wd['by_command'].items():
+        print(f"  {command:<28}{count:>6}")
+
+    if report['bytes_per_loop']:
+        print(f"\nBytes per loop:   p50 {report['bytes_per_loop']['p50']}, p95 {report['bytes_per_loop']['p95']}")
+
+    print("\nElement lookups (looked up / reused):")
+    for name, counts in report['locators'].items():
+        print(f"  {name:<20} {counts['lookups']:>6} / {counts['reuses']}")
+
+    if report['recoveries']:
+        print(f"\nRecoveries:       {report['recoveries']}")
+
+    print(f"\nPortal requests:  {report['portal_requests']}")
+    print(f"Webhook requests: {report['webhook_requests']} ({report['webhook_rejected']} rate limited)")
@@ -0,0 +1,144 @@
+import os
+import time
+import socket
+from collections import deque
+from urllib.parse import urlparse
+
+# NOTE: Like classbot.history, this package doesn't import classbot.utils,
+#       so backends can be used (and tested) without the bot's env vars
+
+def connect(url: str):
+    """
+    Opens a coordination backend from a URL
+    - sqlite:///relative.db or sqlite:////absolute.db, for nodes sharing a filesystem
+    - redis://[:password@]host:port/db, for everything else
+    """
+
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        from .sqlite import SQLiteBackend
+        return SQLiteBackend(parsed.netloc + parsed.path[1:])
+    if parsed.scheme in ("redis", "rediss"):
+        from .redis import RedisBackend
+        return RedisBackend(url)
+    raise Exception(f"Unknown coordination backend '{parsed.scheme}', use sqlite:// or redis://")
+
+class Coordinator():
+    """
+    Shares one student's work between several Classbot nodes
+    - Nodes take turns polling each term, spaced evenly across however many are alive
+    - Only the node holding a term's submit lease submits its cart
+    - Seat openings and enrollments are broadcast, so every node hears about them
+    """
+
+    def __init__(self, backend, namespace: str, node: str = None, ttl: float = 30.0):
+        """Initialize Coordinator"""
+
+        # save vars
+        self.backend = backend
+        self.namespace = namespace
+        self.node = node or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl = ttl
+
+        # local state
+        self.holding = set()
+        self._nodes = [self.node]
+        self._beat_at = 0.0
+        self._seen = deque(maxlen=1000)
+        self._started = time.time()
+
+        self.heartbeat()
+
+    def heartbeat(self) -> list:
+        """Keeps our node registered (every ttl/3 at most), returns every live node"""
+
+        if time.monotonic() - self._beat_at < self.ttl / 3:
+            return self._nodes
+        self._beat_at = time.monotonic()
+
+        key = self._key("node", self.node)
+        if not self.backend.renew(key, self.node, self.ttl):
+            self.backend.acquire(key, self.node, self.ttl)
+        self._nodes = sorted(self.backend.members(self._key("node", ""))) or [self.node]
+
+        # leases we think we hold may have lapsed while we weren't looking
+        self.holding = {k for k in self.holding if self.backend.owner(k) == self.node}
+        return self._nodes
+
+    @property
+    def nodes(self) -> list:
+        return self.heartbeat()
+
+    def turn(self, term: str, interval: float) -> float:
+        """
+        Whether it's our turn to poll a term, given how often each node wants to
+        - Returns 0 if it is, otherwise seconds until the next node's turn is up
+        """
+
+        spacing = interval / len(self.nodes)
+        key = self._key("poll", term)
+        if self.backend.acquire(key, self.node, spacing):
+            return 0.0
+        return max(self.backend.pttl(key), 0.001)
+
+    def lock_submit(self, term: str) -> bool:
+        """Takes (or keeps) the lease to submit a term's cart"""
+
+        key = self._key("submit", term)
+        if key in self.holding and self.backend.renew(key, self.node, self.ttl):
+            return True
+        if self.backend.acquire(key, self.node, self.ttl):
+            self.holding.add(key)
+            return True
+        self.holding.discard(key)
+        return False
+
+    def unlock_submit(self, term: str):
+        """Gives up a term's submit lease, if we have it"""
+
+        key = self._key("submit", term)
+        if key in self.holding:
+            self.holding.discard(key)
+            self.backend.release(key, self.node)
+
+    def submitter(self, term: str) -> str:
+        """Which node holds a term's submit lease, if any"""
+
+        return self.backend.owner(self._key("submit", term))
+
+    def publish(self, kind: str, term: str, **data):
+        """Tells every node something happened"""
+
+        self.backend.publish(self._key("events", ""), {
+            "kind": kind, "term": term, "node": self.node, "ts": time.time(), **data
+        })
+
+    def poll(self) -> list:
+        """Events from other nodes we haven't seen yet, oldest first"""
+
+        events = []
+        for event_id, event in self.backend.recent(self._key("events", "")):
+            if event_id in self._seen:
+                continue
+            self._seen.append(event_id)
+            if event.get("node") != self.node and event.get("ts", 0) >= self._started:
+                events.append(event)
+        return events
+
+    def close(self):
+        """Releases everything we hold, so other nodes can pick it up right away"""
+
+        for key in list(self.holding) + [self._key("node", self.node)]:
+            try:
+                self.backend.release(key, self.node)
+            except Exception:
+                pass
+        self.holding.clear()
+        self.backend.close()
+
+    #
+    # Helpers
+    #
+
+    def _key(self, kind: str, name: str) -> str:
+        return f"classbot:{self.namespace}:{kind}:{name}"
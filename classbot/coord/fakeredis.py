@@ -0,0 +1,257 @@
+import time
+import fnmatch
+import threading
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+class FakeRedisServer():
+    """
+    Local stand-in for the bits of Redis the coordinator uses
+    - Strings with PX expiry, lists, INCR, SCAN, and WATCH/MULTI/EXEC
+    - Expired keys are dropped lazily, like the real thing
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, password: str = None):
+        """Initialize FakeRedisServer"""
+
+        self.password = password
+
+        # state, {key: value}, {key: expires (monotonic)}, {key: version}
+        self.data = {}
+        self.expires = {}
+        self.versions = {}
+        self.commands = 0
+        self._lock = threading.Lock()
+
+        # tcp server
+        ThreadingTCPServer.allow_reuse_address = True
+        self.server = ThreadingTCPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL to hand the coordinator"""
+
+        host, port = self.server.server_address[:2]
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/0"
+
+    def start(self):
+        """Serves clients in a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="fake-redis", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shuts the server down"""
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    #
+    # Helpers
+    #
+
+    def _get(self, key: str):
+        """Value of a key, expiring it if it's due"""
+
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self._delete(key)
+        return self.data.get(key)
+
+    def _set(self, key: str, value, px: int = None):
+        self.data[key] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+        if px is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = time.monotonic() + px / 1000
+
+    def _delete(self, key: str) -> int:
+        self.expires.pop(key, None)
+        if self.data.pop(key, None) is None:
+            return 0
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return 1
+
+    def _version(self, key: str) -> int:
+        self._get(key)
+        return self.versions.get(key, 0)
+
+    def _apply(self, args: list):
+        """Runs one command, returns its reply (exceptions become error replies)"""
+
+        name, args = args[0].upper(), args[1:]
+        self.commands += 1
+
+        if name == "PING":
+            return "+PONG"
+        if name == "SELECT":
+            return "+OK"
+        if name == "GET":
+            return self._get(args[0])
+        if name == "SET":
+            key, value, opts = args[0], args[1], [a.upper() for a in args[2:]]
+            exists = self._get(key) is not None
+            if ("NX" in opts and exists) or ("XX" in opts and not exists):
+                return None
+            px = None
+            if "PX" in opts:
+                px = int(args[2 + opts.index("PX") + 1])
+            elif "EX" in opts:
+                px = int(args[2 + opts.index("EX") + 1]) * 1000
+            self._set(key, value, px)
+            return "+OK"
+        if name == "DEL":
+            return sum(self._delete(k) for k in args if self._get(k) is not None)
+        if name == "PEXPIRE":
+            if self._get(args[0]) is None:
+                return 0
+            self.expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+            self.versions[args[0]] += 1
+            return 1
+        if name == "PTTL":
+            if self._get(args[0]) is None:
+                return -2
+            if args[0] not in self.expires:
+                return -1
+            return int((self.expires[args[0]] - time.monotonic()) * 1000)
+        if name == "INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self._set(args[0], str(value), None)
+            return value
+        if name == "RPUSH":
+            items = self._get(args[0]) or []
+            items.extend(args[1:])
+            self._set(args[0], items, None)
+            return len(items)
+        if name in ("LTRIM", "LRANGE"):
+            items = self._get(args[0]) or []
+            start, stop = int(args[1]), int(args[2])
+            start = max(start + len(items) if start < 0 else start, 0)
+            stop = stop + len(items) if stop < 0 else stop
+            picked = items[start:stop + 1]
+            if name == "LRANGE":
+                return picked
+            if picked:
+                self._set(args[0], picked, None)
+            else:
+                self._delete(args[0])
+            return "+OK"
+        if name == "SCAN":
+            opts = [a.upper() for a in args]
+            pattern = args[opts.index("MATCH") + 1] if "MATCH" in opts else "*"
+            keys = [k for k in list(self.data) if self._get(k) is not None]
+            return ["0", [k for k in keys if fnmatch.fnmatchcase(k, pattern)]]
+        raise Exception(f"ERR unknown command '{name}'")
+
+    def _make_handler(self):
+        """Builds the connection handler class bound to this server"""
+
+        server = self
+
+        class Handler(StreamRequestHandler):
+
+            def handle(self):
+                authed = server.password is None
+                watched, queued = {}, None
+                while True:
+                    args = self._read()
+                    if args is None:
+                        return
+                    name = args[0].upper()
+
+                    # connection state first
+                    if name == "AUTH":
+                        authed = args[-1] == server.password
+                        self._write("+OK" if authed else Exception("WRONGPASS invalid password"))
+                        continue
+                    if not authed:
+                        self._write(Exception("NOAUTH Authentication required."))
+                        continue
+                    if name == "WATCH":
+                        with server._lock:
+                            watched.update({k: server._version(k) for k in args[1:]})
+                        self._write("+OK")
+                        continue
+                    if name == "UNWATCH":
+                        watched = {}
+                        self._write("+OK")
+                        continue
+                    if name == "MULTI":
+                        queued = []
+                        self._write("+OK")
+                        continue
+                    if name == "DISCARD":
+                        watched, queued = {}, None
+                        self._write("+OK")
+                        continue
+                    if name == "EXEC":
+                        if queued is None:
+                            self._write(Exception("ERR EXEC without MULTI"))
+                            continue
+                        with server._lock:
+                            if any(server._version(k) != v for k, v in watched.items()):
+                                replies = None
+                            else:
+                                replies = [self._try(a) for a in queued]
+                        watched, queued = {}, None
+                        self._write(replies)
+                        continue
+                    if queued is not None:
+                        queued.append(args)
+                        self._write("+QUEUED")
+                        continue
+
+                    with server._lock:
+                        reply = self._try(args)
+                    self._write(reply)
+
+            def _try(self, args):
+                try:
+                    return server._apply(args)
+                except Exception as e:
+                    return e
+
+            def _read(self):
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                if not line.startswith(b"*"):
+                    return line.decode().split()
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(size + 2)[:-2].decode())
+                return args
+
+            def _write(self, reply):
+                self.wfile.write(self._encode(reply))
+
+            def _encode(self, reply) -> bytes:
+                if reply is None:
+                    return b"$-1\r\n"
+                if isinstance(reply, Exception):
+                    message = str(reply)
+                    return f"-{message if message[:1].isupper() else 'ERR ' + message}\r\n".encode()
+                if isinstance(reply, int):
+                    return f":{reply}\r\n".encode()
+                if isinstance(reply, list):
+                    return f"*{len(reply)}\r\n".encode() + b"".join(self._encode(r) for r in reply)
+                if reply.startswith("+"):
+                    return f"{reply}\r\n".encode()
+                data = reply.encode()
+                return b"$%d\r\n%s\r\n" % (len(data), data)
+
+        return Handler
+
+if __name__ == "__main__":
+    server = FakeRedisServer(port=6379).start()
+    print(f"Fake redis listening, use: COORD_URL={server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,195 @@
+import json
+import socket
+import threading
+from urllib.parse import urlparse, unquote
+
+# How many events each channel keeps
+MAX_EVENTS = 200
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+class RedisClient():
+    """
+    Just enough of a RESP2 client for leases and event lists
+    - One connection, serialized with a lock, reconnected on socket errors
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        """Initialize RedisClient"""
+
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.strip("/") or 0)
+        self.tls = parsed.scheme == "rediss"
+        self.timeout = timeout
+
+        self.lock = threading.RLock()
+        self._sock = None
+        self._file = None
+
+    def execute(self, *args):
+        """Sends one command, returns its reply"""
+
+        with self.lock:
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._send(args)
+                    return self._read()
+                except (OSError, EOFError):
+                    self.close()
+                    if attempt:
+                        raise
+
+    def close(self):
+        with self.lock:
+            if self._sock is not None:
+                try:
+                    self._sock.close()
+                except OSError:
+                    pass
+            self._sock = None
+            self._file = None
+
+    #
+    # Helpers
+    #
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        if self.tls:
+            import ssl
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        self._sock = sock
+        self._file = sock.makefile("rb")
+        if self.password:
+            auth = (self.username, self.password) if self.username else (self.password,)
+            self._send(("AUTH", *auth))
+            self._read()
+        if self.db:
+            self._send(("SELECT", self.db))
+            self._read()
+
+    def _send(self, args):
+        out = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(out))
+
+    def _read(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self._file.read(size + 2)
+            if len(data) < size + 2:
+                raise EOFError("connection closed")
+            return data[:-2].decode()
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise RedisError(f"bad reply {line!r}")
+
+class RedisBackend():
+    """
+    Coordination backend for nodes on different machines
+    - Leases are keys with a PX expiry, taken with SET NX
+    - Renewing and releasing check the owner inside WATCH/MULTI, so we never touch someone else's lease
+    """
+
+    def __init__(self, url: str):
+        """Initialize RedisBackend"""
+
+        self.client = RedisClient(url)
+        self.client.execute("PING")
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Takes a lease if nobody (alive) has it"""
+
+        return self.client.execute("SET", key, owner, "NX", "PX", _ms(ttl)) == "OK"
+
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        """Extends a lease, if we still hold it"""
+
+        return self._if_owner(key, owner, "PEXPIRE", key, _ms(ttl))
+
+    def release(self, key: str, owner: str) -> bool:
+        """Gives up a lease, if we still hold it"""
+
+        return self._if_owner(key, owner, "DEL", key)
+
+    def owner(self, key: str):
+        """Who holds a lease, if anyone"""
+
+        return self.client.execute("GET", key)
+
+    def pttl(self, key: str) -> float:
+        """Seconds until a lease runs out, 0 if nobody holds it"""
+
+        return max(self.client.execute("PTTL", key), 0) / 1000
+
+    def members(self, prefix: str) -> list:
+        """Live lease keys under prefix, minus the prefix"""
+
+        keys, cursor = set(), "0"
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        while True:
+            cursor, batch = self.client.execute("SCAN", cursor, "MATCH", pattern, "COUNT", 100)
+            keys.update(batch)
+            if cursor == "0":
+                return [key[len(prefix):] for key in keys]
+
+    def publish(self, channel: str, event: dict):
+        """Appends an event, dropping old ones"""
+
+        event_id = self.client.execute("INCR", channel + ":seq")
+        self.client.execute("RPUSH", channel, json.dumps({"id": event_id, **event}))
+        self.client.execute("LTRIM", channel, -MAX_EVENTS, -1)
+
+    def recent(self, channel: str) -> list:
+        """[(id, event)] of the channel's recent events, oldest first"""
+
+        events = []
+        for body in self.client.execute("LRANGE", channel, 0, -1) or []:
+            event = json.loads(body)
+            events.append((event.pop("id"), event))
+        return events
+
+    def close(self):
+        self.client.close()
+
+    #
+    # Helpers
+    #
+
+    def _if_owner(self, key: str, owner: str, *command) -> bool:
+        """Runs command on key only if owner holds it, atomically"""
+
+        with self.client.lock:
+            self.client.execute("WATCH", key)
+            if self.client.execute("GET", key) != owner:
+                self.client.execute("UNWATCH")
+                return False
+            self.client.execute("MULTI")
+            self.client.execute(*command)
+            result = self.client.execute("EXEC")
+            return bool(result and result[0])
+
+def _ms(seconds: float) -> int:
+    return max(int(seconds * 1000), 1)
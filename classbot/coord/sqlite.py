@@ -0,0 +1,147 @@
+import json
+import time
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    key     TEXT PRIMARY KEY,
+    owner   TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    ts      REAL NOT NULL,
+    body    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_channel ON events(channel, id);
+"""
+
+# How many events each channel keeps
+MAX_EVENTS = 200
+
+class SQLiteBackend():
+    """
+    Coordination backend for nodes sharing a filesystem
+    - Leases are rows with an owner and a wall clock expiry
+    - Every write runs in an immediate transaction, so SQLite's file lock makes it atomic
+    """
+
+    def __init__(self, path: str):
+        """Initialize SQLiteBackend"""
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None,
+            check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Takes a lease if nobody (alive) has it"""
+
+        with self._transaction() as conn:
+            now = time.time()
+            row = conn.execute("SELECT owner, expires FROM leases WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO leases (key, owner, expires) VALUES (?, ?, ?)",
+                (key, owner, now + ttl))
+            return True
+
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        """Extends a lease, if we still hold it"""
+
+        with self._transaction() as conn:
+            now = time.time()
+            return conn.execute(
+                "UPDATE leases SET expires = ? WHERE key = ? AND owner = ? AND expires > ?",
+                (now + ttl, key, owner, now)
+            ).rowcount == 1
+
+    def release(self, key: str, owner: str) -> bool:
+        """Gives up a lease, if we still hold it"""
+
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner)
+            ).rowcount == 1
+
+    def owner(self, key: str):
+        """Who holds a lease, if anyone"""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner FROM leases WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def pttl(self, key: str) -> float:
+        """Seconds until a lease runs out, 0 if nobody holds it"""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+        return max(row[0] - time.time(), 0.0) if row else 0.0
+
+    def members(self, prefix: str) -> list:
+        """Live lease keys under prefix, minus the prefix"""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM leases WHERE substr(key, 1, ?) = ? AND expires > ?",
+                (len(prefix), prefix, time.time())
+            ).fetchall()
+        return [key[len(prefix):] for key, in rows]
+
+    def publish(self, channel: str, event: dict):
+        """Appends an event, dropping old ones"""
+
+        with self._transaction() as conn:
+            conn.execute("INSERT INTO events (channel, ts, body) VALUES (?, ?, ?)",
+                (channel, time.time(), json.dumps(event)))
+            conn.execute("""
+                DELETE FROM events WHERE channel = ? AND id <= (
+                    SELECT id FROM events WHERE channel = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+            """, (channel, channel, MAX_EVENTS))
+
+    def recent(self, channel: str) -> list:
+        """[(id, event)] of the channel's recent events, oldest first"""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, body FROM events WHERE channel = ? ORDER BY id DESC LIMIT ?",
+                (channel, MAX_EVENTS)
+            ).fetchall()
+        return [(event_id, json.loads(body)) for event_id, body in reversed(rows)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    #
+    # Helpers
+    #
+
+    def _transaction(self):
+        return _Transaction(self)
+
+class _Transaction():
+    """BEGIN IMMEDIATE ... COMMIT, holding the backend's thread lock"""
+
+    def __init__(self, backend: SQLiteBackend):
+        self.backend = backend
+
+    def __enter__(self):
+        self.backend._lock.acquire()
+        self.backend._conn.execute("BEGIN IMMEDIATE")
+        return self.backend._conn
+
+    def __exit__(self, exc_type, *_):
+        try:
+            self.backend._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.backend._lock.release()
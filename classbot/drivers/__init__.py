@@ -0,0 +1,47 @@
+from ..utils import env
+
+def init_driver():
+    """Initializes the driver, depending on env var, profiling its commands if asked to"""
+
+    driver = new_driver()
+    if driver is not None and env.driver_profile:
+        from .profiler import profile_driver
+        profile_driver(driver, env.driver_profile)
+    return driver
+
+def new_driver():
+    """Creates the driver named by env var"""
+
+    if env.driver.lower() == "firefox":
+        print("Using Firefox driver!")
+        from .firefox import FirefoxDriver
+        return FirefoxDriver().new_driver()
+
+    elif env.driver.lower() == "browserless":
+        print("Using Browserless driver!")
+        from .browserless import BrowserlessDriver
+        return BrowserlessDriver().new_driver()
+
+    elif env.driver.lower() == "cdp":
+        print("Using CDP driver!")
+        from .cdp import CDPDriver, devtools_url
+        driver = CDPDriver(devtools_url(env.remote_url or "http://localhost:9222"))
+
+        # Chrome's already running, so all the lean profile can do is block URLs
+        if env.lean:
+            from .lean import LeanProfile
+            try:
+                LeanProfile().apply_cdp(driver)
+            except Exception:
+                driver.quit()
+                raise
+        return driver
+
+    elif env.driver.lower() == "docker":
+        print("Using Docker driver!")
+        from .docker import DockerDriver
+        return DockerDriver().new_driver()
+
+    if env.driver is None:
+        print("ERROR: Environment variable 'DRIVER' not set properly.")
+        return
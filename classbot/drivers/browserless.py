@@ -1,8 +1,12 @@
 import requests
+from urllib.parse import urlparse, quote
+from concurrent.futures import ThreadPoolExecutor
 
 from ..utils import env
+from .lean import LeanProfile
 
 from selenium import webdriver
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 
 class BrowserlessDriver():
     """Creates a remote browserless driver, which uses Chrome"""
@@ -23,29 +27,78 @@ class BrowserlessDriver():
         domain = env.remote_url.split('//')[1].split('/')[0]
 
         # make sure server url is contactable
-        try:
+        # NOTE: This runs alongside session creation rather than before it,
+        #       and is only used to explain a failure if session creation fails
+        def health_check():
             requests.get(
                 f"{protocol}://{domain}/config",
                 timeout=5
             )
-        except Exception as e:
-            raise Exception(f"Could not connect to remote server: {e}")
-        print("Able to contact remote! Making session...")
+        executor = ThreadPoolExecutor(max_workers=1)
+        health = executor.submit(health_check)
+        executor.shutdown(wait=False)
+
+        # over one DevTools WebSocket if asked to, falling back to WebDriver if we can't
+        profile = LeanProfile() if env.lean else None
+        if env.cdp:
+            try:
+                return self.new_cdp_driver(protocol, domain, profile)
+            except Exception as e:
+                print(f"WARN: Could not connect over CDP ({e}), falling back to WebDriver...")
 
         # set up options for driver
         options = webdriver.ChromeOptions()
         options.add_argument("--no-sandbox")
         options.add_argument("--headless")
+        if profile:
+            profile.apply_chrome(options)
 
         # create driver
+        # NOTE: Keep-alive explicitly, so every command reuses one connection
         remote_url = f"{protocol}://{domain}/webdriver"
         print("Remote:" + remote_url)
-        driver = webdriver.Remote(
-            command_executor=remote_url,
-            options=options
-        )
+        try:
+            driver = webdriver.Remote(
+                command_executor=RemoteConnection(remote_url, keep_alive=True),
+                options=options
+            )
+        except Exception as e:
+            if health.exception() is not None:
+                raise Exception(f"Could not connect to remote server: {health.exception()}")
+            raise e
+
+        # block urls, now that we have a session to do it in
+        if profile:
+            profile.apply_cdp(driver)
 
         # return driver
         print("Session initiated!")
         return driver
+
+    def new_cdp_driver(self, protocol: str, domain: str, profile: LeanProfile = None):
+        """Creates a driver that talks to Browserless over one DevTools WebSocket"""
+
+        from .cdp import CDPDriver
+
+        # Browserless launches Chrome with whatever flags we pass in the query
+        args = ["--no-sandbox", "--headless"] + (profile.launch_args() if profile else [])
+        # NOTE: Anything already in DRIVER_REMOTE's query (i.e. a token) is kept
+        query = [quote(arg, safe="-=,") for arg in args]
+        if urlparse(env.remote_url).query:
+            query.insert(0, urlparse(env.remote_url).query)
+        ws_url = f"{'wss' if protocol == 'https' else 'ws'}://{domain}/?" + "&".join(query)
+        print("Remote (CDP):" + ws_url)
+        driver = CDPDriver(ws_url)
+
+        # block urls, now that we have a tab to do it in
+        # NOTE: If that fails, close the tab and socket before falling back
+        if profile:
+            try:
+                profile.apply_cdp(driver)
+            except Exception:
+                driver.quit()
+                raise
+
+        print("Session initiated!")
+        return driver
     
@@ -1,4 +1,5 @@
 from ..utils import env
+from .lean import LeanProfile
 
 from selenium import webdriver
 
@@ -12,6 +13,8 @@ class DockerDriver():
         options = webdriver.FirefoxOptions()
         if env.headless:
             options.add_argument("-headless")
+        if env.lean:
+            LeanProfile().apply_firefox(options)
 
         # ensure env var was set
         if env.remote_url is None:
@@ -1,6 +1,7 @@
 import shutil
 
 from ..utils import env
+from .lean import LeanProfile
 
 from selenium import webdriver
 
@@ -19,6 +20,8 @@ class FirefoxDriver():
         options = webdriver.FirefoxOptions()
         if env.headless:
             options.add_argument("-headless")
+        if env.lean:
+            LeanProfile().apply_firefox(options)
 
         # create driver
         return webdriver.Firefox(
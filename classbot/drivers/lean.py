@@ -0,0 +1,113 @@
+from fnmatch import fnmatch
+
+from selenium.common.exceptions import WebDriverException
+
+from ..utils import env
+
+# Firefox prefs that stop each resource type from loading
+FIREFOX_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "font": {"browser.display.use_document_fonts": 0, "gfx.downloadable_fonts.enabled": False},
+    "stylesheet": {"permissions.default.stylesheet": 2},
+    "media": {"media.autoplay.default": 5, "media.preload.default": 0},
+}
+
+# URL patterns that match each resource type, for Chrome's blocklist
+CHROME_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m4a"],
+}
+
+class LeanProfile():
+    """
+    Browser settings that skip everything the bot doesn't need
+    - Eager page loads, so we don't wait on subresources
+    - Blocks resource types, and URLs matching a deny list
+    - URLs matching the allow list are dropped from the deny list
+    """
+
+    def __init__(self, block_types: list = None, block_urls: list = None,
+        allow_urls: list = None):
+        """Initialize LeanProfile"""
+
+        self.block_types = block_types if block_types is not None else env.lean_block_types
+        self.block_urls = block_urls if block_urls is not None else env.lean_block_urls
+        self.allow_urls = allow_urls if allow_urls is not None else env.lean_allow_urls
+        self.block_urls_set = block_urls is not None or env.lean_block_urls_set
+
+        # Error checking
+        unknown = set(self.block_types) - set(FIREFOX_PREFS)
+        if unknown:
+            raise Exception(f"Unknown resource types to block: {', '.join(sorted(unknown))}")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.__dict__}"
+
+    @property
+    def blocked_patterns(self) -> list:
+        """Every URL pattern we block, minus anything allowed"""
+
+        patterns = [p for t in self.block_types for p in CHROME_PATTERNS[t]] + self.block_urls
+        return [
+            p for p in patterns
+            if not any(fnmatch(p, allowed) or p == allowed for allowed in self.allow_urls)
+        ]
+
+    def apply_firefox(self, options):
+        """Applies the profile to FirefoxOptions, local or remote"""
+
+        options.page_load_strategy = "eager"
+        for resource_type in self.block_types:
+            for key, value in FIREFOX_PREFS[resource_type].items():
+                options.set_preference(key, value)
+
+        # Firefox has no pref for blocking arbitrary URLs, the default list is just skipped
+        if self.block_urls and self.block_urls_set:
+            print("WARN: DRIVER_BLOCK_URLS is only supported by Browserless and CDP, ignoring it.")
+        return options
+
+    def apply_chrome(self, options):
+        """Applies the profile to ChromeOptions"""
+
+        options.page_load_strategy = "eager"
+        if "image" in self.block_types:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+
+    def launch_args(self) -> list:
+        """Chrome flags for the profile, for browsers we launch over CDP"""
+
+        return ["--blink-settings=imagesEnabled=false"] if "image" in self.block_types else []
+
+    def apply_cdp(self, driver):
+        """Blocks URL patterns over CDP, works through webdriver.Remote too"""
+
+        patterns = self.blocked_patterns
+        if not patterns:
+            return
+
+        # Our own CDP driver can do it directly, in every tab
+        if hasattr(driver, "block_urls"):
+            driver.block_urls(patterns)
+            print(f"Blocking {len(patterns)} URL pattern(s) over CDP")
+            return
+
+        # Remote drivers don't know about chromedriver's CDP endpoint, so teach them
+        # NOTE: Leans on selenium internals, so a miss just means nothing is blocked
+        try:
+            driver.command_executor._commands["executeCdpCommand"] = \
+                ("POST", "/session/$sessionId/goog/cdp/execute")
+            driver.execute("executeCdpCommand", {"cmd": "Network.enable", "params": {}})
+            driver.execute("executeCdpCommand", {
+                "cmd": "Network.setBlockedURLs",
+                "params": {"urls": patterns}
+            })
+        except (AttributeError, TypeError, WebDriverException) as e:
+            print(f"WARN: Could not block URLs over CDP, loading them anyway: {e}")
+            return
+        print(f"Blocking {len(patterns)} URL pattern(s) over CDP")
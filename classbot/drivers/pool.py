@@ -0,0 +1,120 @@
+import time
+import threading
+
+from ..utils import env
+from ..utils.drivertools import driver_alive
+
+class DriverPool():
+    """
+    Keeps a warm spare driver around for hot failover
+    - The spare is launched (and relaunched) in the background
+    - Idle spares are pinged now and then, so remotes don't reap them
+    """
+
+    def __init__(self, factory, keepalive: float = 60):
+        """Initialize DriverPool"""
+
+        # save vars
+        self.factory = factory
+        self.keepalive = keepalive
+
+        # active driver is made right away, spare in the background
+        self.active = factory()
+        self._spare = None
+        self._spare_ready = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # stats
+        self.failovers = 0
+        self.failover_times = []
+
+        self._refill()
+
+    def failover(self):
+        """Swaps the (presumably dead) active driver for the spare"""
+
+        start = time.monotonic()
+        self.failovers += 1
+
+        # get rid of the old one, it's probably dead anyways
+        self._quit(self.active)
+
+        # wait for the spare, making sure it's still alive
+        self._spare_ready.wait(env.timeout)
+        with self._lock:
+            spare, self._spare = self._spare, None
+            self._spare_ready.clear()
+        if spare is None or not driver_alive(spare):
+            print("Spare driver not ready, launching one now...")
+            self._quit(spare)
+            spare = self.factory()
+
+        # promote it, then start on a new spare
+        self.active = spare
+        self._refill()
+
+        elapsed = time.monotonic() - start
+        self.failover_times.append(elapsed)
+        print(f"Failed over to spare driver in {elapsed:.2f}s! (Failover #{self.failovers})")
+        return self.active
+
+    def can_failover(self) -> bool:
+        """Whether we've still got failovers left in the budget"""
+
+        return not self._closed and self.failovers < env.max_failovers
+
+    def quit(self):
+        """Closes both the active and spare drivers"""
+
+        self._closed = True
+        with self._lock:
+            spare, self._spare = self._spare, None
+        self._quit(spare)
+        self._quit(self.active)
+
+    #
+    # Helpers
+    #
+
+    def _refill(self):
+        """Launches a new spare in the background"""
+
+        threading.Thread(
+            target=self._spare_worker, name="driver-spare", daemon=True
+        ).start()
+
+    def _spare_worker(self):
+        """Makes a spare, then keeps it alive until it's needed"""
+
+        # launch
+        try:
+            spare = self.factory()
+        except Exception as e:
+            print(f"\nWARN: Could not launch spare driver: {e}")
+            spare = None
+
+        with self._lock:
+            if self._closed:
+                self._quit(spare)
+                return
+            self._spare = spare
+        self._spare_ready.set()
+
+        # keepalive, until we're promoted or closed
+        while spare is not None:
+            time.sleep(self.keepalive)
+            with self._lock:
+                if self._closed or self._spare is not spare:
+                    return
+            driver_alive(spare)
+
+    def _quit(self, driver):
+        """Quits a driver, ignoring any errors"""
+
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
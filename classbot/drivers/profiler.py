@@ -0,0 +1,214 @@
+import json
+import time
+import weakref
+import threading
+from collections import OrderedDict
+
+# Every profiled driver, so enrollers can find theirs and we can dump them all on exit
+_profilers = weakref.WeakKeyDictionary()
+_all = []
+
+# Element ids remembered per profiler, so clicks can name the locator that found them
+ELEMENT_MEMORY = 512
+
+# WebDriver's key for element references in responses
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+class CommandStats():
+    """Count and total time of one command, in one phase"""
+
+    __slots__ = ("count", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+
+class CommandProfiler():
+    """
+    Times every WebDriver command a driver sends over the wire
+    - Wraps the driver's command executor, so it works for local and remote drivers alike
+    - Attributes each command to the innermost tracer span open on the calling thread
+    - Keeps a per-loop breakdown (written as JSONL) and a whole-run aggregate (folded stacks)
+    """
+
+    def __init__(self, driver, log_path: str = None):
+        """Initialize CommandProfiler, and start profiling driver"""
+
+        # where commands get attributed, set by bind()
+        self.tracer = None
+        self.tags = {}
+
+        # {(stack, command, locator): CommandStats} for this loop, and for the whole run
+        self._lock = threading.Lock()
+        self.loop = {}
+        self.total = {}
+        self.loops = 0
+
+        # element id -> locator that found it
+        self._elements = OrderedDict()
+
+        # optional jsonl output
+        self._log = open(log_path, "a", buffering=1) if log_path else None
+
+        # wrap the executor
+        executor = driver.command_executor
+        execute = executor.execute
+
+        def profiled(command, params):
+            start = time.perf_counter()
+            response = None
+            try:
+                response = execute(command, params)
+                return response
+            finally:
+                # NOTE: Profiling must never get in the way of the real response
+                try:
+                    self.record(command, params, time.perf_counter() - start, response)
+                except Exception as e:
+                    print(f"WARN: Could not profile '{command}': {e}")
+
+        executor.execute = profiled
+
+    def bind(self, tracer, **tags):
+        """Attributes commands to tracer's spans from now on"""
+
+        self.tracer = tracer
+        self.tags = tags
+
+    def record(self, command: str, params: dict, duration: float, response: dict = None):
+        """Adds a finished command"""
+
+        stack = tuple(self.tracer.stack) if self.tracer is not None else ()
+        locator = self._locator(command, params or {})
+        key = (stack, command, locator)
+
+        with self._lock:
+            self.loop.setdefault(key, CommandStats()).add(duration)
+            self.total.setdefault(key, CommandStats()).add(duration)
+
+            # remember which locator found which elements
+            if command in ("findElement", "findElements", "findChildElement", "findChildElements") \
+                and isinstance(response, dict):
+                value = response.get("value")
+                for element in value if isinstance(value, list) else [value]:
+                    if isinstance(element, dict) and ELEMENT_KEY in element:
+                        self._elements[element[ELEMENT_KEY]] = locator
+                        self._elements.move_to_end(element[ELEMENT_KEY])
+                while len(self._elements) > ELEMENT_MEMORY:
+                    self._elements.popitem(last=False)
+
+    def end_loop(self, **attrs) -> dict:
+        """Closes out a loop, returns (and logs) its summary"""
+
+        with self._lock:
+            loop, self.loop = self.loop, {}
+            self.loops += 1
+
+        summary = {
+            "loop": self.loops,
+            "commands": sum(s.count for s in loop.values()),
+            "seconds": round(sum(s.total for s in loop.values()), 6),
+            "by_phase": self._by_phase(loop),
+            **self.tags,
+            **attrs,
+        }
+        if self._log:
+            self._log.write(json.dumps({"ts": time.time(), **summary}) + "\n")
+        return summary
+
+    def folded(self, root: str = None) -> list:
+        """Whole-run aggregate as folded stacks ("a;b;command weight"), weighted in microseconds"""
+
+        with self._lock:
+            items = list(self.total.items())
+
+        lines = []
+        for (stack, command, locator), stats in sorted(items, key=lambda kv: -kv[1].total):
+            frames = ([root] if root else []) + list(stack or ("(none)",)) + \
+                [f"{command}({locator})" if locator else command]
+            lines.append(f"{';'.join(f.replace(';', ',') for f in frames)} {round(stats.total * 1e6)}")
+        return lines
+
+    def top(self, limit: int = 10) -> str:
+        """Compact table of the chattiest commands, by total time"""
+
+        with self._lock:
+            items = list(self.total.items())
+
+        lines = [f"{'phase':<18}{'command':<34}{'n':>7}{'total':>9}"]
+        for (stack, command, locator), stats in sorted(items, key=lambda kv: -kv[1].total)[:limit]:
+            name = f"{command}({locator})" if locator else command
+            phase = stack[-1] if stack else "(none)"
+            lines.append(f"{phase[:17]:<18}{name[:33]:<34}{stats.count:>7}{stats.total:>9.2f}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Closes the log file"""
+
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    #
+    # Helpers
+    #
+
+    def _locator(self, command: str, params: dict):
+        """The locator a command used, if any"""
+
+        if "using" in params and "value" in params:
+            return f"{params['using']}={params['value']}"
+        # NOTE: switchToFrame sends the element itself, rather than its id
+        element = params.get("id")
+        if isinstance(element, dict):
+            element = element.get(ELEMENT_KEY)
+        if isinstance(element, str):
+            return self._elements.get(element)
+        return None
+
+    def _by_phase(self, stats: dict) -> dict:
+        """{phase: {command: [count, seconds]}} for a loop's stats"""
+
+        phases = {}
+        for (stack, command, locator), s in stats.items():
+            phase = stack[-1] if stack else "(none)"
+            name = f"{command}({locator})" if locator else command
+            count, total = phases.setdefault(phase, {}).get(name, (0, 0.0))
+            phases[phase][name] = [count + s.count, round(total + s.total, 6)]
+        return phases
+
+def profile_driver(driver, log_path: str = None) -> CommandProfiler:
+    """Starts profiling a driver's commands"""
+
+    profiler = CommandProfiler(driver, log_path)
+    _profilers[driver] = profiler
+    _all.append(profiler)
+    return profiler
+
+def profiler_for(driver):
+    """The profiler attached to a driver, if it has one"""
+
+    try:
+        return _profilers.get(driver)
+    except TypeError:
+        return None
+
+def dump(path: str):
+    """Writes every profiler's whole-run aggregate as folded stacks, and prints the top commands"""
+
+    profilers = [p for p in _all if p.total]
+    if not profilers:
+        return
+    with open(path, "w") as f:
+        for profiler in profilers:
+            root = profiler.tags.get("account")
+            for line in profiler.folded(root):
+                f.write(line + "\n")
+            print(f"\nChattiest WebDriver commands{f' ({root})' if root else ''}:")
+            print(profiler.top())
+            profiler.close()
+    print(f"\nWebDriver profile written to {path}")
@@ -0,0 +1,2 @@
+# NOTE: Like classbot.coord and classbot.history, this package doesn't import
+#       classbot.utils, so the fakes run on their own without the bot's env vars
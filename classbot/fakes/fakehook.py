@@ -0,0 +1,191 @@
+import re
+import json
+import email
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeWebhookServer():
+    """
+    Local stand-in for Discord's webhook API
+    - Stores messages in memory, and answers with real-looking X-RateLimit-* headers
+    - Returns 429s once a webhook's bucket is spent, so limiters can be tested offline
+    """
+
+    route_re = re.compile(r"^/api/webhooks/(?P<id>[^/]+)/(?P<token>[^/?]+)(?:/messages/(?P<msg>[^/?]+))?")
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+        limit: int = 5, window: float = 2.0, latency: float = 0.0):
+        """Initialize FakeWebhookServer"""
+
+        # rate limit settings
+        self.limit = limit
+        self.window = window
+        self.latency = latency
+
+        # state
+        self.messages = {}
+        self.requests = []
+        self.rejected = 0
+        self._next_id = 1
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        # http server
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url_base(self) -> str:
+        """Base to hand DiscordNotifier instead of discord.com's"""
+
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/webhooks"
+
+    def webhook_url(self, hook_id: str = "1234", token: str = "fake") -> str:
+        """Returns a full webhook url pointing at this server"""
+
+        return f"{self.url_base}/{hook_id}/{token}"
+
+    def start(self):
+        """Serves requests in a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="fake-webhook", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shuts the server down"""
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    #
+    # Helpers
+    #
+
+    def _take(self, hook_id: str):
+        """Spends from a webhook's bucket, returns (ok, remaining, reset_after)"""
+
+        now = time.monotonic()
+        with self._lock:
+            start, used = self._buckets.get(hook_id, (now, 0))
+            if now - start >= self.window:
+                start, used = now, 0
+            reset_after = self.window - (now - start)
+            if used >= self.limit:
+                self.rejected += 1
+                return False, 0, reset_after
+            self._buckets[hook_id] = (start, used + 1)
+            return True, self.limit - used - 1, reset_after
+
+    def _handle(self, method: str, path: str, body: dict):
+        """Applies a request, returns (status, payload, headers)"""
+
+        match = self.route_re.match(path)
+        if not match:
+            return 404, {"message": "Unknown Webhook", "code": 10015}, {}
+
+        # rate limit first, like the real thing
+        hook_id = match.group('id')
+        ok, remaining, reset_after = self._take(hook_id)
+        headers = {
+            "X-RateLimit-Bucket": f"fake-{hook_id}",
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+        if not ok:
+            headers["Retry-After"] = f"{reset_after:.3f}"
+            return 429, {
+                "message": "You are being rate limited.",
+                "retry_after": round(reset_after, 3),
+                "global": False
+            }, headers
+
+        # now do the actual thing
+        with self._lock:
+            self.requests.append((method, path))
+            msg_id = match.group('msg')
+
+            if method == "POST" and msg_id is None:
+                msg_id = str(self._next_id)
+                self._next_id += 1
+                self.messages[msg_id] = dict(body, id=msg_id)
+                return 200, self.messages[msg_id], headers
+
+            if msg_id not in self.messages:
+                return 404, {"message": "Unknown Message", "code": 10008}, headers
+
+            if method == "PATCH":
+                self.messages[msg_id].update(body)
+                return 200, self.messages[msg_id], headers
+
+            if method == "DELETE":
+                del self.messages[msg_id]
+                return 204, None, headers
+
+        return 405, {"message": "405: Method Not Allowed"}, headers
+
+    def _multipart(self, content_type: str, raw: bytes) -> dict:
+        """Pulls payload_json (and attachment names and sizes) out of a file upload"""
+
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+        )
+        body, attachments = {}, []
+        for part in message.get_payload():
+            if part.get_param("name", header="content-disposition") == "payload_json":
+                body = json.loads(part.get_payload(decode=True))
+            elif part.get_filename():
+                attachments.append({
+                    "filename": part.get_filename(),
+                    "size": len(part.get_payload(decode=True)),
+                })
+        return dict(body, attachments=attachments)
+
+    def _make_handler(self):
+        """Builds the request handler class bound to this server"""
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length)
+                body = server._multipart(self.headers.get('Content-Type'), raw) \
+                    if (self.headers.get('Content-Type') or "").startswith("multipart/") \
+                    else json.loads(raw or b"{}")
+                if server.latency:
+                    time.sleep(server.latency)
+
+                status, payload, headers = server._handle(self.command, self.path, body)
+                data = json.dumps(payload).encode() if payload is not None else b""
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_POST = do_PATCH = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        Handler.protocol_version = "HTTP/1.1"
+        return Handler
+
+if __name__ == "__main__":
+    server = FakeWebhookServer(port=8765).start()
+    print(f"Fake webhook listening, use: {server.webhook_url()}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
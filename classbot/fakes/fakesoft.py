@@ -0,0 +1,309 @@
+import time
+import html
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Markup for each page, kept close enough to the real thing for our selectors
+PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title>
+<script>
+function submitAction_win0(form, action) {{
+    form.ICAction.value = action;
+    form.submit();
+}}
+</script>
+</head><body>
+<form name="win0" method="post" action="{action}">
+<input type="hidden" name="ICType" value="Panel">
+<input type="hidden" name="ICStateNum" value="{state}">
+<input type="hidden" name="ICAction" value="None">
+<input type="hidden" name="ICSID" value="{sid}">
+{body}
+</form>
+</body></html>"""
+
+GRID = """<div id="{grid_id}"><table class="PSLEVEL1GRID"><tbody>
+<tr>{headers}</tr>
+{rows}
+</tbody></table></div>"""
+
+STATUS = """<div id="win0divDERIVED_REGFRM1_SSR_STATUS_LONG${i}"><div><img src="/cs/csprd/cache/PS_CS_STATUS_{icon}_ICN_1.gif" alt="{alt}"></div></div>"""
+
+SECTION = """<span id="DERIVED_CLSRCH_DESCR200">{name}</span>
+<span id="SSR_CLS_DTL_WRK_SSR_DESCRSHORT">{status}</span>
+<span id="SSR_CLS_DTL_WRK_ENRL_CAP">{capacity}</span>
+<span id="SSR_CLS_DTL_WRK_ENRL_TOT">{enrolled}</span>
+<span id="SSR_CLS_DTL_WRK_AVAILABLE_SEATS">{available}</span>
+<span id="SSR_CLS_DTL_WRK_WAIT_TOT">0</span>"""
+
+BUTTON = """<div id="win0div{id}"><a id="{id}" href="javascript:submitAction_win0(document.win0,'{id}');">{label}</a></div>"""
+
+TERMS = ["2023 Spring", "2023 Summer", "2023 Fall"]
+
+SUCCESS_MSG = "Success: This class has been added to your schedule."
+FULL_MSG = "Error: Unable to add class - class is full."
+
+class FakePeopleSoft():
+    """
+    Local stand-in for OMNI's PeopleSoft enrollment forms
+    - Serves the term select, cart, confirm and results pages as a single win0 form
+    - Serves class search section details too, by class number (10000 + cart position)
+    - Enforces ICStateNum and a session cookie, like the real thing
+    - Seats can be opened, and sessions expired, on demand
+    """
+
+    cookie_name = "PS_TOKEN"
+    cart_path = "/psc/csprd/EMPLOYEE/SA/c/SA_LEARNER_SERVICES.SSR_SSENRL_CART.GBL"
+    search_path = "/psc/csprd/EMPLOYEE/SA/c/SA_LEARNER_SERVICES.CLASS_SEARCH.GBL"
+
+    def __init__(self, courses: list = None, host: str = "127.0.0.1",
+        port: int = 0, latency: float = 0.0):
+        """Initialize FakePeopleSoft"""
+
+        # settings
+        self.latency = latency
+
+        # enrollment state
+        self.cart = list(courses or ["COP 3014", "MAC 2311"])
+        self.open = set()
+        self.enrolled = []
+        self.enrolled_at = {}
+        self.last_results = []
+
+        # class number of each course, for section details
+        self.class_numbers = {str(10000 + i): c for i, c in enumerate(self.cart)}
+        self.capacity = 30
+
+        # session state
+        self.token = "fake-token"
+        self.sid = "fake-sid"
+        self.state = 1
+        self.page = "cart"
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        # http server
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def cart_url(self) -> str:
+        return self.base_url + self.cart_path
+
+    @property
+    def cookie(self) -> dict:
+        """Cookie a logged in browser would have, in Selenium's format"""
+
+        return {"name": self.cookie_name, "value": self.token, "path": "/"}
+
+    def start(self):
+        """Serves requests in a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="fake-peoplesoft", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shuts the server down"""
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def open_seat(self, course: str):
+        """Lets the next submit for a course succeed"""
+
+        with self._lock:
+            self.open.add(course)
+
+    def expire(self):
+        """Invalidates the current session, like a timeout or sign out would"""
+
+        with self._lock:
+            self.token = f"{self.token}-expired"
+
+    #
+    # Pages
+    #
+
+    def render(self, body: str = None, title: str = None) -> str:
+        """Renders the current page"""
+
+        if body is None:
+            title, body = getattr(self, f"_page_{self.page}")()
+        return PAGE.format(
+            title=title, action=self.cart_path,
+            state=self.state, sid=self.sid, body=body
+        )
+
+    def _page_term(self):
+        rows = "\n".join(
+            f'<tr><td><input type="radio" name="SSR_DUMMY_RECV1$sels$0" '
+            f'id="SSR_DUMMY_RECV1$sels${i}$$0" value="{i}"></td>'
+            f'<td><span id="TERM_CAR${i}">{html.escape(t)}</span></td></tr>'
+            for i, t in enumerate(TERMS)
+        )
+        return "Select Term", \
+            f'<table class="PSLEVEL2GRID"><tbody>{rows}</tbody></table>' + \
+            BUTTON.format(id="DERIVED_SSS_SCT_SSR_PB_GO", label="Continue")
+
+    def _page_cart(self):
+        if self.cart:
+            rows = "\n".join(
+                f'<tr><td><input type="checkbox" name="P_SELECT${i}"></td>'
+                f'<td><span id="P_CLASS_NAME${i}">{html.escape(c)}</span></td>'
+                f'<td>{self._status(i, c)}</td></tr>'
+                for i, c in enumerate(self.cart)
+            )
+        else:
+            rows = '<tr><td colspan="3">Your enrollment shopping cart is empty.</td></tr>'
+        return "Add Classes", \
+            GRID.format(
+                grid_id="SSR_REGFORM_VW$scroll$0",
+                headers="<th>Delete</th><th>Class</th><th>Status</th>", rows=rows
+            ) + \
+            BUTTON.format(id="DERIVED_REGFRM1_LINK_ADD_ENRL$82$", label="Proceed to Step 2 of 3")
+
+    def _status(self, i: int, course: str) -> str:
+        if course in self.open:
+            return STATUS.format(i=i, icon="OPEN", alt="Open")
+        return STATUS.format(i=i, icon="CLOSED", alt="Closed")
+
+    def _page_section(self, class_nbr: str):
+        course = self.class_numbers.get(class_nbr)
+        if course is None:
+            return "Class Search", "<span>The class number you entered does not exist.</span>"
+        available = 1 if course in self.open else 0
+        return "Class Detail", SECTION.format(
+            name=html.escape(f"{course} - 0001"), status="Open" if available else "Closed",
+            capacity=self.capacity, enrolled=self.capacity - available, available=available
+        )
+
+    def _page_confirm(self):
+        return "Confirm Classes", \
+            BUTTON.format(id="DERIVED_REGFRM1_SSR_PB_SUBMIT", label="Finish Enrolling")
+
+    def _page_results(self):
+        rows = "\n".join(
+            f'<tr><td><span>{html.escape(c)}</span></td>'
+            f'<td><div><div>{html.escape(m)}</div></div></td></tr>'
+            for c, m in self.last_results
+        )
+        return "View Results", \
+            GRID.format(
+                grid_id="SSR_SS_ERD_ER$scroll$0",
+                headers="<th>Class</th><th>Message</th>", rows=rows
+            ) + \
+            BUTTON.format(id="DERIVED_REGFRM1_SSR_LINK_STARTOVER", label="Add Another Class")
+
+    #
+    # Actions
+    #
+
+    def _submit(self):
+        """Tries to enroll in everything in the cart"""
+
+        self.last_results = []
+        for course in list(self.cart):
+            if course in self.open:
+                self.cart.remove(course)
+                self.enrolled.append(course)
+                self.enrolled_at[course] = time.time()
+                self.last_results.append((course, SUCCESS_MSG))
+            else:
+                self.last_results.append((course, FULL_MSG))
+
+    def _handle(self, method: str, path: str, form: dict, cookies: str):
+        """Applies a request, returns (status, html) or (status, html, headers)"""
+
+        with self._lock:
+            self.requests += 1
+
+            # anyone without our cookie gets bounced to a sign in page
+            if f"{self.cookie_name}={self.token}" not in (cookies or ""):
+                return 200, "<html><body><form id='login'>Sign In</form></body></html>"
+
+            # section details don't touch the cart's state
+            if method == "GET" and urlparse(path).path == self.search_path:
+                class_nbr = parse_qs(urlparse(path).query).get("CLASS_NBR", [""])[0]
+                title, body = self._page_section(class_nbr)
+                return 200, self.render(body, title)
+
+            if urlparse(path).path != self.cart_path:
+                return 404, "<html><body>Not Found</body></html>"
+
+            if method == "GET":
+                self.page = "term" if "term" in urlparse(path).query else "cart"
+                return 200, self.render()
+
+            # stale state numbers get PeopleSoft's infamous error page
+            if form.get('ICStateNum') != str(self.state):
+                return 200, "<html><body>Page data is inconsistent with database.</body></html>"
+            self.state += 1
+
+            action = form.get('ICAction')
+            if self.page == "term" and action == "DERIVED_SSS_SCT_SSR_PB_GO":
+                self.page = "cart"
+            elif self.page == "cart" and action == "DERIVED_REGFRM1_LINK_ADD_ENRL$82$":
+                self.page = "confirm"
+            elif self.page == "confirm" and action == "DERIVED_REGFRM1_SSR_PB_SUBMIT":
+                self._submit()
+                self.page = "results"
+            elif self.page == "results" and action == "DERIVED_REGFRM1_SSR_LINK_STARTOVER":
+                self.page = "cart"
+
+            return 200, self.render()
+
+    def _make_handler(self):
+        """Builds the request handler class bound to this server"""
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = {
+                    k: v[0] for k, v in
+                    parse_qs(self.rfile.read(length).decode(), keep_blank_values=True).items()
+                }
+                if server.latency:
+                    time.sleep(server.latency)
+
+                status, page, *headers = server._handle(
+                    self.command, self.path, form, self.headers.get('Cookie')
+                )
+                data = page.encode()
+
+                self.send_response(status)
+                for key, value in (headers[0] if headers else {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        Handler.protocol_version = "HTTP/1.1"
+        return Handler
+
+if __name__ == "__main__":
+    server = FakePeopleSoft(port=8766).start()
+    print(f"Fake PeopleSoft listening, cart at: {server.cart_url}")
+    print(f"Set cookie {server.cookie_name}={server.token} to get in.")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
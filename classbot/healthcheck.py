@@ -0,0 +1,22 @@
+import os
+import urllib.request
+
+# NOTE: This module deliberately doesn't import classbot.utils, so Docker's
+#       HEALTHCHECK works without loading (and validating) the bot's config
+
+def check(timeout: float = 10.0) -> int:
+    """Asks a running bot's /healthz, returns an exit code (0 if healthy or not serving)"""
+
+    port = os.getenv('HEALTH_PORT')
+    if not port:
+        return 0
+    host = os.getenv('HEALTH_HOST', '127.0.0.1')
+    if host in ("0.0.0.0", ""):
+        host = "127.0.0.1"
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/healthz", timeout=timeout) as r:
+            print(r.read().decode())
+            return 0
+    except Exception as e:
+        print(f"Unhealthy: {e}")
+        return 1
@@ -0,0 +1,169 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import deque
+
+# NOTE: This package deliberately doesn't import classbot.utils, so the
+#       query CLI works without any of the bot's env vars set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS loops (
+    id        INTEGER PRIMARY KEY,
+    ts        REAL NOT NULL,
+    account   TEXT NOT NULL,
+    duration  REAL,
+    latencies TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    loop_id   INTEGER NOT NULL REFERENCES loops(id),
+    course    TEXT NOT NULL,
+    status    TEXT,
+    submitted INTEGER NOT NULL,
+    enrolled  INTEGER NOT NULL,
+    message   TEXT
+);
+CREATE INDEX IF NOT EXISTS loops_ts ON loops(ts);
+CREATE INDEX IF NOT EXISTS attempts_course ON attempts(course, loop_id);
+"""
+
+def connect(path: str) -> sqlite3.Connection:
+    """Opens (and if needed, creates) a history database in WAL mode"""
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+class AttemptHistory():
+    """
+    Append-only SQLite log of every enrollment loop
+    - One row per loop (with step latencies), one row per cart class per loop
+    - Writes are queued and committed in batches by a background thread
+    - WAL mode, so queries can run while the bot is writing
+    """
+
+    def __init__(self, path: str, batch_size: int = 100,
+        flush_interval: float = 2.0, max_size: int = 10000):
+        """Initialize AttemptHistory"""
+
+        # settings
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+
+        # queue state
+        self._rows = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self.dropped = 0
+        self.written = 0
+
+        # open now, so a bad path fails at startup rather than in the worker
+        self._conn = connect(path)
+
+        # start up writer
+        self._worker = threading.Thread(
+            target=self._run, name="attempt-history", daemon=True
+        )
+        self._worker.start()
+
+    def record(self, account: str, duration: float, latencies: dict,
+        seat_status: dict, results: dict):
+        """
+        Queues one loop, never blocking
+        - seat_status maps course -> open/closed/waitlist/None, from the cart
+        - results is the enroller's results dict, empty if we didn't submit
+        """
+
+        row = (time.time(), account, duration, latencies, seat_status, results)
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._rows) >= self.max_size:
+                self.dropped += 1
+                return
+            self._rows.append(row)
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until everything queued has been committed"""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._rows or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"WARN: History flush timed out, {len(self._rows)} loop(s) unsaved!")
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Flushes, then stops the writer"""
+
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+        return flushed
+
+    #
+    # Helpers
+    #
+
+    def _run(self):
+        """Writer loop, commits a batch at a time"""
+
+        while True:
+
+            # wait for a full batch, the flush interval, or a flush
+            with self._cond:
+                if not self._rows and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                if not self._rows:
+                    if self._closed:
+                        self._conn.close()
+                        return
+                    continue
+                batch = list(self._rows)
+                self._rows.clear()
+                self._busy = True
+
+            # write it, all in one transaction
+            try:
+                self._write(batch)
+                self.written += len(batch)
+            except sqlite3.Error as e:
+                print(f"\nWARN: Could not save {len(batch)} loop(s) to history: {e}")
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, batch: list):
+        with self._conn:
+            for ts, account, duration, latencies, seat_status, results in batch:
+                loop_id = self._conn.execute(
+                    "INSERT INTO loops (ts, account, duration, latencies) VALUES (?, ?, ?, ?)",
+                    (ts, account, duration, json.dumps(latencies))
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO attempts (loop_id, course, status, submitted, enrolled, message) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            loop_id, course, seat_status.get(course),
+                            int(course in results),
+                            int(results.get(course, {}).get("enrolled", False)),
+                            results.get(course, {}).get("message")
+                        )
+                        for course in sorted(set(seat_status) | set(results))
+                    ]
+                )
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+from . import connect
+
+# Steps worth reporting latencies for, in the order they happen
+STEPS = ["cycle", "refresh", "cart", "proceed", "submit", "results", "start_over", "fastpath"]
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))
+    return values[idx]
+
+def parse_args(argv: list):
+    """Parses query options"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m classbot history",
+        description="Queries the attempt history the bot keeps in HISTORY_DB."
+    )
+    parser.add_argument("report", choices=["courses", "hours", "latency"],
+        help="courses: attempts per class, hours: seat openings by hour of day, "
+            "latency: step latency percentiles")
+    parser.add_argument("--db", default=os.getenv('HISTORY_DB', 'history.db'),
+        help="history database to read (default: $HISTORY_DB or history.db)")
+    parser.add_argument("--days", type=float, default=None,
+        help="only look at the last this many days")
+    parser.add_argument("--account", default=None,
+        help="only look at this account")
+    parser.add_argument("--json", action="store_true",
+        help="print JSON instead of a table")
+    return parser.parse_args(argv)
+
+def courses(conn, where: str, params: list) -> list:
+    """Per-class attempt counts"""
+
+    return [
+        dict(zip(("course", "loops", "submitted", "enrolled", "open_seen", "first", "last"), row))
+        for row in conn.execute(f"""
+            SELECT a.course, COUNT(*), SUM(a.submitted), SUM(a.enrolled),
+                SUM(a.status = 'open'), MIN(l.ts), MAX(l.ts)
+            FROM attempts a JOIN loops l ON l.id = a.loop_id
+            {where}
+            GROUP BY a.course ORDER BY a.course
+        """, params)
+    ]
+
+def hours(conn, where: str, params: list) -> list:
+    """How often seats opened (closed -> open), and were seen open, by local hour of day"""
+
+    counts = {h: {"hour": h, "checks": 0, "open_seen": 0, "openings": 0} for h in range(24)}
+    previous = {}
+    for ts, account, course, status in conn.execute(f"""
+        SELECT l.ts, l.account, a.course, a.status
+        FROM attempts a JOIN loops l ON l.id = a.loop_id
+        {where}
+        ORDER BY l.ts
+    """, params):
+        bucket = counts[datetime.fromtimestamp(ts).hour]
+        bucket["checks"] += 1
+        if status == "open":
+            bucket["open_seen"] += 1
+            if previous.get((account, course)) in ("closed", "waitlist"):
+                bucket["openings"] += 1
+        previous[(account, course)] = status
+    return [c for c in counts.values() if c["checks"]]
+
+def latency(conn, where: str, params: list) -> list:
+    """p50/p95/p99 of each step, in seconds"""
+
+    samples = {}
+    for latencies, in conn.execute(f"""
+        SELECT l.latencies FROM loops l {where}
+    """, params):
+        for step, value in json.loads(latencies or "{}").items():
+            samples.setdefault(step, []).append(value)
+
+    rows = []
+    for step in STEPS + sorted(set(samples) - set(STEPS)):
+        values = sorted(samples.get(step, []))
+        if values:
+            rows.append({
+                "step": step, "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            })
+    return rows
+
+def print_table(rows: list):
+    """Prints rows of dicts as an aligned table"""
+
+    if not rows:
+        print("No history yet.")
+        return
+
+    def fmt(value):
+        if isinstance(value, float):
+            # timestamps are big, show them as dates
+            if value > 1e9:
+                return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M")
+            return f"{value:.3f}"
+        return str(value)
+
+    keys = list(rows[0])
+    cells = [[fmt(row[k]) for k in keys] for row in rows]
+    widths = [max(len(k), *(len(c[i]) for c in cells)) for i, k in enumerate(keys)]
+    print("  ".join(k.ljust(w) for k, w in zip(keys, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+def main(argv: list):
+    """Runs a history query"""
+
+    args = parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"ERROR: No history database at '{args.db}'. Is HISTORY_DB set?")
+        return 1
+
+    # build the filter
+    clauses, params = [], []
+    if args.days is not None:
+        clauses.append("l.ts >= ?")
+        params.append(time.time() - args.days * 86400)
+    if args.account is not None:
+        clauses.append("l.account = ?")
+        params.append(args.account)
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+
+    conn = connect(args.db)
+    try:
+        rows = {"courses": courses, "hours": hours, "latency": latency}[args.report](
+            conn, where, params
+        )
+    finally:
+        conn.close()
+
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(rows)
+    return 0
@@ -1,21 +1,165 @@
+import os
 import time
+from collections import Counter
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-
-from ..utils import DiscordNotifier, env
-from ..utils.drivertools import check_xpath_exists, get_wait
+from selenium.common.exceptions import TimeoutException, WebDriverException, \
+    StaleElementReferenceException, NoSuchElementException, NoSuchFrameException
+
+from ..utils import DiscordNotifier, Account, PollScheduler, parse_windows, env
+from ..utils.tracing import Histogram, Tracer, TracedProxy
+from ..utils.changes import ChangeDetector, fingerprint
+from .fsu_fastpath import FSU_FastPath, FastPathExpired
+from .fsu_recovery import RecoveryPolicy, State, Action
+from .fsu_watch import WatcherPool, DETAIL_URL, term_code, parse_targets
+from ..utils.drivertools import get_wait, race, race_dom, read_grid, CartRow, ResultRow, \
+    snapshot_session, add_frame_cookies, restore_session, page_bytes, driver_alive
+from ..utils.locators import Locators, ElementCache
+from ..utils.flightrec import FlightRecorder
+from ..drivers.profiler import profiler_for
+from ..coord import Coordinator, connect
+
+class TermContext():
+    """Everything FSU_Enroller tracks for one term, in its own tab"""
+
+    def __init__(self, semester: str, driver):
+        """Initialize TermContext"""
+
+        # which term, and the tab it lives in
+        self.semester = semester
+        self.handle = None
+        self.term_index = None
+        self.term_name = None
+
+        # element handles in that tab, reused while they're still good
+        self.elements = ElementCache(driver)
+
+        # last seen seat status of each cart class, and whether the cart
+        # page needs reloading because we skipped submitting last time
+        self.seat_status = {}
+        self.cart_stale = False
+
+        # latest result message for each class, kept between loops
+        self.last_messages = {}
+
+        # status embed, only updated when something changes, or to heartbeat
+        self.status_msg = None
+        self.changes = ChangeDetector(env.discord_interval, env.discord_heartbeat)
+
+        # optional HTTP fast path, armed once we reach the cart
+        self.fastpath = None
+        self.fastpath_failures = 0
+
+        # set once another node enrolls us in everything
+        self.peer_done = False
+
+        # set when a watcher sees a seat open, so the next look submits no matter what
+        self.force_submit = False
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.semester!r})"
+
+    @property
+    def label(self) -> str:
+        return self.semester.title()
 
 class FSU_Enroller():
     """Main script for handling enrolling"""
 
-    def __init__(self, driver, discord) -> None:
+    # Where login starts, overridable for benchmarks
+    login_url = "http://www.my.fsu.edu"
+
+    def __init__(self, driver, discord, account: Account = None,
+        progress=None, pool=None, session_store=None, history=None) -> None:
         """Initialize EnrollMe"""
 
+        # account to enroll, defaults to the one in env vars
+        self.account = account or Account.from_env()
+
+        # times every phase, notifier calls included
+        self.tracer = Tracer(env.trace_log, tags={"account": self.account.username})
+
         # save vars from parent scope
         self.driver = driver
-        self.discord = discord
+        self.discord = TracedProxy(discord, self.tracer, "notifier")
+        self.bind_profiler()
+
+        # optional DriverPool, for hot failover
+        self.pool = pool
+
+        # one TermContext per term we're enrolling in, each gets its own tab
+        # NOTE: Terms are dropped from the list once they're done
+        self.terms = [TermContext(s, driver) for s in self.account.semesters]
+        self.all_terms = list(self.terms)
+        self.term = self.terms[0]
+        self.multi_term = len(self.terms) > 1
+
+        # optional SessionStore, so restarts can skip CAS and Duo
+        self.session_store = session_store
+        self.session = session_store.load(self.account.username) \
+            if session_store else None
+
+        # CAS page we logged in on, so its cookies get saved with the session
+        self.cas_url = None
+
+        # optional AttemptHistory, every loop gets logged to it
+        self.history = history
+
+        # optional callback(account, loop_count), used by the supervisor
+        self.progress = progress
+
+        # picks how long to sleep between loops
+        self.scheduler = PollScheduler(
+            base=env.sleep_time,
+            floor=env.sleep_floor,
+            ceiling=env.sleep_ceiling,
+            jitter=env.sleep_jitter,
+            windows=parse_windows(env.sleep_windows),
+            window_floor=env.sleep_window_floor,
+            log_path=env.sleep_log
+        )
+        self.cycle_error = False
+        self.cycle_start = None
+        self.last_delay = env.sleep_time
+
+        # optional Coordinator, shares polling and submits with other nodes
+        self.coord = Coordinator(
+            connect(env.coord_url), self.account.username, env.coord_node, env.coord_ttl
+        ) if env.coord_url else None
+
+        # optional WatcherPool, started once we reach the cart
+        self.watch_targets = parse_targets(env.watch_classes, self.account.semesters)
+        self.watchers = None
+
+        # where we are, and how to get back on track if a step fails there
+        self.state = State.LOGIN
+        self.recovery = RecoveryPolicy(env.recovery_retries)
+
+        # term whose cycle failed, so another term's good cycle can't reset its budget
+        self.failed_term = None
+
+        # kept here rather than in the loop, so recoveries pick up where we left off
+        self.loop_count = 0
+        self.exit_codes = []
+
+        # for the health endpoint: when we started, when the last loop finished,
+        # and what went wrong so far
+        self.started_at = time.monotonic()
+        self.last_loop = None
+        self.errors = Counter()
+
+        # recent pages, for post-mortems
+        self.flight = FlightRecorder(
+            per_phase=env.flight_pages,
+            max_bytes=int(env.flight_max_mb * 1024 * 1024),
+            min_interval=env.flight_interval,
+            screenshots=env.flight_screenshots
+        ) if env.flight_recorder else None
+
+        # bytes transferred per loop, if DRIVER_MEASURE_BYTES is set
+        self.bytes_per_loop = Histogram()
+        self.cycle_bytes = 0
 
     def run(self) -> None:
         """Run the enroll script"""
@@ -23,47 +167,13 @@ class FSU_Enroller():
         # Do everything in a giant try/except block
         try:
 
-            # 1.) Login
-            print("Attempting login...")
-            login_status = self.login()
-
-            # 1.1) Check for bad password
-            if login_status == 1:
-                print("Bad password")
-                self.discord.send_embed(
-                    title="Bad Password!",
-                    description="Your password is incorrect! Please check your credentials and relaunch.",
-                    color=DiscordNotifier.Colors.DANGER
-                )
-                return
-
-            # 1.2) Check for 2fa
-            elif login_status == 2:
-                duo_msg = self.discord.send_embed(
-                    title="Duo Approval Required!",
-                    description="Please accept 2FA on your device to continue.",
-                    color=DiscordNotifier.Colors.WARNING
-                )
-                self.handle_duo()
-                self.discord.update_embed(
-                    duo_msg,
-                    title="Duo Approved!",
-                    description="The script is now proceeding!",
-                    color=DiscordNotifier.Colors.SUCCESS
-                )
-
-            # 2) Navigate to Start
-            print("Navigating to Start...")
-            self.nav_to_start()
-
-            # 3) Enroll
-            print("Starting main enrollment loop...")
-            return self.main_enrollment_loop()
+            # Run, failing over to a spare driver if we have one
+            return self.run_with_failover()
 
         # Now we catch every exception we can!
 
         # In case we trigger a timeout
-        except TimeoutException:
+        except TimeoutException as e:
             print("\nEC Timeout Encountered! Exiting...")
             self.discord.send_embed(
                 title="Expected Condition Timeout Encountered!",
@@ -74,6 +184,7 @@ class FSU_Enroller():
                     "`DRIVER_TIMEOUT` or running the bot locally to debug!",
                 color=DiscordNotifier.Colors.DANGER
             )
+            self.flight_report(e)
             return -1
 
         # In case we get interrupted by a keyboard interrupt
@@ -88,23 +199,25 @@ class FSU_Enroller():
         
         # In case our connection to our browser gets refused
         # This happens if the user takes control of the browser
-        except ConnectionRefusedError:
+        except ConnectionRefusedError as e:
             print("\nConnection Refused Exception Encountered! Exiting...")
             self.discord.send_embed(
                 title="Connection Refused Encountered!",
                 description="The connection to the browser was refused! Maybe the browser is down?",
                 color=DiscordNotifier.Colors.DANGER
             )
+            self.flight_report(e)
             return -3
         
         # In case the browser window is closed
-        except WebDriverException:
+        except WebDriverException as e:
             print("\nWebDriver Exception Encountered! Exiting...")
             self.discord.send_embed(
                 title="WebDriver Exception Encountered!",
                 description="The browser window was closed! Maybe this was expected?",
                 color=DiscordNotifier.Colors.DANGER
             )
+            self.flight_report(e)
             return -4
 
         # Catch all, in case we encounter unexpected crashes
@@ -117,8 +230,233 @@ class FSU_Enroller():
                     f"`{type(e).__name__}: {str(e)}`",
                 color=DiscordNotifier.Colors.DANGER
             )
+            self.flight_report(e)
             return -5
 
+        # Let other nodes pick up our leases right away
+        finally:
+            if self.watchers is not None:
+                self.watchers.close()
+            if self.coord is not None:
+                self.coord.close()
+            if self.flight is not None:
+                self.flight.close()
+            self.tracer.close()
+
+    def authenticate(self) -> bool:
+        """
+        Step 1.) Login and Duo
+        - Returns False if we can't get in
+        """
+
+        # 1.) Login
+        print("Attempting login...")
+        self.state = State.LOGIN
+        with self.tracer.span("login"):
+            login_status = self.login()
+
+        # 1.1) Check for bad password
+        if login_status == 1:
+            print("Bad password")
+            self.discord.send_embed(
+                title="Bad Password!",
+                description="Your password is incorrect! Please check your credentials and relaunch.",
+                color=DiscordNotifier.Colors.DANGER
+            )
+            return False
+
+        # 1.2) Check for 2fa
+        elif login_status == 2:
+            self.state = State.DUO
+            duo_msg = self.discord.send_embed(
+                title="Duo Approval Required!",
+                description="Please accept 2FA on your device to continue.",
+                color=DiscordNotifier.Colors.WARNING
+            )
+            with self.tracer.span("duo"):
+                self.handle_duo()
+            self.discord.update_embed(
+                duo_msg,
+                title="Duo Approved!",
+                description="The script is now proceeding!",
+                color=DiscordNotifier.Colors.SUCCESS
+            )
+
+        return True
+
+    def run_with_failover(self):
+        """
+        Steps 1-3, as a resumable state machine
+        - If we have a saved session, try it before logging in
+        - If a step times out, recover in place and pick back up from wherever
+          that leaves us, until that state's retry budget runs out
+        - If the browser dies and we have a driver pool, swap to the spare
+          and pick back up at nav_to_start using the old session's cookies
+        """
+
+        resume = self.session is not None
+        phase = State.LOGIN
+        action = None
+        while True:
+            try:
+
+                # 0.) Get back on track, if the last attempt failed
+                if action is not None:
+                    with self.tracer.span(f"recover.{action.value}"):
+                        phase = self.recover(action)
+                    resume = resume and action != Action.LOGIN
+                    action = None
+
+                # 1.) Login, unless we can get away with reusing cookies
+                if phase == State.LOGIN:
+                    with self.tracer.span("auth"):
+                        if not (resume and self.resume_session()):
+                            if self.session_store:
+                                self.session_store.clear(self.account.username)
+                            if not self.authenticate():
+                                return
+                    phase = State.NAV
+
+                # 2) Navigate to Start, once per term
+                if phase == State.NAV:
+                    print("Navigating to Start...")
+                    with self.tracer.span("nav"):
+                        self.open_terms()
+                    phase = State.CART
+
+                # 3) Enroll
+                print("Starting main enrollment loop...")
+                return self.main_enrollment_loop()
+
+            # Portal's slow or the page shifted under us, so recover in place
+            # NOTE: Out of retries, we let run() deal with it like before
+            except (TimeoutException, StaleElementReferenceException,
+                NoSuchElementException, NoSuchFrameException) as e:
+                action = self.next_recovery(e)
+                self.failed_cycle()
+
+            # Browser died, so swap to the spare if we can
+            except (ConnectionRefusedError, WebDriverException) as e:
+
+                # NOTE: Intercepted clicks (PeopleSoft's "Processing" overlay) and JS errors
+                #       land here too, so only give up on the browser if it's really gone
+                if isinstance(e, WebDriverException) and driver_alive(self.driver):
+                    action = self.next_recovery(e)
+                    self.failed_cycle()
+                    continue
+                if self.pool is None or not self.pool.can_failover():
+                    raise
+
+                self.errors[type(e).__name__] += 1
+                print(f"\nDriver died ({type(e).__name__}), failing over...")
+                with self.tracer.span("failover"):
+                    self.driver = self.pool.failover()
+                for term in self.terms:
+                    term.elements = ElementCache(self.driver)
+                self.bind_profiler()
+                self.discord.send_embed(
+                    title="Failed Over to Spare Driver!",
+                    description=f"The browser session died (`{type(e).__name__}`), " + \
+                        f"so we swapped to a spare in `{self.pool.failover_times[-1]:.2f}s`. " + \
+                        "Resuming...",
+                    color=DiscordNotifier.Colors.WARNING
+                )
+                resume = True
+                phase = State.LOGIN
+                action = None
+
+    def next_recovery(self, error: Exception) -> Action:
+        """
+        Counts a failed step, and picks how to get back on track
+        - Out of retries, error is raised for run() to deal with like before
+        """
+
+        self.errors[type(error).__name__] += 1
+        self.record_page(self.state.value, label=type(error).__name__, force=True)
+        self.failed_term = self.term if self.cycle_start is not None else None
+        action = self.recovery.next_action(self.state)
+        if action is None:
+            print(f"\n{type(error).__name__} in '{self.state.value}', out of retries!")
+            raise error
+        print(f"\n{type(error).__name__} in '{self.state.value}', recovering ({action.value})...")
+        return action
+
+    def failed_cycle(self):
+        """
+        Feeds a cycle that blew up to the scheduler, then waits before recovering
+        - So a struggling portal gets backed off from, rather than retried flat out
+        """
+
+        if self.cycle_start is None:
+            return
+        self.scheduler.record(time.monotonic() - self.cycle_start, True)
+        self.cycle_start = None
+        with self.tracer.span("sleep"):
+            self.last_delay = self.scheduler.next_delay().delay
+            self.nap(self.last_delay)
+
+    def recover(self, action: Action) -> State:
+        """
+        Step 0.) Recover from a failed step
+        - Returns the state to carry on from
+        """
+
+        # Cheap: get back into OMNI's frame, the cart gets reloaded next loop
+        if action == Action.FRAME:
+            self.enter_frame()
+            self.term.cart_stale = True
+            return State.CART
+
+        # Less cheap: same, but reload the cart right now
+        if action == Action.REFRESH:
+            self.enter_frame()
+            self.refresh_cart()
+            return State.CART
+
+        # Expensive: back to the dashboard, open_terms reloads every tab
+        if action == Action.NAV and self.session:
+            return State.NAV
+
+        # Last resort: log in all over again
+        self.driver.switch_to.default_content()
+        return State.LOGIN
+
+    def progressed(self):
+        """
+        Marks an enrollment attempt as done
+        - Resets the retry budgets, and reports how long recovery took if we were recovering
+        - NOTE: Only called for full attempts, so login/nav loops still run out of retries
+        - NOTE: With several terms, only a good cycle of the term that failed counts
+        """
+
+        self.failed_term = None
+        elapsed = self.recovery.progressed()
+        if elapsed is not None:
+            print(f"\nRecovered after {elapsed:.1f}s")
+            self.tracer.record("recovered", elapsed)
+
+    def resume_session(self) -> bool:
+        """
+        Step 1.) Alternative, reuse cookies from a previous session
+        - Returns True if we land on the dashboard
+        """
+
+        if not self.session:
+            return False
+
+        print("Restoring previous session...")
+        self.state = State.LOGIN
+        restore_session(self.driver, self.session)
+        self.term.elements.invalidate()
+        try:
+            outcome = race(self.driver, {
+                "dashboard": EC.presence_of_element_located(Locators.DASHBOARD_TAB.locator),
+                "login": EC.presence_of_element_located(Locators.USERNAME.locator),
+            })
+        except TimeoutException:
+            return False
+        print(f"Session restore resolved to '{outcome.name}' in {outcome.elapsed:.2f}s")
+        return outcome.name == "dashboard"
 
     def login(self) -> int:
         """
@@ -127,24 +465,39 @@ class FSU_Enroller():
         """
 
         # Navigate to url
-        self.driver.get("http://www.my.fsu.edu")
+        self.goto(self.login_url)
+
+        # Still logged in (i.e. recovering from a slow portal), so CAS sends us straight on
+        outcome = race(self.driver, {
+            "login": EC.presence_of_element_located(Locators.USERNAME.locator),
+            "dashboard": EC.presence_of_element_located(Locators.DASHBOARD_TAB.locator),
+        })
+        if outcome.name == "dashboard":
+            print(f"Already logged in, on the dashboard in {outcome.elapsed:.2f}s")
+            return 0
 
         # Type in username and password
-        self.driver.find_element(By.ID, 'username').send_keys(env.username)
-        self.driver.find_element(By.ID, 'password').send_keys(env.password)
+        self.term.elements.get(Locators.USERNAME).send_keys(self.account.username)
+        self.cas_url = self.driver.current_url
+        self.term.elements.get(Locators.PASSWORD).send_keys(self.account.password)
 
         # Press enter to submit
-        self.driver.find_element(By.ID, 'fsu-login-button').click()
+        self.term.elements.click(Locators.LOGIN_BUTTON)
 
-        # Sleep a few seconds to let stuff load
-        time.sleep(2)
+        # Wait for whichever page comes up first
+        outcome = race(self.driver, {
+            "dashboard": EC.presence_of_element_located(Locators.DASHBOARD_TAB.locator),
+            "duo": EC.presence_of_element_located(Locators.DUO_FRAME.locator),
+            "bad_password": EC.presence_of_element_located(Locators.LOGIN_ERROR.locator),
+        })
+        print(f"Login resolved to '{outcome.name}' in {outcome.elapsed:.2f}s")
 
         # Check to see if bad password error exists
-        if check_xpath_exists(self.driver, '//*[@id="msg"]'):
+        if outcome.name == "bad_password":
             return 1
 
         # Check to see if 2fa modal is visible
-        if check_xpath_exists(self.driver, '//*[@id="duo_iframe"]'):
+        if outcome.name == "duo":
             return 2
 
         # Else, logged in!
@@ -160,23 +513,79 @@ class FSU_Enroller():
         # Print statement
         print(f"Duo detected, waiting for approval...", end="", flush=True)
 
-        # Main loop
-        while True:
-
-            # If iframe still there, we're not logged in yet...
-            if check_xpath_exists(self.driver, '//*[@id="duo_iframe"]'):
-                print(".", end="", flush=True)
-            else:
-                print(f"\nDuo no longer detected! Proceeding!")
-                break
-
-            # Sleep...
-            time.sleep(3)
+        # Wait for the iframe to go away, however long that takes
+        outcome = race_dom(self.driver, {
+            "approved": (Locators.DUO_FRAME.css, False),
+        }, timeout=None)
+        print(f"\nDuo no longer detected after {outcome.elapsed:.1f}s! Proceeding!")
 
         # return success
         return 0
 
 
+    def open_terms(self):
+        """
+        Step 2.) Navigate to Start, for every term
+        - The first term uses the current tab, the rest each get a new one
+        - All tabs share the one logged in session
+        """
+
+        handles = self.driver.window_handles
+        for i, term in enumerate(self.terms):
+            self.term = term
+
+            # Tabs we already have (i.e. we're recovering) go back to the dashboard
+            if term.handle in handles:
+                self.driver.switch_to.window(term.handle)
+                self.goto(self.session["url"])
+
+            # Otherwise the first term takes the current tab, which is
+            # already on the dashboard, and the rest get new ones
+            elif i > 0:
+                self.driver.switch_to.new_window('tab')
+                self.goto(self.session["url"])
+            term.handle = self.driver.current_window_handle
+
+            # The fast path was seeded from the old page, so it's no good now
+            if term.fastpath is not None:
+                term.fastpath.close()
+                term.fastpath = None
+
+            if self.multi_term:
+                print(f"Opening {term.label}...")
+            self.nav_to_start()
+
+        # Start with the first term
+        self.switch_term(self.terms[0])
+
+    def switch_term(self, term: TermContext):
+        """Moves the driver into a term's tab, and OMNI's frame within it"""
+
+        # Nothing to switch with one tab
+        if term is self.term and not self.multi_term:
+            return
+        self.term = term
+        self.enter_frame()
+
+    def enter_frame(self):
+        """Moves the driver into OMNI's frame, in the current term's tab"""
+
+        if self.term.handle is not None and \
+            self.driver.current_window_handle != self.term.handle:
+            self.driver.switch_to.window(self.term.handle)
+        else:
+            self.driver.switch_to.default_content()
+
+        # NOTE: The frame element outlives the pages loaded in it, so this is
+        #       usually a reused handle rather than a lookup
+        self.driver.switch_to.frame(self.term.elements.get(Locators.OMNI_FRAME))
+
+    def goto(self, url: str):
+        """Loads a page in the current tab, forgetting every handle in it"""
+
+        self.term.elements.invalidate()
+        self.driver.get(url)
+
     def nav_to_start(self):
         """
         Step 2.) Navigate to Start
@@ -184,236 +593,594 @@ class FSU_Enroller():
         """
 
         # Wait for dashboard to load, then click on "Future" tab of "My Courses" section
-        get_wait(self.driver).until(
-            EC.element_to_be_clickable(
-                (By.ID, 'kgoui_Rcontent_I0_Rcolumn1_I1_Rcontent_I0_Rtabs1_label')
-            )
-        ).click()
+        self.state = State.NAV
+        with self.tracer.span("nav.dashboard"):
+            self.term.elements.get(Locators.DASHBOARD_TAB)
+
+        # We're definitely logged in here, so save the session in case we
+        # fail over or restart later
+        # NOTE: CAS's cookies are what get OMNI to let us in, so we go back for them once
+        self.session = snapshot_session(self.driver,
+            visit=[self.cas_url] if self.cas_url else [], previous=self.session)
+        if self.cas_url:
+            self.cas_url = None
+            self.term.elements.invalidate()
+        if self.session_store:
+            self.session_store.save(self.account.username, self.session)
+        self.term.elements.click(Locators.DASHBOARD_TAB)
 
         # Enter enrollment website by clicking on the checkmark icon within the "Future" tab
         # We use an XPath hack to search for icon by its title attribute
-        get_wait(self.driver).until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//img[@title='Enroll in a course']")
-            )
-        ).click()
+        with self.tracer.span("nav.enroll_link"):
+            self.term.elements.click(Locators.ENROLL_LINK)
 
         # Now, we should be within OMNI, FSU's main HR webapp
         # This webapp operates using iframes, so we need to swap to it
-        get_wait(self.driver).until(
-            EC.frame_to_be_available_and_switch_to_it(
-                (By.XPATH, '//*[@id="main_target_win0"]')
-            )
-        )
+        with self.tracer.span("nav.frame"):
+            self.driver.switch_to.frame(self.term.elements.get(Locators.OMNI_FRAME))
+
+        # Pick our semester
+        self.select_term()
+
+        # OMNI's cookies too, now that we have them
+        add_frame_cookies(self.driver, self.session)
+        if self.session_store:
+            self.session_store.save(self.account.username, self.session)
+
+        # We are now on the "Add Classes Screen!"
+        self.term.cart_stale = False
+        self.record_page(State.NAV.value)
+        return 0
+
+    def select_term(self):
+        """
+        Step 2.1.) Select Term
+        - Picks the requested semester off the term select screen, inside OMNI's frame
+        """
 
         # Wait for semester table to render, then enumerate it and pick the
         # option that corresponds to the requested semester
-        semesters = get_wait(self.driver).until(
-            EC.presence_of_element_located(
-                (By.CLASS_NAME, 'PSLEVEL2GRID')
+        with self.tracer.span("nav.term_grid"):
+            semesters = self.term.elements.get(Locators.TERM_GRID).find_elements(
+                *Locators.TERM_NAMES.locator
             )
-        ).find_elements(
-            By.CSS_SELECTOR, "span[id*='TERM_CAR$']"
-        )
 
         # Loop through semesters and find the one we want
         idx = -1
         for i, semester in enumerate(semesters):
-            if env.semester in semester.text.lower():
+            if self.term.semester in semester.text.lower():
                 print(f"Found semester: {semester.text}! (Index: {i})")
+                self.term.term_name = semester.text
                 idx = i
                 break
         if idx == -1:
-            raise Exception(f"Could not find semester: {env.semester}!")
+            raise Exception(f"Could not find semester: {self.term.semester}!")
+        self.term.term_index = idx
         
         # Click on the semester
-        get_wait(self.driver).until(
-            EC.element_to_be_clickable(
-                (By.ID, f"SSR_DUMMY_RECV1$sels${idx}$$0")
-            )
-        ).click()
+        with self.tracer.span("nav.term_select"):
+            self.term.elements.click(Locators.TERM_RADIO.format(idx))
 
         # Press "Continue" on term select screen
-        get_wait(self.driver).until(
-            EC.element_to_be_clickable(
-                (By.ID, 'DERIVED_SSS_SCT_SSR_PB_GO')
-            )
-        ).click()
-
-        # We are now on the "Add Classes Screen!"
-        return 0
+        with self.tracer.span("nav.continue"):
+            self.term.elements.click(Locators.TERM_CONTINUE)
 
     def main_enrollment_loop(self):
         """
         Step 3.) Main Enrollment Loop
         - This loop handles the main enrollment process
+        - With several terms, each loop runs one attempt per term, in turn
         """
 
-        # Variable declarations
-        loop_count = 0
-
         # Send discord message to let user know we've begun the loop
-        start_msg = self.discord.send_embed(
-            title="Enrollment Loop Started!",
-            description=f"Loop count: `{loop_count}`",
-            color=DiscordNotifier.Colors.LIGHT
-        )
+        # If supervised, progress is reported there instead
+        # NOTE: Each term gets its own status message, which survives recoveries
+        if self.progress is None:
+            for term in self.terms:
+                if term.status_msg is None:
+                    term.status_msg = self.discord.send_embed(
+                        title=self.titled("Enrollment Loop Started!", term),
+                        description=f"Loop count: `{self.loop_count}`",
+                        color=DiscordNotifier.Colors.LIGHT
+                    )
+
+        # Start watching sections, now that we have cookies for them
+        self.start_watchers()
 
         # By this point, we should be on the cart screen...
         while True:
 
-            # Set up a few vars to be used within our try/except block
-            results = {}
+            # Increment loop count
+            self.loop_count += 1
+
+            # Catch up on what other nodes saw
+            self.coord_events()
+
+            # One attempt per term, dropping any that are done
+            # NOTE: With other nodes, terms are polled in turns, so we skip any that aren't ours
+            waits = []
+            for term in list(self.terms):
+                wait = self.coord_turn(term) if not term.force_submit else 0.0
+                if wait:
+                    waits.append(wait)
+                    continue
+                self.switch_term(term)
+                code = self.term_cycle(term, self.loop_count)
+                if code is not None:
+                    self.exit_codes.append(code)
+                    self.terms.remove(term)
+
+            # Close out this loop's WebDriver command breakdown, if profiling
+            if self.profiler is not None:
+                self.profiler.end_loop(loop=self.loop_count)
+
+            # Every term's done, so we are too
+            # NOTE: An empty cart in any term is still reported as one
+            if not self.terms:
+                return min(self.exit_codes)
+            self.last_loop = time.monotonic()
+
+            # Report loop count
+            if self.progress is not None:
+                self.progress(self.account, self.loop_count)
+            else:
+                print(f"\rLoop Counter: {self.loop_count}", end="", flush=True)
 
-            # Do everything within a try to catch exceptions
-            try:
+            # We sleep and go again!
+            # NOTE: The browser's idle while we sleep, so that's when we snapshot it
+            with self.tracer.span("sleep"):
+                self.last_delay = self.scheduler.next_delay().delay
+                delay = min([self.last_delay] + waits)
+                self.nap(max(0.0, delay - self.record_page(self.state.value)))
 
-                # Get shopping cart table
-                # NOTE: Now THIS is some functional programming!
-                cart_rows = get_wait(self.driver).until(
-                    EC.presence_of_element_located(
-                        (By.ID, 'SSR_REGFORM_VW$scroll$0') # Parent Table
-                    )
-                ).find_element(
-                    By.CSS_SELECTOR, "table[class='PSLEVEL1GRID']" # Class Table
-                ).find_element(
-                    By.CSS_SELECTOR, "tbody" # Body
-                ).find_elements(
-                    By.CSS_SELECTOR, "tr" # Here are our entries!
-                )
+    def term_cycle(self, term: TermContext, loop_count: int):
+        """
+        Step 3.0) One loop's worth of work for one term
+        - Returns an exit code once the term is done, None otherwise
+        """
 
-                # Make sure we actually have classes to enroll into
-                # There are always at least 2 rows in the table:
-                # - If empty cart, first TR is the empty header row, second empty cart message row
-                # - If cart has classes, first TR is the header row, second is the first class
-                # First see if the table format has changed for whatever reason
-                if len(cart_rows) < 2:
-                    raise EmptyCartException("Less than two rows? Something went wrong!")
-
-                # NOTE: Don't like this comparison because it's hardcoded, but
-                # at the same time, using `in` seems so expensive, so whatever...
-                elif cart_rows[1].text == "Your enrollment shopping cart is empty.":
-                    raise EmptyCartException("Your shopping cart is empty!")
-                
-                # If classes exist, lets try enrolling!
-                # Click "Proceed to Step 2 of 3"
-                get_wait(self.driver).until(
-                    EC.element_to_be_clickable(
-                        (By.ID, 'DERIVED_REGFRM1_LINK_ADD_ENRL$82$')
-                    )
-                ).click()
+        # Do everything within a try to catch exceptions
+        try:
 
-                # Now we should be on the confirmation screen
-                # Click "Finish Enrolling"
-                get_wait(self.driver).until(
-                    EC.element_to_be_clickable(
-                        (By.ID, 'DERIVED_REGFRM1_SSR_PB_SUBMIT')
-                    )
-                ).click()
+            # Run one attempt, over HTTP if we can
+            self.cycle_start = time.monotonic()
+            self.cycle_error = False
+            self.cycle_bytes = 0
+            with self.tracer.capture() as latencies, self.tracer.span("cycle"):
+                try:
+                    results = self.enroll_cycle()
+                finally:
+                    self.release_submit(term)
+            cycle_time = time.monotonic() - self.cycle_start
+            self.cycle_start = None
+            self.scheduler.record(cycle_time, self.cycle_error)
+            if self.failed_term in (None, term):
+                self.progressed()
+            if self.history is not None:
+                self.history.record(self.account.username, cycle_time,
+                    latencies, term.seat_status, results)
+            if self.cycle_bytes:
+                self.bytes_per_loop.add(self.cycle_bytes)
+
+        # In case we trigger a "Empty Cart" exception
+        except EmptyCartException as e:
+            self.cycle_start = None
+
+            # Another node got there first
+            if term.peer_done:
+                print(f"\nAnother node finished enrolling{self.titled('', term)}! Exiting...")
+                if term.status_msg is not None:
+                    self.discord.delete_message(term.status_msg)
+                return 0
+
+            print(f"\nEmpty Cart Exception Encountered{self.titled('', term)}! Exiting...")
+            if term.status_msg is not None:
+                self.discord.delete_message(term.status_msg)
+            self.discord.send_embed(
+                title=self.titled("Empty Cart Exception Encountered!", term),
+                description=str(e), # cast to string to get text
+                color=DiscordNotifier.Colors.DANGER
+            )
+            return -6
+
+        # Update webhook if the cart or results changed, or to heartbeat
+        for course_code, result in results.items():
+            term.last_messages[course_code] = result["message"]
+        if term.status_msg is not None and term.changes.check(
+            fingerprint(term.seat_status, term.last_messages)
+        ):
+            self.discord.update_embed(
+                term.status_msg,
+                description=self.status_description(loop_count)
+            )
 
-                # Now we should be on the results screen
-                # Get the results table
-                results_table = get_wait(self.driver).until(
-                    EC.presence_of_element_located(
-                        (By.ID, 'SSR_SS_ERD_ER$scroll$0')
-                    )
-                ).find_element(
-                    By.CSS_SELECTOR, "table[class='PSLEVEL1GRID']"
-                ).find_element(
-                    By.CSS_SELECTOR, "tbody"
-                ).find_elements(
-                    By.CSS_SELECTOR, "tr"
-                )
-                
-                # Loop through results table and check for errors
-                for i, row in enumerate(results_table):
+        # Now, send an update message to discord if applicable:
+        # - If any of our results were successes, send message
+        # - If ALL of our results were successes, send message and exit
+        res_bools = [result["enrolled"] for result in results.values()]
+        if any(res_bools):
 
-                    # Skip first row (header)
-                    if i == 0:
-                        continue
+            # let other nodes know, so they don't report our cart as empty
+            if self.coord is not None:
+                self.coord.publish("enrolled", term.semester, all=all(res_bools),
+                    courses=[c for c, r in results.items() if r["enrolled"]])
 
-                    # Get the cells of the row
-                    cells = row.find_elements(
-                        By.CSS_SELECTOR, "td"
-                    )
+            # if all, set title; else if some, set title
+            if all(res_bools):
+                title = "Successfully Enrolled in All Remaining Classes!"
+            else:
+                title = "Successfully Enrolled in Some Classes..."
 
-                    # Extract data from cells
-                    course_code = cells[0].find_element(By.CSS_SELECTOR, "span").text
-                    raw_message = cells[1].find_element(By.XPATH, ".//div/div").text
-                    clean_msg = raw_message.split("</b>")[-1].split("\n")[0]
-
-                    # Append result to dictionary
-                    results[course_code.replace(" ", "")] = {
-                        "enrolled": "Success" in raw_message,
-                        "message": clean_msg
-                    }
-
-                # Click "Add another class" and start over
-                get_wait(self.driver).until(
-                    EC.element_to_be_clickable(
-                        (By.ID, 'win0divDERIVED_REGFRM1_SSR_LINK_STARTOVER')
-                    )
-                ).click()
-            
-            # In case we trigger a "Empty Cart" exception
-            except EmptyCartException as e:
-                print("\nEmpty Cart Exception Encountered! Exiting...")
-                self.discord.delete_message(start_msg)
-                self.discord.send_embed(
-                    title="Empty Cart Exception Encountered!",
-                    description=str(e), # cast to string to get text
-                    color=DiscordNotifier.Colors.DANGER
-                )
-                return -6
+            # start message
+            message = "You're now enrolled in the following classes:"
 
-            # Increment loop count
-            loop_count += 1
+            # iterate over successful results
+            print(f"\nSuccessfully enrolled into the following courses:")
+            for course_code, result in results.items():
+                if result["enrolled"]:
+                    print("\t" + course_code)
+                    message += f"\n - `{course_code}`"
 
-            # Print loop count
-            print(f"\rLoop Counter: {loop_count}", end="", flush=True)
+            # send embed
+            self.discord.send_embed(
+                title=self.titled(title, term),
+                description=message,
+                color=DiscordNotifier.Colors.SUCCESS
+            )
 
-            # Update webhook if modulo env var
-            if loop_count % env.discord_modulo == 0:
-                self.discord.update_embed(
-                    start_msg,
-                    description=f"Loop count: `{loop_count}`",
-                )
+            # if all: done here
+            if all(res_bools):
+                return 0
 
-            # Now, send an update message to discord if applicable:
-            # - If any of our results were successes, send message
-            # - If ALL of our results were successes, send message and exit
-            res_bools = [result["enrolled"] for result in results.values()]
-            if any(res_bools):
-
-                # if all, set title; else if some, set title
-                if all(res_bools):
-                    title = "Successfully Enrolled in All Remaining Classes!"
-                else:
-                    title = "Successfully Enrolled in Some Classes..."
-
-                # start message
-                message = "You're now enrolled in the following classes:"
-
-                # iterate over successful results
-                print(f"\nSuccessfully enrolled into the following courses:")
-                for course_code, result in results.items():
-                    if result["enrolled"]:
-                        print("\t" + course_code)
-                        message += f"\n - `{course_code}`"
-
-                # send embed
-                self.discord.send_embed(
-                    title=title,
-                    description=message,
-                    color=DiscordNotifier.Colors.SUCCESS
-                )
-            
-                # if all: done here, so exit
-                if all(res_bools):
-                    return 0
+        return None
 
-            # We sleep and go again!
-            time.sleep(env.sleep_time)
+    def record_page(self, phase: str, label: str = None, force: bool = False) -> float:
+        """Snapshots the current page into the flight recorder if it's due, returns time spent"""
+
+        if self.flight is None or not (force or self.flight.due(phase)):
+            return 0.0
+        start = time.monotonic()
+        self.flight.capture(self.driver, phase, label or self.term.label, force=force)
+        return time.monotonic() - start
+
+    def flight_report(self, error: Exception):
+        """Saves the flight recording after a crash, and sends it along if asked to"""
+
+        if self.flight is None:
+            return
+        self.record_page(self.state.value, label=type(error).__name__, force=True)
+        reason = f"{type(error).__name__} in '{self.state.value}': {error}"
+        try:
+            path = self.flight.dump(env.flight_dir, self.account.username, reason)
+        except OSError as e:
+            print(f"WARN: Could not save flight recording: {e}")
+            return
+        print(f"Flight recording saved to {path}")
+
+        if env.flight_discord:
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) > DiscordNotifier.file_limit:
+                print("WARN: Flight recording is too big for Discord, not sending it.")
+                return
+            self.discord.send_file(
+                content=f"Flight recording of the last {len(self.flight.snapshots())} page(s) " + \
+                    f"before `{type(error).__name__}` in `{self.state.value}`",
+                filename=os.path.basename(path),
+                data=data
+            )
+
+    def start_watchers(self):
+        """Starts the section watchers, or hands them fresh cookies if they're running"""
+
+        if not self.watch_targets:
+            return
+        if self.watchers is not None:
+            self.watchers.reseed(self.driver.get_cookies())
+            return
+
+        self.watchers = WatcherPool.from_driver(
+            self.driver, self.watch_targets,
+            {t.semester: term_code(t.term_name) for t in self.all_terms
+                if any(t.semester == semester for semester, _ in self.watch_targets)},
+            url_template=env.watch_url or DETAIL_URL,
+            workers=env.watch_workers,
+            interval=env.watch_interval,
+            timeout=env.timeout
+        )
+        print(f"Watching {len(self.watch_targets)} section(s) with {len(self.watchers.workers)} worker(s)...")
+
+    def nap(self, seconds: float):
+        """Sleeps between loops, waking up early if a watcher sees a seat open"""
+
+        if self.watchers is None:
+            time.sleep(seconds)
+            return
+
+        for event in self.watchers.wait(seconds):
+            term = next((t for t in self.terms if t.semester == event.semester), None)
+            if term is None:
+                continue
+            print(f"\n{event.name}: seat opened{self.titled('', term)}, submitting now!")
+            term.force_submit = True
+            term.cart_stale = True
+            if self.coord is not None:
+                try:
+                    self.coord.publish("seat_open", term.semester, courses=[event.name])
+                except Exception as e:
+                    print(f"\nWARN: Could not publish seat opening: {e}")
+
+    def coord_events(self):
+        """Applies seat openings and enrollments other nodes saw"""
+
+        if self.coord is None:
+            return
+        try:
+            events = self.coord.poll()
+        except Exception as e:
+            print(f"\nWARN: Could not read coordinator events: {e}")
+            return
+
+        for event in events:
+            term = next((t for t in self.terms if t.semester == event["term"]), None)
+            if term is None:
+                continue
+            if event["kind"] == "seat_open":
+                print(f"\n{event['node']} saw open seats{self.titled('', term)}: {', '.join(event['courses'])}")
+                # NOTE: Like a watcher's, so we try right away if the submit lease is free
+                term.force_submit = True
+                term.cart_stale = True
+            elif event["kind"] == "enrolled":
+                print(f"\n{event['node']} enrolled{self.titled('', term)}: {', '.join(event['courses'])}")
+                term.peer_done = term.peer_done or event["all"]
+                term.cart_stale = True
+
+    def coord_turn(self, term: TermContext) -> float:
+        """0 if it's our turn to poll a term, otherwise seconds until the next turn"""
+
+        if self.coord is None:
+            return 0.0
+        try:
+            return self.coord.turn(term.semester, self.last_delay)
+        except Exception as e:
+            print(f"\nWARN: Coordinator unavailable, polling anyway: {e}")
+            return 0.0
+
+    def claim_submit(self) -> bool:
+        """
+        Takes the term's submit lease, so only one node submits a cart at a time
+        - Returns False if another node has it, or we can't tell
+        """
+
+        if self.coord is None:
+            return True
+        try:
+            if self.coord.lock_submit(self.term.semester):
+                return True
+            holder = self.coord.submitter(self.term.semester)
+        except Exception as e:
+            holder = None
+            print(f"\nWARN: Coordinator unavailable, not submitting: {e}")
+        if holder is not None:
+            print(f"\n{holder} is already submitting{self.titled('', self.term)}, skipping...")
+        return False
+
+    def release_submit(self, term: TermContext):
+        """Gives up a term's submit lease, if we took it"""
+
+        if self.coord is None:
+            return
+        try:
+            self.coord.unlock_submit(term.semester)
+        except Exception as e:
+            print(f"\nWARN: Could not release submit lease: {e}")
+
+    def bind_profiler(self):
+        """Attributes the driver's commands (if profiled) to our spans"""
+
+        self.profiler = profiler_for(self.driver)
+        if self.profiler is not None:
+            self.profiler.bind(self.tracer, account=self.account.username)
+
+    def titled(self, title: str, term: TermContext) -> str:
+        """Tags a title with the term, if we're enrolling in more than one"""
+
+        return f"{title} ({term.label})" if self.multi_term else title
+
+    def status_description(self, loop_count: int) -> str:
+        """Builds the status embed body"""
+
+        # One line per class, with its seat status and latest message
+        lines = [f"Loop count: `{loop_count}`"]
+        for course_code in sorted(set(self.term.seat_status) | set(self.term.last_messages)):
+            line = f"`{course_code}`: {self.term.seat_status.get(course_code) or 'unknown'}"
+            if self.term.last_messages.get(course_code):
+                line += f" - {self.term.last_messages[course_code]}"
+            lines.append(line)
+
+        if self.recovery.summary():
+            lines.append(self.recovery.summary())
+        if self.watchers is not None:
+            lines.append(self.watchers.summary())
+        if self.coord is not None:
+            lines.append(f"Node: `{self.coord.node}` ({len(self.coord.nodes)} live)")
+        if self.bytes_per_loop.count:
+            lines.append(f"KB/loop: `{self.bytes_per_loop.percentile(50) / 1024:.1f}`")
+        lines.append(f"```\n{self.tracer.summary()}\n```")
+        return "\n".join(lines)
+
+    def locator_stats(self) -> dict:
+        """Element lookups and reuses per locator, across every term's tab"""
+
+        stats = {}
+        for term in self.all_terms:
+            for kind in ("lookups", "reuses"):
+                for name, count in getattr(term.elements, kind).items():
+                    stats.setdefault(name, {"lookups": 0, "reuses": 0})[kind] += count
+        return stats
+
+    def measure_page(self):
+        """Adds the current page's transfer size to this loop's total, if measuring"""
+
+        if env.measure_bytes:
+            self.cycle_bytes += page_bytes(self.driver)
+
+    def seats_open(self, cart_rows: list) -> bool:
+        """
+        Tracks the seat status of each class in the cart
+        - Logs every open/closed/waitlist change
+        - Returns whether submitting could get us anywhere
+        """
+
+        # Skip the header row
+        statuses = {row.course_code: row.status for row in cart_rows[1:]}
+        opened = [c for c, s in statuses.items() if s == "open" and self.term.seat_status.get(c) != "open"]
+        for course_code, status in statuses.items():
+            if course_code in self.term.seat_status and self.term.seat_status[course_code] == status:
+                continue
+            print(f"\n{course_code}: {self.term.seat_status.get(course_code) or 'unknown'} -> {status or 'unknown'}")
+        self.term.seat_status = statuses
+
+        # Let other nodes know, they may be closer to a submit than we are
+        if self.coord is not None and opened:
+            try:
+                self.coord.publish("seat_open", self.term.semester, courses=opened)
+            except Exception as e:
+                print(f"\nWARN: Could not publish seat opening: {e}")
+
+        # A watcher saw a seat, so don't wait for the cart's icons to catch up
+        if self.term.force_submit:
+            self.term.force_submit = False
+            return self.claim_submit()
+
+        # Submit if anything's open, or if we can't tell
+        # NOTE: With other nodes around, only the one holding the submit lease does
+        if env.seat_gating and not any(status in ("open", None) for status in statuses.values()):
+            return False
+        return self.claim_submit()
+
+    def refresh_cart(self):
+        """Reloads the cart page, picking the term again if PeopleSoft asks for it"""
+
+        # Reload the frame, and wait for the old page to go away
+        page = self.driver.find_element(By.TAG_NAME, 'html')
+        self.term.elements.invalidate("omni")
+        self.driver.execute_script("location.replace(location.href);")
+        get_wait(self.driver).until(EC.staleness_of(page))
+
+        # A plain GET of the component can land on term select
+        outcome = race_dom(self.driver, {
+            "cart": (Locators.CART_GRID.css, True),
+            "term": (Locators.TERM_GRID.css, True),
+        }, timeout=env.timeout)
+        if outcome.name == "term":
+            self.select_term()
+        self.term.cart_stale = False
+
+    def check_cart(self, cart_rows: list):
+        """Raises EmptyCartException if there's nothing in the cart to enroll"""
+
+        # Make sure we actually have classes to enroll into
+        # There are always at least 2 rows in the table:
+        # - If empty cart, first TR is the empty header row, second empty cart message row
+        # - If cart has classes, first TR is the header row, second is the first class
+        # First see if the table format has changed for whatever reason
+        if len(cart_rows) < 2:
+            raise EmptyCartException("Less than two rows? Something went wrong!")
+
+        # NOTE: Don't like this comparison because it's hardcoded, but
+        # at the same time, using `in` seems so expensive, so whatever...
+        elif cart_rows[1].text == "Your enrollment shopping cart is empty.":
+            raise EmptyCartException("Your shopping cart is empty!")
+
+    def enroll_cycle(self) -> dict:
+        """
+        Step 3.1) One enrollment attempt
+        - Uses the HTTP fast path if enabled, falling back to Selenium
+        """
+
+        # Arm the fast path, we're sitting on the cart page right now
+        if self.term.fastpath is None and env.fast_path and \
+            self.term.fastpath_failures < env.fast_path_retries:
+            self.term.fastpath = FSU_FastPath.from_driver(self.driver, self.tracer, self.term.term_index)
+            self.term.fastpath.stale = self.term.cart_stale
+
+        # Try it, falling back to the browser if PeopleSoft disagrees
+        if self.term.fastpath is not None:
+            try:
+                with self.tracer.span("fastpath"):
+                    return self.term.fastpath.cycle(self.check_cart, self.seats_open)
+            except FastPathExpired as e:
+                self.errors["FastPathExpired"] += 1
+                print(f"\nFast path expired ({e}), falling back to Selenium...")
+                self.term.fastpath.close()
+                self.term.fastpath = None
+                self.term.fastpath_failures += 1
+                self.cycle_error = True
+
+                # The browser's page is stale now, so start from the dashboard again
+                self.driver.switch_to.default_content()
+                self.goto(self.session["url"])
+                self.nav_to_start()
+
+        return self.selenium_cycle()
+
+    def selenium_cycle(self) -> dict:
+        """
+        Step 3.2) One enrollment attempt, in the browser
+        """
+
+        results = {}
+
+        # Last look at the cart didn't submit, so get a fresh one
+        self.state = State.CART
+        if self.term.cart_stale:
+            with self.tracer.span("refresh"):
+                self.refresh_cart()
+
+        # Get shopping cart table, all in one round trip
+        with self.tracer.span("cart"):
+            cart_rows = read_grid(self.driver, Locators.CART_GRID.value, CartRow)
+        self.check_cart(cart_rows)
+
+        # Nothing's open, so don't waste a submit, just look again next time
+        if not self.seats_open(cart_rows):
+            self.measure_page()
+            self.term.cart_stale = True
+            return results
+
+        # If classes exist, lets try enrolling!
+        # Click "Proceed to Step 2 of 3"
+        self.state = State.CONFIRM
+        self.measure_page()
+        with self.tracer.span("proceed"):
+            self.term.elements.click(Locators.PROCEED)
+
+        # Now we should be on the confirmation screen
+        # Click "Finish Enrolling"
+        with self.tracer.span("submit"):
+            if env.measure_bytes:
+                self.term.elements.get(Locators.SUBMIT)
+                self.measure_page()
+            self.term.elements.click(Locators.SUBMIT)
+
+        # Now we should be on the results screen
+        # Get the results table, skipping the header row
+        self.state = State.RESULTS
+        with self.tracer.span("results"):
+            for row in read_grid(self.driver, Locators.RESULTS_GRID.value, ResultRow)[1:]:
+                results[row.course_code] = {
+                    "enrolled": row.enrolled,
+                    "message": row.message
+                }
+
+        self.measure_page()
+
+        # Click "Add another class" and start over
+        with self.tracer.span("start_over"):
+            self.term.elements.click(Locators.START_OVER)
+
+        return results
 
 class EmptyCartException(Exception):
     pass
@@ -0,0 +1,173 @@
+from contextlib import nullcontext
+from urllib.parse import urljoin
+
+import requests
+
+from ..utils import env
+from ..utils.drivertools import CartRow, ResultRow
+from ..utils.locators import Locators
+from ..utils.pshtml import parse_html, read_grid_html, form_fields
+
+# PeopleSoft actions, by the ID of the button that fires them
+ACTION_PROCEED = Locators.PROCEED.action
+ACTION_SUBMIT = Locators.SUBMIT.action
+ACTION_START_OVER = Locators.START_OVER.action
+ACTION_TERM_GO = Locators.TERM_CONTINUE.action
+
+# Radio group on the term select page, its value is the term's index
+TERM_FIELD = 'SSR_DUMMY_RECV1$sels$0'
+
+# Grids we read, and what we expect to land on after each action
+CART_GRID = Locators.CART_GRID.value
+RESULTS_GRID = Locators.RESULTS_GRID.value
+
+class FastPathExpired(Exception):
+    """The HTTP session no longer lines up with PeopleSoft's, fall back to Selenium"""
+    pass
+
+class FSU_FastPath():
+    """
+    Replays the cart -> confirm -> results -> start over cycle over plain HTTP
+    - Seeded from a logged in driver sitting on the cart page, inside OMNI's frame
+    - Form posts mimic what the browser sends when a button is clicked
+    """
+
+    def __init__(self, url: str, html: str, cookies: list,
+        user_agent: str = None, tracer=None, term_index: int = None):
+        """Initialize FSU_FastPath"""
+
+        # optional Tracer, spans share names with the Selenium path
+        self.tracer = tracer
+
+        # row of the term select page to pick, if a refresh lands us there
+        self.term_index = term_index
+
+        # one pooled session, with the browser's cookies
+        self.session = requests.Session()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+        # current page, and whether it needs reloading before we trust it
+        self.url = url
+        self.page = parse_html(html)
+        self.stale = False
+
+    @classmethod
+    def from_driver(cls, driver, tracer=None, term_index: int = None):
+        """Copies state out of a driver that's on the cart page"""
+
+        return cls(
+            driver.execute_script("return document.location.href;"),
+            driver.execute_script("return document.documentElement.outerHTML;"),
+            driver.get_cookies(),
+            driver.execute_script("return navigator.userAgent;"),
+            tracer,
+            term_index
+        )
+
+    def cycle(self, check_cart, gate=None) -> dict:
+        """
+        Runs one enrollment attempt, returning the same results dict as
+        FSU_Enroller's Selenium path. check_cart raises if there's nothing to do,
+        and gate(cart_rows), if given, says whether submitting is worth it.
+        """
+
+        # Last look at the cart didn't submit, so get a fresh one
+        if self.stale:
+            with self._span("refresh"):
+                self.refresh()
+
+        # Cart first, we're already sitting on it
+        with self._span("cart"):
+            cart_rows = read_grid_html(self.page, CART_GRID, CartRow)
+        if cart_rows is None:
+            raise FastPathExpired("Cart grid missing")
+        check_cart(cart_rows)
+
+        # Nothing open, so skip the submit and look again next time
+        self.stale = gate is not None and not gate(cart_rows)
+        if self.stale:
+            return {}
+
+        # Proceed, then finish enrolling
+        with self._span("proceed"):
+            self.post(ACTION_PROCEED, expect=ACTION_SUBMIT)
+        with self._span("submit"):
+            self.post(ACTION_SUBMIT, expect=RESULTS_GRID)
+
+        # Read results, skipping the header row
+        results = {}
+        with self._span("results"):
+            for row in (read_grid_html(self.page, RESULTS_GRID, ResultRow) or [])[1:]:
+                results[row.course_code] = {
+                    "enrolled": row.enrolled,
+                    "message": row.message
+                }
+
+        # Start over, which lands us back on the cart
+        with self._span("start_over"):
+            self.post(ACTION_START_OVER, expect=CART_GRID)
+        return results
+
+    def refresh(self):
+        """Reloads the cart, picking the term again if PeopleSoft asks for it"""
+
+        try:
+            response = self.session.get(self.url, headers={'Referer': self.url}, timeout=env.timeout)
+        except requests.RequestException as e:
+            raise FastPathExpired(f"Refresh failed: {e}") from e
+        if response.status_code != 200:
+            raise FastPathExpired(f"Refresh returned HTTP {response.status_code}")
+        self.url = response.url
+        self.page = parse_html(response.text)
+
+        # A plain GET of the component can land on term select
+        if self.page.find(id=CART_GRID) is None:
+            if self.term_index is None or self.page.find(id=ACTION_TERM_GO) is None:
+                raise FastPathExpired("Refresh didn't lead to the cart")
+            self.post(ACTION_TERM_GO, expect=CART_GRID,
+                fields={TERM_FIELD: str(self.term_index)})
+
+    def post(self, action: str, expect: str, fields: dict = None):
+        """Submits the current page's form as if a button was clicked"""
+
+        # Build the form, like the browser would
+        form_action, form = form_fields(self.page)
+        if form is None:
+            raise FastPathExpired(f"No form to submit for '{action}'")
+        form.update(fields or {})
+        form['ICAction'] = action
+
+        # Send it
+        try:
+            response = self.session.post(
+                urljoin(self.url, form_action), data=form,
+                headers={'Referer': self.url}, timeout=env.timeout
+            )
+        except requests.RequestException as e:
+            raise FastPathExpired(f"'{action}' failed: {e}") from e
+        if response.status_code != 200:
+            raise FastPathExpired(f"'{action}' returned HTTP {response.status_code}")
+
+        # Make sure we landed where we expected to
+        page = parse_html(response.text)
+        if page.find(id=expect) is None:
+            raise FastPathExpired(f"'{action}' didn't lead to '{expect}'")
+
+        self.url = response.url
+        self.page = page
+
+    def close(self):
+        """Closes the pooled session"""
+
+        self.session.close()
+
+    def _span(self, name: str):
+        """Tracer span, if we have a tracer"""
+
+        return self.tracer.span(name) if self.tracer else nullcontext()
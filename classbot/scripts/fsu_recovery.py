@@ -0,0 +1,102 @@
+import time
+from enum import Enum
+from collections import Counter
+
+from ..utils.tracing import Histogram
+
+class State(str, Enum):
+    """Where FSU_Enroller is, so we know how to get back on track"""
+
+    LOGIN = "login"
+    DUO = "duo"
+    NAV = "nav"
+    CART = "cart"
+    CONFIRM = "confirm"
+    RESULTS = "results"
+
+class Action(str, Enum):
+    """Ways to get back on track, cheapest first"""
+
+    FRAME = "frame"         # re-enter OMNI's frame, reload the cart next loop
+    REFRESH = "refresh"     # re-enter OMNI's frame and reload the cart now
+    NAV = "nav"             # back to the dashboard, then nav_to_start again
+    LOGIN = "login"         # log in all over again
+
+# What to try from each state, escalating with every consecutive failure
+LADDERS = {
+    State.LOGIN: [Action.LOGIN],
+    State.DUO: [Action.LOGIN],
+    State.NAV: [Action.NAV, Action.LOGIN],
+    State.CART: [Action.FRAME, Action.REFRESH, Action.NAV, Action.LOGIN],
+    State.CONFIRM: [Action.FRAME, Action.REFRESH, Action.NAV, Action.LOGIN],
+    State.RESULTS: [Action.FRAME, Action.REFRESH, Action.NAV, Action.LOGIN],
+}
+
+# How many consecutive failures each state gets before we give up
+BUDGETS = {
+    State.LOGIN: 2,
+    State.DUO: 1,
+    State.NAV: 3,
+    State.CART: 6,
+    State.CONFIRM: 6,
+    State.RESULTS: 6,
+}
+
+class RecoveryPolicy():
+    """
+    Picks a recovery action when a step fails, and keeps score
+    - Each state has its own budget of consecutive failures
+    - Actions escalate from cheap (re-enter the frame) to expensive (log in again)
+    - A successful attempt resets the budgets, and records how long recovery took
+    """
+
+    def __init__(self, budgets: dict = None):
+        """Initialize RecoveryPolicy"""
+
+        # settings, overridable per state
+        self.budgets = dict(BUDGETS)
+        for state, budget in (budgets or {}).items():
+            self.budgets[State(state)] = budget
+
+        # consecutive failures, and when the first of them happened
+        self.failures = Counter()
+        self.failed_at = None
+
+        # score keeping
+        self.counts = Counter()
+        self.recover_times = Histogram()
+
+    def next_action(self, state: State):
+        """Returns the action to try after a failure in state, or None if we're out of retries"""
+
+        self.failures[state] += 1
+        if self.failures[state] > self.budgets[state]:
+            return None
+        if self.failed_at is None:
+            self.failed_at = time.monotonic()
+
+        ladder = LADDERS[state]
+        action = ladder[min(self.failures[state], len(ladder)) - 1]
+        self.counts[action] += 1
+        return action
+
+    def progressed(self):
+        """Called whenever an attempt succeeds, returns time to recover if we were recovering"""
+
+        if self.failed_at is None:
+            return None
+        elapsed = time.monotonic() - self.failed_at
+        self.recover_times.add(elapsed)
+        self.failures.clear()
+        self.failed_at = None
+        return elapsed
+
+    def summary(self) -> str:
+        """One line summary of recoveries so far"""
+
+        if not self.recover_times.count and not self.counts:
+            return ""
+        actions = ", ".join(f"{a.value} `{n}`" for a, n in self.counts.items())
+        return f"Recoveries: {actions}; " + \
+            f"p50 `{self.recover_times.percentile(50):.1f}s`, " + \
+            f"max `{max(self.recover_times.samples, default=0):.1f}s`"
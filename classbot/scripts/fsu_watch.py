@@ -0,0 +1,312 @@
+import time
+import heapq
+import random
+import itertools
+import threading
+from collections import deque
+from urllib.parse import urljoin
+
+import requests
+
+from ..utils.locators import Locators
+from ..utils.pshtml import parse_html
+
+# Class search's section detail page, relative to the cart's URL
+DETAIL_URL = "SA_LEARNER_SERVICES.CLASS_SEARCH.GBL?Page=SSR_CLSRCH_DTL&Action=A" + \
+    "&CLASS_NBR={class_nbr}&INSTITUTION=FSU01&STRM={strm}"
+
+# Last digit of FSU's term codes, by semester
+TERM_MONTHS = {"spring": 1, "summer": 6, "fall": 9}
+
+def term_code(term_name: str) -> str:
+    """PeopleSoft's term code (STRM) for a term select entry, e.g. "2023 Fall" -> "2239" """
+
+    year = next((w for w in term_name.split() if w.isdigit() and len(w) == 4), None)
+    season = next((s for s in TERM_MONTHS if s in term_name.lower()), None)
+    if year is None or season is None:
+        raise Exception(f"Could not work out the term code for '{term_name}'!")
+    return f"{year[0]}{year[2:]}{TERM_MONTHS[season]}"
+
+def parse_targets(entries: list, semesters: list) -> list:
+    """
+    Reads WATCH_CLASSES entries into [(semester, class number)]
+    - Entries are "fall:12345", or just "12345" when enrolling in one term
+    """
+
+    targets = []
+    for entry in entries:
+        semester, _, class_nbr = entry.rpartition(":")
+        semester = semester.strip().lower() or (semesters[0] if len(semesters) == 1 else None)
+        if semester not in semesters or not class_nbr.strip().isdigit():
+            raise Exception(f"Invalid WATCH_CLASSES entry '{entry}', use <semester>:<class number>!")
+        targets.append((semester, class_nbr.strip()))
+    return targets
+
+class SectionStatus():
+    """Seat counts off a section detail page"""
+
+    __slots__ = ("name", "status", "capacity", "enrolled", "available", "wait_total")
+
+    def __init__(self, name: str, status: str, capacity: int = None, enrolled: int = None,
+        available: int = None, wait_total: int = None):
+        self.name = name
+        self.status = status
+        self.capacity = capacity
+        self.enrolled = enrolled
+        self.available = available
+        self.wait_total = wait_total
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, {self.status!r}, available={self.available})"
+
+    @property
+    def open(self) -> bool:
+        """Whether there's a seat, going by the count if there is one"""
+
+        if self.available is not None:
+            return self.available > 0
+        return (self.status or "").lower() == "open"
+
+    @classmethod
+    def from_page(cls, page):
+        """Reads a parsed section detail page, None if that's not what it is"""
+
+        def text(locator):
+            node = page.find(id=locator.value)
+            return node.text() if node is not None else None
+
+        def number(locator):
+            value = (text(locator) or "").strip()
+            return int(value) if value.isdigit() else None
+
+        status = text(Locators.SECTION_STATUS)
+        available = number(Locators.SECTION_AVAILABLE)
+        if status is None and available is None:
+            return None
+        return cls(
+            text(Locators.SECTION_NAME), status,
+            number(Locators.SECTION_CAPACITY), number(Locators.SECTION_ENROLLED),
+            available, number(Locators.SECTION_WAIT_TOTAL)
+        )
+
+class Section():
+    """One watched section, and what we last saw of it"""
+
+    def __init__(self, semester: str, class_nbr: str, url: str):
+        """Initialize Section"""
+
+        self.semester = semester
+        self.class_nbr = class_nbr
+        self.url = url
+        self.status = None
+        self.checks = 0
+        self.failures = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.semester!r}, {self.class_nbr!r})"
+
+class SeatEvent():
+    """A watched section going from full to open"""
+
+    def __init__(self, section: Section, status: SectionStatus):
+        self.semester = section.semester
+        self.class_nbr = section.class_nbr
+        self.name = status.name or section.class_nbr
+        self.available = status.available
+        self.ts = time.time()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.semester!r}, {self.name!r}, available={self.available})"
+
+class WatcherPool():
+    """
+    Watches sections for open seats, alongside the enrollment loop
+    - Each worker is its own HTTP session with the browser's cookies, no extra browsers needed
+    - Every section is refreshed on its own schedule, at most once per interval
+    - Seat openings are queued, and wake the enrollment loop up early
+    """
+
+    def __init__(self, sections: list, cookies: list, user_agent: str = None,
+        workers: int = 2, interval: float = 10.0, timeout: float = 15.0,
+        max_backoff: float = 300.0):
+        """Initialize WatcherPool"""
+
+        # settings
+        self.sections = sections
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+
+        # what workers build their sessions from
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self._generation = 0
+
+        # stats
+        self.checks = 0
+        self.errors = 0
+
+        # sections by when they're next due, spread over the first interval
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        now = time.monotonic()
+        self._due = [
+            (now + i * interval / len(sections), next(self._seq), section)
+            for i, section in enumerate(sections)
+        ]
+        self._events = deque()
+        self._closed = False
+
+        # no point having more workers than sections
+        self.workers = [
+            threading.Thread(target=self._run, name=f"watcher-{i}", daemon=True)
+            for i in range(max(1, min(workers, len(sections))))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    @classmethod
+    def from_driver(cls, driver, targets: list, term_codes: dict,
+        url_template: str = DETAIL_URL, **kwargs):
+        """Builds a pool from a driver that's on the cart page, inside OMNI's frame"""
+
+        cart_url = driver.execute_script("return document.location.href;")
+        sections = [
+            Section(semester, class_nbr, urljoin(cart_url, url_template.format(
+                class_nbr=class_nbr, strm=term_codes[semester]
+            )))
+            for semester, class_nbr in targets
+        ]
+        return cls(
+            sections, driver.get_cookies(),
+            driver.execute_script("return navigator.userAgent;"), **kwargs
+        )
+
+    def reseed(self, cookies: list):
+        """Hands workers a fresh login's cookies, and looks at everything again soon"""
+
+        with self._cond:
+            self.cookies = cookies
+            self._generation += 1
+            now = time.monotonic()
+            self._due = [(min(due, now), seq, s) for due, seq, s in self._due]
+            heapq.heapify(self._due)
+            for section in self.sections:
+                section.failures = 0
+            self._cond.notify_all()
+
+    def events(self) -> list:
+        """Seat openings queued since the last call"""
+
+        with self._cond:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def wait(self, timeout: float) -> list:
+        """Sleeps for up to timeout, waking early for a seat opening, returns queued openings"""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._events and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.events()
+
+    def summary(self) -> str:
+        """One line for status embeds"""
+
+        open_now = sum(1 for s in self.sections if s.status is not None and s.status.open)
+        return f"Watching `{len(self.sections)}` section(s), `{open_now}` open, " + \
+            f"`{self.checks}` checks, `{self.errors}` errors"
+
+    def close(self):
+        """Stops the workers"""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    #
+    # Helpers
+    #
+
+    def _run(self):
+        """Worker loop, refreshes whichever section is due next"""
+
+        session, generation = None, None
+        while True:
+            with self._cond:
+                while not self._closed and \
+                    (not self._due or self._due[0][0] > time.monotonic()):
+                    self._cond.wait(self._due[0][0] - time.monotonic() if self._due else None)
+                if self._closed:
+                    break
+                _, _, section = heapq.heappop(self._due)
+                if generation != self._generation:
+                    if session is not None:
+                        session.close()
+                    session, generation = self._session(), self._generation
+
+            delay = self._check(session, section)
+
+            with self._cond:
+                heapq.heappush(self._due, (time.monotonic() + delay, next(self._seq), section))
+                self._cond.notify_all()
+
+        if session is not None:
+            session.close()
+
+    def _session(self) -> requests.Session:
+        """A pooled session with the browser's cookies"""
+
+        session = requests.Session()
+        for cookie in self.cookies:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+        if self.user_agent:
+            session.headers['User-Agent'] = self.user_agent
+        return session
+
+    def _check(self, session: requests.Session, section: Section) -> float:
+        """Refreshes one section, returns how long until it's due again"""
+
+        try:
+            response = session.get(section.url, timeout=self.timeout)
+            status = SectionStatus.from_page(parse_html(response.text)) \
+                if response.status_code == 200 else None
+            problem = f"HTTP {response.status_code}" if response.status_code != 200 \
+                else "not a section page, logged out?"
+        except requests.RequestException as e:
+            status, problem = None, str(e)
+
+        # NOTE: Odd markup or a cut off body mustn't kill the worker, or the section stops being watched
+        except Exception as e:
+            status, problem = None, f"unreadable page, {type(e).__name__}: {e}"
+
+        # Probably logged out, so back off until the enroller reseeds us
+        if status is None:
+            with self._cond:
+                self.checks += 1
+                self.errors += 1
+            section.checks += 1
+            section.failures += 1
+            if section.failures == 1:
+                print(f"\nWARN: Could not read section {section.class_nbr} ({problem}), backing off...")
+            return min(self.interval * 2 ** section.failures, self.max_backoff)
+
+        # Only full -> open counts, so a section that stays open isn't reported every time
+        opened = status.open and not (section.status is not None and section.status.open)
+        section.status = status
+        section.checks += 1
+        section.failures = 0
+        with self._cond:
+            self.checks += 1
+            if opened:
+                self._events.append(SeatEvent(section, status))
+                self._cond.notify_all()
+        return self.interval * random.uniform(0.9, 1.1)
@@ -0,0 +1,189 @@
+import time
+import threading
+
+from .utils import DiscordNotifier, Account, env
+from .drivers import init_driver
+from .scripts.fsu_enroll import FSU_Enroller
+
+class TaggedNotifier():
+    """Prefixes embed titles with an account name, so workers can share a stream"""
+
+    def __init__(self, notifier, tag: str):
+        self.notifier = notifier
+        self.tag = tag
+
+    def __getattr__(self, name):
+        return getattr(self.notifier, name)
+
+    def send_embed(self, title: str, description: str, **kwargs):
+        return self.notifier.send_embed(f"[{self.tag}] {title}", description, **kwargs)
+
+    def update_embed(self, message: dict, title: str = None, **kwargs):
+        if title is not None:
+            title = f"[{self.tag}] {title}"
+        return self.notifier.update_embed(message, title=title, **kwargs)
+
+class Supervisor():
+    """
+    Runs one FSU_Enroller per account, each on its own thread and driver
+    - Caps how many browser sessions are open at once
+    - Staggers logins, so we don't hammer CAS all at once
+    - Reports every worker's progress in a single status embed
+    """
+
+    def __init__(self, notifier, accounts: list,
+        max_sessions: int = None, stagger: float = None, session_store=None,
+        history=None):
+        """Initialize Supervisor"""
+
+        # save vars
+        self.notifier = notifier
+        self.session_store = session_store
+        self.history = history
+        self.accounts = accounts
+        self.stagger = stagger if stagger is not None else env.login_stagger
+
+        # session limiting
+        self._sessions = threading.BoundedSemaphore(
+            max_sessions if max_sessions is not None else env.max_sessions
+        )
+        self._stagger_lock = threading.Lock()
+        self._next_login = 0.0
+
+        # worker state
+        self._lock = threading.Lock()
+        self.drivers = {}
+        self._enrollers = {}
+        self.status = {a.username: "waiting for a session" for a in accounts}
+        self.exit_codes = {}
+        self.threads = []
+
+    def run(self) -> int:
+        """Runs every account to completion, returns the worst exit code"""
+
+        # start status message
+        status_msg = self.notifier.send_embed(
+            title=f"Supervising {len(self.accounts)} Accounts!",
+            description=self._summary(),
+            color=DiscordNotifier.Colors.LIGHT
+        )
+
+        # spin up workers
+        for account in self.accounts:
+            thread = threading.Thread(
+                target=self._worker, args=(account,),
+                name=f"enroller-{account.username}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+        # wait on them, updating the status embed as we go
+        # NOTE: join with a timeout so signals still reach the main thread
+        last_update = time.monotonic()
+        while any(t.is_alive() for t in self.threads):
+            for thread in self.threads:
+                thread.join(timeout=0.5)
+            if time.monotonic() - last_update >= env.discord_interval:
+                last_update = time.monotonic()
+                self.notifier.update_embed(status_msg, description=self._summary())
+
+        # final update
+        self.notifier.update_embed(status_msg, description=self._summary())
+
+        # first non-zero exit code wins
+        return next((c for c in self.exit_codes.values() if c), 0)
+
+    def quit(self):
+        """Closes every open browser session"""
+
+        with self._lock:
+            drivers = list(self.drivers.values())
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def enrollers(self) -> list:
+        """Every worker's enroller that's still running"""
+
+        with self._lock:
+            return list(self._enrollers.values())
+
+    #
+    # Helpers
+    #
+
+    def _worker(self, account: Account):
+        """Runs a single account's enroller"""
+
+        code = -5
+        with self._sessions:
+            try:
+
+                # stagger logins
+                self._wait_for_login_slot()
+                self._set_status(account, "starting driver")
+
+                # start driver
+                driver = init_driver()
+                with self._lock:
+                    self.drivers[account.username] = driver
+
+                # run the enroller
+                self._set_status(account, "logging in")
+                enroller = FSU_Enroller(
+                    driver,
+                    TaggedNotifier(self.notifier, account.username),
+                    account=account,
+                    progress=self._progress,
+                    session_store=self.session_store,
+                    history=self.history
+                )
+                with self._lock:
+                    self._enrollers[account.username] = enroller
+                code = enroller.run()
+
+            except Exception as e:
+                print(f"\n[{account.username}] Worker crashed: {e}")
+
+            finally:
+                with self._lock:
+                    driver = self.drivers.pop(account.username, None)
+                    self._enrollers.pop(account.username, None)
+                if driver is not None:
+                    driver.quit()
+
+        with self._lock:
+            self.exit_codes[account.username] = code
+            self.status[account.username] = f"exited (`{code}`)"
+
+    def _wait_for_login_slot(self):
+        """Blocks until it's our turn to log in"""
+
+        with self._stagger_lock:
+            now = time.monotonic()
+            wait = self._next_login - now
+            self._next_login = max(now, self._next_login) + self.stagger
+        if wait > 0:
+            time.sleep(wait)
+
+    def _progress(self, account: Account, loop_count: int):
+        """Called by enrollers every loop"""
+
+        self._set_status(account, f"loop `{loop_count}`")
+
+    def _set_status(self, account: Account, status: str):
+        """Updates a worker's status line"""
+
+        with self._lock:
+            self.status[account.username] = status
+
+    def _summary(self) -> str:
+        """Builds the status embed body"""
+
+        with self._lock:
+            return "\n".join(
+                f"`{username}`: {status}"
+                for username, status in self.status.items()
+            )
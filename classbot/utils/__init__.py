@@ -1,3 +1,20 @@
 from .env import env
 from .discordlib import DiscordNotifier
-from .drivertools import check_xpath_exists, get_wait
+from .notifyqueue import NotifierQueue
+from .accounts import Account, load_accounts
+from .scheduler import PollScheduler, parse_windows
+
+# Heavier modules (selenium, cryptography) only load once something needs them
+_LAZY = {
+    "check_xpath_exists": ".drivertools",
+    "get_wait": ".drivertools",
+    "read_grid": ".drivertools",
+    "Locators": ".locators",
+    "SessionStore": ".sessionstore",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,50 @@
+import json
+
+from .env import env, split_list, VALID_SEMESTERS
+
+class Account():
+    """Credentials and term(s) for a single enrollment worker"""
+
+    def __repr__(self):
+        # never print passwords
+        return f"{self.__class__.__name__}(username={self.username!r}, semester={self.semester!r})"
+
+    def __init__(self, username: str, password: str, semester: str):
+        """Initialize Account"""
+
+        # Error checking
+        if not username or not password:
+            raise Exception("Account must have a username and password!")
+        semesters = split_list(str(semester).lower())
+        if not semesters or not all(s in VALID_SEMESTERS for s in semesters):
+            raise Exception(f"Account '{username}' has an invalid semester!")
+
+        # save vars
+        self.username = username
+        self.password = password
+        self.semesters = semesters
+        self.semester = ",".join(semesters)
+
+    @classmethod
+    def from_env(cls):
+        """Builds the single account described by FSU_* env vars"""
+
+        return cls(env.username, env.password, env.semester)
+
+def load_accounts(path: str) -> list:
+    """
+    Reads a list of accounts from a JSON file
+    - Format: [{"username": ..., "password": ..., "semester": ...}, ...]
+    - Missing semesters fall back to FSU_SEMESTER
+    """
+
+    with open(path) as f:
+        raw = json.load(f)
+
+    if not isinstance(raw, list) or not raw:
+        raise Exception(f"'{path}' must contain a non-empty list of accounts!")
+
+    return [
+        Account(a.get('username'), a.get('password'), a.get('semester', env.semester))
+        for a in raw
+    ]
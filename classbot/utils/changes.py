@@ -0,0 +1,55 @@
+import time
+import hashlib
+
+def fingerprint(*parts: dict) -> str:
+    """Short, order independent hash of some dicts of loop state"""
+
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        for key in sorted(part):
+            digest.update(f"{key}\x1f{part[key]!r}\x1e".encode())
+        digest.update(b"\x1d")
+    return digest.hexdigest()
+
+class ChangeDetector():
+    """
+    Decides when loop state is worth telling Discord about
+    - Anything that changes the fingerprint is reported, no more often than min_interval
+    - If nothing changes, a heartbeat goes out every heartbeat seconds
+    """
+
+    def __init__(self, min_interval: float, heartbeat: float):
+        """Initialize ChangeDetector"""
+
+        # settings
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+
+        # state
+        self.last = None
+        self.pending = False
+        self.last_sent = time.monotonic()
+        self.changes = 0
+        self.heartbeats = 0
+
+    def check(self, fingerprint: str) -> str:
+        """Returns why an update is due ("changed" or "heartbeat"), or None"""
+
+        # remember changes, even if we can't send them yet
+        if fingerprint != self.last:
+            self.pending = True
+            self.last = fingerprint
+
+        since = time.monotonic() - self.last_sent
+        if self.pending and since >= self.min_interval:
+            reason = "changed"
+            self.changes += 1
+        elif since >= self.heartbeat:
+            reason = "heartbeat"
+            self.heartbeats += 1
+        else:
+            return None
+
+        self.pending = False
+        self.last_sent = time.monotonic()
+        return reason
@@ -1,10 +1,11 @@
+import json
 import socket
-import requests
 from enum import Enum
 from datetime import datetime
 
 # These should be imported from wherever
 from ..version import __version__
+from .webhook import WebhookTransport
 
 BOT_NAME = "fsu-classbot"
 BOT_PFP_URL = ""
@@ -14,6 +15,9 @@ class DiscordNotifier():
 
     url_base = "https://discord.com/api/webhooks"
 
+    # Biggest attachment a webhook takes without a boosted server
+    file_limit = 8 * 1024 * 1024
+
     class Colors(int, Enum):
         """Main Color Enum, used in Discord embeds"""
 
@@ -29,9 +33,14 @@ class DiscordNotifier():
         LIGHT = int(0xe2e6ea)
         DARK = int(0x23272b) 
 
-    def __init__(self, url: str, pings: str = None):
+    def __init__(self, url: str, pings: str = None,
+        transport: WebhookTransport = None, url_base: str = None):
         """TODO: Important text goes here"""
 
+        # Allow pointing at something other than discord.com (i.e. fakehook)
+        if url_base:
+            self.url_base = url_base
+
         # Error checking
         if not url:
             raise Exception("Must have post URL!")
@@ -49,6 +58,9 @@ class DiscordNotifier():
         # Save pings
         self.pings = pings
 
+        # Pooled, rate limit aware transport
+        self.transport = transport or WebhookTransport()
+
     #
     # Sends
     #
@@ -56,8 +68,9 @@ class DiscordNotifier():
     def send_message(self, content: str):
         """Main Discord Message Function"""
 
-        return requests.post(
-            f"{self.url_base}/{self.id}/{self.token}?wait=true",
+        return self.transport.request(
+            "POST", f"{self.url_base}/{self.id}/{self.token}?wait=true",
+            route=f"POST /webhooks/{self.id}",
             json=self._format_json(
                 contents=content
             )
@@ -67,8 +80,9 @@ class DiscordNotifier():
         image: str = None, color: int = Colors.PRIMARY):
         """Main *Pretty* Discord Message Function"""
 
-        return requests.post(
-            f"{self.url_base}/{self.id}/{self.token}?wait=true",
+        return self.transport.request(
+            "POST", f"{self.url_base}/{self.id}/{self.token}?wait=true",
+            route=f"POST /webhooks/{self.id}",
             json=self._format_json(
                 e_title=title,
                 e_description=description,
@@ -77,6 +91,16 @@ class DiscordNotifier():
             )
         ).json()
 
+    def send_file(self, content: str, filename: str, data: bytes):
+        """Sends a message with a file attached"""
+
+        return self.transport.request(
+            "POST", f"{self.url_base}/{self.id}/{self.token}?wait=true",
+            route=f"POST /webhooks/{self.id}",
+            data={"payload_json": json.dumps(self._format_json(contents=content))},
+            files={"files[0]": (filename, data)}
+        ).json()
+
     #
     # Updates
     #
@@ -91,8 +115,9 @@ class DiscordNotifier():
         new_content = content if content is not None else message['content']
 
         # update the message
-        return requests.patch(
-            f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}",
+        return self.transport.request(
+            "PATCH", f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}",
+            route=f"PATCH /webhooks/{self.id}/messages",
             json=self._format_json(
                 contents=new_content
             )
@@ -117,8 +142,9 @@ class DiscordNotifier():
         new_color = color if color is not None \
             else message['embeds'][0]['color']
         
-        return requests.patch(
-            f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}",
+        return self.transport.request(
+            "PATCH", f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}",
+            route=f"PATCH /webhooks/{self.id}/messages",
             json=self._format_json(
                 e_title=new_title,
                 e_description=new_description,
@@ -138,8 +164,9 @@ class DiscordNotifier():
         message_id = message['id']
         
         # delete the message
-        return requests.delete(
-            f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}"
+        return self.transport.request(
+            "DELETE", f"{self.url_base}/{self.id}/{self.token}/messages/{message_id}",
+            route=f"DELETE /webhooks/{self.id}/messages"
         )
     
     #
@@ -1,14 +1,135 @@
+import time
+import weakref
+from urllib.parse import urlparse, urljoin
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, \
+    TimeoutException, WebDriverException, JavascriptException, StaleElementReferenceException
 
 from .env import env
 
+# Pulls every row of a PeopleSoft grid in a single round trip.
+# Returns null if the grid isn't on the page yet.
+# NOTE: Text is trimmed, like WebElement.text is
+GRID_SCRIPT = """
+const parent = document.getElementById(arguments[0]);
+if (!parent) return null;
+const table = parent.querySelector("table[class='PSLEVEL1GRID']");
+const body = table ? table.querySelector("tbody") : null;
+if (!body) return null;
+return Array.from(body.querySelectorAll("tr")).map(row => ({
+    text: row.innerText.trim(),
+    cells: Array.from(row.querySelectorAll("td")).map(cell => {
+        const span = cell.querySelector("span");
+        const div = cell.querySelector("div > div");
+        const img = cell.querySelector("img");
+        return {
+            text: cell.innerText.trim(),
+            span: span ? span.innerText.trim() : null,
+            div: div ? div.innerText.trim() : null,
+            img: img ? img.alt : null,
+        };
+    }),
+}));
+"""
+
+# Resolves with the name of the first selector to reach its wanted state,
+# watching the DOM with a MutationObserver rather than polling for it.
+RACE_SCRIPT = """
+const outcomes = arguments[0];
+const done = arguments[arguments.length - 1];
+const check = () => {
+    for (const [name, selector, present] of outcomes) {
+        if ((document.querySelector(selector) !== null) === present) return name;
+    }
+    return null;
+};
+const hit = check();
+if (hit) return done(hit);
+const observer = new MutationObserver(() => {
+    const hit = check();
+    if (hit) { observer.disconnect(); done(hit); }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+"""
+
+# Seat status icons in the cart, by their alt text
+CART_STATUSES = {
+    "open": "open",
+    "closed": "closed",
+    "wait list": "waitlist",
+}
+
+# get_wait's cache, goes away with the driver
+_waits = weakref.WeakKeyDictionary()
+
+class WaitResult():
+    """Which outcome of a race fired, and how long it took"""
+
+    def __init__(self, name: str, value, elapsed: float):
+        self.name = name
+        self.value = value
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.__dict__}"
+
+class GridRow():
+    """A row pulled out of a PeopleSoft grid"""
+
+    def __init__(self, text: str, cells: list):
+        self.text = text
+        self.cells = cells
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.__dict__}"
+
+class CartRow(GridRow):
+    """A row of the shopping cart grid (SSR_REGFORM_VW$scroll$0)"""
+
+    # NOTE: First column is the delete checkbox, class name is in the second
+    @property
+    def course_code(self) -> str:
+        return (self.cells[1]['span'] or "").replace(" ", "") \
+            if len(self.cells) > 1 else ""
+
+    # NOTE: Status is an icon, so we go by its alt text. None if there isn't one
+    @property
+    def status(self) -> str:
+        for cell in self.cells:
+            alt = (cell.get('img') or "").strip().lower()
+            if alt in CART_STATUSES:
+                return CART_STATUSES[alt]
+        return None
+
+class ResultRow(GridRow):
+    """A row of the enrollment results grid (SSR_SS_ERD_ER$scroll$0)"""
+
+    @property
+    def course_code(self) -> str:
+        return (self.cells[0]['span'] or "").replace(" ", "")
+
+    @property
+    def raw_message(self) -> str:
+        return self.cells[1]['div'] or ""
+
+    @property
+    def enrolled(self) -> bool:
+        return "Success" in self.raw_message
+
+    @property
+    def message(self) -> str:
+        return self.raw_message.split("</b>")[-1].split("\n")[0]
+
 def get_wait(driver: webdriver):
-    """Returns a WebDriverWait object"""
+    """Returns a WebDriverWait object, one per driver"""
 
-    return WebDriverWait(driver, env.timeout)
+    wait = _waits.get(driver)
+    if wait is None:
+        wait = _waits[driver] = WebDriverWait(driver, env.timeout, poll_frequency=env.poll_time)
+    return wait
 
 def check_xpath_exists(driver: webdriver, xpath: str):
     """Checks to see if item at given xpath exists"""
@@ -18,4 +139,212 @@ def check_xpath_exists(driver: webdriver, xpath: str):
         driver.find_element(By.XPATH, xpath)
     except NoSuchElementException:
         return False
-    return True
\ No newline at end of file
+    return True
+
+def driver_alive(driver: webdriver) -> bool:
+    """Cheap check to see if a session still responds"""
+
+    try:
+        driver.title
+        return True
+    except Exception:
+        return False
+
+# Fields Network.setCookies takes, out of what Network.getAllCookies gives
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+def snapshot_session(driver: webdriver, visit: list = (), previous: dict = None) -> dict:
+    """
+    Grabs the cookies for every site we've been through, and the current page's local storage
+    - Over CDP, the browser hands over every cookie at once
+    - Otherwise WebDriver only shows the current page's, so each URL in visit is loaded
+      to read its cookies, and then we come back
+    - Cookies saved in previous for other pages are kept
+    """
+
+    url = driver.current_url
+    session = {
+        "url": url,
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(
+            "return Object.assign({}, window.localStorage);"
+        ) or {},
+    }
+
+    # Every cookie, in one go
+    all_cookies = _all_cookies(driver)
+    if all_cookies is not None:
+        session["all_cookies"] = all_cookies
+        return session
+
+    # Otherwise, one jar per page
+    jars = {jar["url"]: jar for jar in (previous or {}).get("jars", [])}
+    jars[url] = {"url": url, "cookies": session["cookies"]}
+    if visit:
+        for other in visit:
+            driver.get(urljoin(other, "favicon.ico"))
+            jars[other] = {"url": other, "cookies": driver.get_cookies()}
+        driver.get(url)
+    session["jars"] = list(jars.values())
+    return session
+
+def add_frame_cookies(driver: webdriver, session: dict):
+    """Adds the cookies of the document we're in (i.e. a frame) to a session"""
+
+    if "all_cookies" in session:
+        session["all_cookies"] = _all_cookies(driver) or session["all_cookies"]
+        return
+    url = driver.execute_script("return location.href;")
+    jars = [jar for jar in session.get("jars", []) if jar["url"] != url]
+    session["jars"] = jars + [{"url": url, "cookies": driver.get_cookies()}]
+
+def restore_session(driver: webdriver, session: dict):
+    """Loads cookies and local storage into a driver, then reopens the saved page"""
+
+    # Every cookie, in one go
+    if session.get("all_cookies") and _set_all_cookies(driver, session["all_cookies"]):
+        jars = []
+    else:
+        jars = session.get("jars") or [{"url": session["url"], "cookies": session.get("cookies", [])}]
+
+    # Need to be on each page's domain (and path) before we can set its cookies
+    # NOTE: Uses a static file, since the page itself may redirect to a login
+    # NOTE: The saved page goes last, so we're on its origin for local storage
+    jars = sorted(jars, key=lambda jar: jar["url"] == session["url"])
+    for jar in jars:
+        driver.get(urljoin(jar["url"], "favicon.ico"))
+        for cookie in jar["cookies"]:
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException as e:
+                print(f"WARN: Could not restore cookie '{cookie.get('name')}': {e.msg}")
+    if not jars or jars[-1]["url"] != session["url"]:
+        origin = urlparse(session["url"])
+        driver.get(f"{origin.scheme}://{origin.netloc}/favicon.ico")
+
+    # Local storage is per-origin, which we're on now
+    if session.get("local_storage"):
+        driver.execute_script(
+            "for (const [k, v] of Object.entries(arguments[0])) localStorage.setItem(k, v);",
+            session["local_storage"]
+        )
+    driver.get(session["url"])
+
+def page_bytes(driver: webdriver) -> int:
+    """Bytes the current document (and its resources) took over the wire"""
+
+    return driver.execute_script("""
+        return performance.getEntriesByType("navigation")
+            .concat(performance.getEntriesByType("resource"))
+            .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+    """) or 0
+
+def read_grid(driver: webdriver, parent_id: str, row_type: type = GridRow):
+    """
+    Reads a whole PeopleSoft grid with one execute_script call
+    - Waits for the grid to appear, then returns a list of typed rows
+    """
+
+    # NOTE: Wrapped in a tuple, since an empty grid is falsy but still valid
+    # NOTE: A submit or refresh can swap the document out mid-read, so stale just means try again
+    rows, = WebDriverWait(
+        driver, env.timeout, poll_frequency=env.poll_time,
+        ignored_exceptions=(StaleElementReferenceException,)
+    ).until(
+        lambda d: (lambda rows: (rows,) if rows is not None else False)(
+            d.execute_script(GRID_SCRIPT, parent_id)
+        )
+    )
+    return [row_type(row['text'], row['cells']) for row in rows]
+
+
+def race(driver: webdriver, outcomes: dict, timeout: float = None):
+    """
+    Waits on several expected conditions at once
+    - Resolves as soon as the first one is truthy, returning a WaitResult
+    - Conditions are checked in order, so list the most likely first
+    """
+
+    start = time.monotonic()
+
+    def any_outcome(d):
+        for name, condition in outcomes.items():
+            # NOTE: Anything else (i.e. a dead session) is raised, not waited out
+            try:
+                value = condition(d)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if value:
+                return name, value
+        return False
+
+    name, value = WebDriverWait(
+        driver,
+        timeout if timeout is not None else env.timeout,
+        poll_frequency=env.poll_time
+    ).until(any_outcome)
+    return WaitResult(name, value, time.monotonic() - start)
+
+def race_dom(driver: webdriver, outcomes: dict, timeout: float = None):
+    """
+    Waits on several CSS selectors at once, in-page
+    - outcomes maps name -> (selector, present), present=False waits for removal
+    - Uses a MutationObserver so there is no poll interval to wait out
+    - A timeout of None waits forever
+    """
+
+    start = time.monotonic()
+    deadline = start + timeout if timeout is not None else None
+    spec = [[name, sel, present] for name, (sel, present) in outcomes.items()]
+
+    # NOTE: The script timeout is per session, so it's put back for everyone else
+    previous = driver.timeouts.script
+    try:
+        while True:
+
+            # work out how long this attempt can block for
+            remaining = env.timeout if deadline is None \
+                else deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"None of {list(outcomes)} resolved in {timeout}s")
+
+            # let the page tell us when it happens
+            try:
+                driver.set_script_timeout(remaining)
+                name = driver.execute_async_script(RACE_SCRIPT, spec)
+                if name:
+                    return WaitResult(name, None, time.monotonic() - start)
+
+            # script timed out, or the page navigated out from under us
+            # NOTE: Anything else means the browser's gone, so don't wait on it forever
+            except (TimeoutException, JavascriptException, StaleElementReferenceException):
+                time.sleep(env.poll_time)
+    finally:
+        driver.set_script_timeout(previous)
+
+def _all_cookies(driver: webdriver):
+    """Every cookie in the browser over CDP, or None if the driver can't"""
+
+    execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+    if execute_cdp_cmd is None:
+        return None
+    try:
+        return execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except WebDriverException:
+        return None
+
+def _set_all_cookies(driver: webdriver, cookies: list) -> bool:
+    """Loads cookies from _all_cookies back in over CDP, returns whether it could"""
+
+    execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+    if execute_cdp_cmd is None:
+        return False
+    try:
+        execute_cdp_cmd("Network.setCookies", {"cookies": [
+            {k: v for k, v in c.items() if k in CDP_COOKIE_FIELDS and not (k == "expires" and v < 0)}
+            for c in cookies
+        ]})
+    except WebDriverException as e:
+        print(f"WARN: Could not restore cookies over CDP: {e.msg}")
+        return False
+    return True
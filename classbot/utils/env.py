@@ -1,6 +1,13 @@
 import os
 from dotenv import load_dotenv
 
+VALID_SEMESTERS = ['fall', 'spring', 'summer']
+
+def split_list(value: str) -> list:
+    """Splits a comma separated env var, dropping blanks"""
+
+    return [v.strip() for v in value.split(",") if v.strip()]
+
 class EnvDict():
     """Class used for representing environment variables."""
 
@@ -13,20 +20,26 @@ class EnvDict():
         # read in dotenv, if exists
         load_dotenv()
 
+        # multi-account mode, where credentials come from a file instead
+        self.accounts_file = os.getenv('ACCOUNTS_FILE')
+        self.max_sessions = int(os.getenv('MAX_SESSIONS', 4))
+        self.login_stagger = float(os.getenv('LOGIN_STAGGER', 10))
+
         # username
         self.username = os.getenv('FSU_USERNAME')
-        if not self.username:
+        if not self.username and not self.accounts_file:
             raise Exception("FSU_USERNAME not set!")
 
         # password
         self.password = os.getenv('FSU_PASSWORD')
-        if not self.password:
+        if not self.password and not self.accounts_file:
             raise Exception("FSU_PASSWORD not set!")
 
         # semester
-        valid_semesters = ['fall', 'spring', 'summer']
-        self.semester = str(os.getenv('FSU_SEMESTER')).lower()
-        if self.semester not in valid_semesters:
+        # NOTE: May be a comma separated list, to enroll in several terms at once
+        self.semester = ",".join(split_list(str(os.getenv('FSU_SEMESTER')).lower()))
+        if not all(s in VALID_SEMESTERS for s in split_list(self.semester)) \
+            and not self.accounts_file:
             raise Exception("FSU_SEMESTER not set to valid option!")
         
         # driver option
@@ -37,16 +50,110 @@ class EnvDict():
         # discord stuff
         self.discord_url = os.getenv('DISCORD_URL')
         self.discord_pings = os.getenv('DISCORD_PINGS')
-        self.discord_modulo = int(os.getenv('DISCORD_MODULO')) \
-            if os.getenv('DISCORD_MODULO') is not None else 5
+        self.discord_interval = float(os.getenv('DISCORD_UPDATE_INTERVAL', 10))
+        self.discord_heartbeat = float(os.getenv('DISCORD_HEARTBEAT', 300))
+        self.discord_background = os.getenv('DISCORD_BACKGROUND', 'True') \
+            .lower() in ('true', '1', 't')
+        self.discord_queue_size = int(os.getenv('DISCORD_QUEUE_SIZE', 100))
+        self.discord_flush_timeout = float(os.getenv('DISCORD_FLUSH_TIMEOUT', 5))
+
+        # http fast path
+        self.fast_path = os.getenv('FAST_PATH', 'False') \
+            .lower() in ('true', '1', 't')
+        self.fast_path_retries = int(os.getenv('FAST_PATH_RETRIES', 3))
+
+        # only submit when the cart shows an open seat
+        self.seat_gating = os.getenv('SEAT_GATING', 'True') \
+            .lower() in ('true', '1', 't')
+
+        # tracing
+        self.trace_log = os.getenv('TRACE_LOG')
+
+        # attempt history
+        self.history_db = os.getenv('HISTORY_DB')
+
+        # flight recorder of recent pages, dumped on crashes
+        self.flight_recorder = os.getenv('FLIGHT_RECORDER', 'False') \
+            .lower() in ('true', '1', 't')
+        self.flight_pages = int(os.getenv('FLIGHT_PAGES', 5))
+        self.flight_max_mb = float(os.getenv('FLIGHT_MAX_MB', 8))
+        self.flight_interval = float(os.getenv('FLIGHT_INTERVAL', 30))
+        self.flight_screenshots = os.getenv('FLIGHT_SCREENSHOTS', 'False') \
+            .lower() in ('true', '1', 't')
+        self.flight_dir = os.getenv('FLIGHT_DIR', 'flights')
+        self.flight_discord = os.getenv('FLIGHT_DISCORD', 'False') \
+            .lower() in ('true', '1', 't')
+
+        # section watchers, which wake the loop when a seat opens
+        self.watch_classes = split_list(os.getenv('WATCH_CLASSES', ''))
+        self.watch_workers = int(os.getenv('WATCH_WORKERS', 2))
+        self.watch_interval = float(os.getenv('WATCH_INTERVAL', 10))
+        self.watch_url = os.getenv('WATCH_URL')
+
+        # multi-node coordination, off unless a backend is given
+        self.coord_url = os.getenv('COORD_URL')
+        self.coord_node = os.getenv('COORD_NODE')
+        # NOTE: Nodes only heartbeat between loops, so the TTL has to outlast the longest sleep
+        self.coord_ttl = float(os.getenv('COORD_TTL')) if os.getenv('COORD_TTL') \
+            else 2 * float(os.getenv('SLEEP_CEILING', 30))
+
+        # health / metrics endpoint, off unless a port is given
+        self.health_port = int(os.getenv('HEALTH_PORT')) if os.getenv('HEALTH_PORT') else None
+        self.health_host = os.getenv('HEALTH_HOST', '127.0.0.1')
+        self.health_max_age = float(os.getenv('HEALTH_MAX_AGE', 120))
+        self.health_start_grace = float(os.getenv('HEALTH_START_GRACE', 300))
+
+        # session cache
+        self.session_key = os.getenv('SESSION_KEY')
+        self.session_dir = os.getenv('SESSION_DIR', '.sessions')
 
         # selenium stuff
         self.headless = os.getenv('DRIVER_HEADLESS', 'False') \
             .lower() in ('true', '1', 't')
         self.remote_url = os.getenv('DRIVER_REMOTE')
-        self.timeout = os.getenv('DRIVER_TIMEOUT') \
+        self.cdp = os.getenv('DRIVER_CDP', 'False') \
+            .lower() in ('true', '1', 't')
+        self.timeout = float(os.getenv('DRIVER_TIMEOUT')) \
             if os.getenv('DRIVER_TIMEOUT') is not None else 15
-        self.sleep_time = os.getenv('DRIVER_SLEEP') \
+        self.sleep_time = float(os.getenv('DRIVER_SLEEP')) \
             if os.getenv('DRIVER_SLEEP') is not None else 2
+        self.poll_time = float(os.getenv('DRIVER_POLL', 0.1))
+
+        # lean page loads
+        self.lean = os.getenv('DRIVER_LEAN', 'False') \
+            .lower() in ('true', '1', 't')
+        # NOTE: Images aren't blocked by default, the portal's enroll link is an icon
+        self.lean_block_types = split_list(os.getenv('DRIVER_BLOCK_TYPES', 'font,media'))
+        self.lean_block_urls = split_list(os.getenv('DRIVER_BLOCK_URLS',
+            '*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,*hotjar.com*'))
+        self.lean_allow_urls = split_list(os.getenv('DRIVER_ALLOW_URLS', ''))
+        # NOTE: Only the user's own list is worth warning about where it can't be used
+        self.lean_block_urls_set = os.getenv('DRIVER_BLOCK_URLS') is not None
+        self.measure_bytes = os.getenv('DRIVER_MEASURE_BYTES', 'False') \
+            .lower() in ('true', '1', 't')
+
+        # webdriver command profiling, per-loop jsonl (plus a .folded aggregate on exit)
+        self.driver_profile = os.getenv('DRIVER_PROFILE')
+
+        # adaptive loop scheduling
+        # NOTE: Floor defaults to DRIVER_SLEEP, so loops only speed up if asked to
+        self.sleep_floor = float(os.getenv('SLEEP_FLOOR', self.sleep_time))
+        self.sleep_ceiling = float(os.getenv('SLEEP_CEILING', 30))
+        self.sleep_jitter = float(os.getenv('SLEEP_JITTER', 0.2))
+        self.sleep_windows = os.getenv('SLEEP_WINDOWS')
+        self.sleep_window_floor = float(os.getenv('SLEEP_WINDOW_FLOOR', 0))
+        self.sleep_log = os.getenv('SLEEP_LOG')
+        if self.coord_url and self.coord_ttl <= self.sleep_ceiling:
+            print(f"WARN: COORD_TTL ({self.coord_ttl:g}s) should be above SLEEP_CEILING " + \
+                f"({self.sleep_ceiling:g}s), or backed off nodes will drop out between loops!")
+        self.spare_driver = os.getenv('DRIVER_SPARE', 'False') \
+            .lower() in ('true', '1', 't')
+        self.max_failovers = int(os.getenv('DRIVER_MAX_FAILOVERS', 3))
+
+        # in-place recovery, as "state=retries,..." overrides
+        self.recovery_retries = {
+            k.strip(): int(v) for k, v in
+            (item.split("=") for item in split_list(os.getenv('RECOVERY_RETRIES', '')))
+        }
 
 env = EnvDict()
\ No newline at end of file
@@ -0,0 +1,230 @@
+import io
+import os
+import json
+import time
+import zlib
+import zipfile
+import threading
+from collections import deque
+
+# Screenshots are downscaled with Pillow (in requirements.txt), and kept as-is without it
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Grabs everything we want from a page in one round trip
+SNAPSHOT_SCRIPT = """
+return [
+    location.href,
+    window === window.top ? "top" : (window.name || "frame"),
+    document.documentElement.outerHTML
+];
+"""
+
+class Snapshot():
+    """One recorded page, compressed"""
+
+    __slots__ = ("ts", "phase", "label", "url", "frame", "html", "screenshot")
+
+    def __init__(self, ts: float, phase: str, label: str, url: str, frame: str,
+        html: bytes, screenshot: bytes = None):
+        self.ts = ts
+        self.phase = phase
+        self.label = label
+        self.url = url
+        self.frame = frame
+        self.html = html
+        self.screenshot = screenshot
+
+    @property
+    def size(self) -> int:
+        return len(self.html) + len(self.screenshot or b"")
+
+    def meta(self) -> dict:
+        return {
+            "ts": self.ts, "phase": self.phase, "label": self.label,
+            "url": self.url, "frame": self.frame,
+            "html_bytes": len(self.html), "screenshot_bytes": len(self.screenshot or b""),
+        }
+
+class FlightRecorder():
+    """
+    Ring buffer of the last few pages seen in each phase, for post-mortems
+    - Captures are rate limited per phase, and cost one WebDriver call (two with screenshots)
+    - Compression and downscaling happen on a background thread
+    - Oldest pages are evicted to stay under a fixed memory budget
+    """
+
+    def __init__(self, per_phase: int = 5, max_bytes: int = 8 * 1024 * 1024,
+        min_interval: float = 30.0, screenshots: bool = False, max_width: int = 640):
+        """Initialize FlightRecorder"""
+
+        # settings
+        self.per_phase = per_phase
+        self.max_bytes = max_bytes
+        self.min_interval = min_interval
+        self.screenshots = screenshots
+        self.max_width = max_width
+
+        # recorded pages
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._last = {}
+        self.bytes = 0
+        self.captured = 0
+        self.dropped = 0
+
+        # raw pages waiting to be compressed
+        # NOTE: Kept tiny, since these are uncompressed
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="flight-recorder", daemon=True
+        )
+        self._worker.start()
+
+    def due(self, phase: str) -> bool:
+        """Whether phase hasn't been captured recently"""
+
+        return time.monotonic() - self._last.get(phase, float("-inf")) >= self.min_interval
+
+    def capture(self, driver, phase: str, label: str = None, force: bool = False) -> bool:
+        """
+        Snapshots the page driver's on, unless phase was captured recently
+        - Never raises, the page may be gone by the time we look
+        """
+
+        if not force and not self.due(phase):
+            return False
+        self._last[phase] = time.monotonic()
+
+        try:
+            url, frame, html = driver.execute_script(SNAPSHOT_SCRIPT)
+            screenshot = driver.get_screenshot_as_png() if self.screenshots else None
+        except Exception:
+            return False
+
+        with self._cond:
+            if len(self._pending) >= 4:
+                self.dropped += 1
+                return False
+            self._pending.append((time.time(), phase, label, url, frame, html, screenshot))
+            self._cond.notify_all()
+        return True
+
+    def snapshots(self) -> list:
+        """Every recorded page, oldest first"""
+
+        with self._lock:
+            return sorted(
+                (s for ring in self._phases.values() for s in ring),
+                key=lambda s: s.ts
+            )
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits for pending captures to be compressed"""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def archive(self, reason: str = None) -> bytes:
+        """Every recorded page as a zip, pages decompressed"""
+
+        self.flush()
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            index = []
+            for i, snapshot in enumerate(self.snapshots()):
+                name = f"{i:02d}-{snapshot.phase}"
+                archive.writestr(f"{name}.html", zlib.decompress(snapshot.html))
+                if snapshot.screenshot:
+                    ext = "jpg" if snapshot.screenshot[:2] == b"\xff\xd8" else "png"
+                    archive.writestr(f"{name}.{ext}", snapshot.screenshot)
+                index.append(dict(snapshot.meta(), file=f"{name}.html"))
+            archive.writestr("index.json", json.dumps({
+                "reason": reason, "ts": time.time(), "pages": index
+            }, indent=2))
+        return buffer.getvalue()
+
+    def dump(self, directory: str, name: str, reason: str = None) -> str:
+        """Writes the archive to directory, returns its path"""
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}.zip")
+        with open(path, "wb") as f:
+            f.write(self.archive(reason))
+        return path
+
+    def close(self, timeout: float = 5.0):
+        """Stops the worker, once it's filed whatever's still pending"""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+
+    #
+    # Helpers
+    #
+
+    def _run(self):
+        """Worker loop, compresses and files captures"""
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                ts, phase, label, url, frame, html, screenshot = self._pending[0]
+
+            try:
+                self._add(Snapshot(
+                    ts, phase, label, url, frame,
+                    zlib.compress((html or "").encode(), 6),
+                    self._shrink(screenshot) if screenshot else None
+                ))
+            except Exception as e:
+                print(f"\nWARN: Flight recorder could not save a page: {e}")
+
+            with self._cond:
+                self._pending.popleft()
+                self._cond.notify_all()
+
+    def _add(self, snapshot: Snapshot):
+        """Files a snapshot, evicting old ones to stay in budget"""
+
+        with self._lock:
+            ring = self._phases.setdefault(snapshot.phase, deque())
+            ring.append(snapshot)
+            self.bytes += snapshot.size
+            self.captured += 1
+            if len(ring) > self.per_phase:
+                self.bytes -= ring.popleft().size
+
+            # oldest first, across every phase
+            while self.bytes > self.max_bytes:
+                oldest = min(
+                    (r for r in self._phases.values() if r), key=lambda r: r[0].ts
+                )
+                self.bytes -= oldest.popleft().size
+
+    def _shrink(self, png: bytes) -> bytes:
+        """Downscales a screenshot to max_width, as a JPEG"""
+
+        if Image is None:
+            return png
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        if image.width > self.max_width:
+            image = image.resize((self.max_width, int(image.height * self.max_width / image.width)))
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=60)
+        return out.getvalue()
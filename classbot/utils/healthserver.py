@@ -0,0 +1,252 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def _label(value) -> str:
+    """Escapes a Prometheus label value"""
+
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class HealthServer():
+    """
+    Optional HTTP status endpoint, served off the enrollment thread
+    - /healthz: 200 if every enroller's loop advanced recently and its driver answers
+    - /metrics: loop counts, step latencies, errors and notifier stats, for Prometheus
+    - /state: where each enroller is, and what's in its cart(s), as JSON
+    """
+
+    def __init__(self, enrollers, notifier=None, host: str = "127.0.0.1",
+        port: int = 0, max_age: float = 120.0, start_grace: float = 300.0,
+        probe_timeout: float = 5.0, probe_interval: float = 10.0):
+        """Initialize HealthServer, enrollers is a callable returning the live FSU_Enrollers"""
+
+        # sources
+        self.enrollers = enrollers
+        self.notifier = notifier
+
+        # settings
+        self.max_age = max_age
+        self.start_grace = start_grace
+        self.probe_timeout = probe_timeout
+        self.probe_interval = probe_interval
+
+        # driver probes, cached so scrapes stay cheap
+        # NOTE: Probes run on their own thread, so a hung browser can't hang us
+        self._probes = {}
+        self._probe_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="health-probe")
+
+        # http server
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves requests in a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="health-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shuts the server down"""
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._executor.shutdown(wait=False)
+
+    #
+    # Endpoints
+    #
+
+    def healthz(self):
+        """Returns (healthy, details)"""
+
+        details = {}
+        for enroller in self.enrollers():
+            name = enroller.account.username
+
+            # still logging in or waiting on Duo, so there's no loop to judge yet
+            # NOTE: Unless it's been at it for too long, even allowing for Duo
+            if enroller.last_loop is None:
+                starting = time.monotonic() - enroller.started_at
+                details[name] = {
+                    "status": "starting" if starting <= self.max_age + self.start_grace else "unhealthy",
+                    "state": enroller.state.value,
+                    "starting_for": round(starting, 2),
+                }
+                continue
+
+            age = time.monotonic() - enroller.last_loop
+            driver_ok = self._probe(enroller.driver)
+            details[name] = {
+                "status": "ok" if age <= self.max_age and driver_ok else "unhealthy",
+                "state": enroller.state.value,
+                "last_loop_age": round(age, 2),
+                "driver": "ok" if driver_ok else "unresponsive",
+            }
+
+        healthy = all(d["status"] != "unhealthy" for d in details.values())
+        return healthy, details
+
+    def metrics(self) -> str:
+        """Prometheus text exposition"""
+
+        lines = []
+
+        def metric(name: str, kind: str, help: str, samples: list):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        enrollers = list(self.enrollers())
+        now = time.monotonic()
+
+        metric("classbot_up", "gauge", "Whether the bot is serving", [({}, 1)])
+        metric("classbot_loops_total", "counter", "Enrollment loops completed",
+            [({"account": e.account.username}, e.loop_count) for e in enrollers])
+        metric("classbot_last_loop_age_seconds", "gauge", "Seconds since the last loop finished",
+            [({"account": e.account.username}, round(now - e.last_loop, 3))
+                for e in enrollers if e.last_loop is not None])
+
+        # every span the tracer knows about, as a summary
+        steps = []
+        for e in enrollers:
+            for step, hist in e.tracer.snapshot().items():
+                labels = {"account": e.account.username, "step": step}
+                for q in (50, 95, 99):
+                    steps.append(({**labels, "quantile": q / 100}, round(hist[q], 6)))
+                steps.append(({**labels, "stat": "sum"}, round(hist["sum"], 6)))
+                steps.append(({**labels, "stat": "count"}, hist["count"]))
+        metric("classbot_step_seconds", "summary", "Time spent in each step", [
+            (labels, value) for labels, value in steps if "stat" not in labels
+        ])
+        lines.extend(
+            f'classbot_step_seconds_{labels["stat"]}{{account="{_label(labels["account"])}",'
+            f'step="{_label(labels["step"])}"}} {value}'
+            for labels, value in steps if "stat" in labels
+        )
+
+        metric("classbot_errors_total", "counter", "Errors hit, by exception type", [
+            ({"account": e.account.username, "type": kind}, count)
+            for e in enrollers for kind, count in dict(e.errors).items()
+        ])
+        metric("classbot_recoveries_total", "counter", "In-place recoveries, by action", [
+            ({"account": e.account.username, "action": action.value}, count)
+            for e in enrollers for action, count in dict(e.recovery.counts).items()
+        ])
+
+        # notifier, if it's queued and/or rate limited
+        if self.notifier is not None:
+            depth = getattr(self.notifier, "depth", None)
+            if depth is not None:
+                metric("classbot_notifier_queue_depth", "gauge",
+                    "Webhook calls waiting to be delivered", [({}, depth)])
+                metric("classbot_notifier_dropped_total", "counter",
+                    "Webhook calls dropped because the queue was full", [({}, self.notifier.dropped)])
+            transport = getattr(self.notifier, "transport", None)
+            if transport is not None:
+                metric("classbot_webhook_requests_total", "counter",
+                    "Webhook requests sent", [({}, transport.sent)])
+                metric("classbot_webhook_throttled_total", "counter",
+                    "Webhook requests that hit a 429", [({}, transport.throttled)])
+
+        return "\n".join(lines) + "\n"
+
+    def state(self) -> dict:
+        """Where each enroller is"""
+
+        return {
+            e.account.username: {
+                "state": e.state.value,
+                "term": e.term.semester,
+                "loop_count": e.loop_count,
+                "terms": {
+                    t.semester: {
+                        "seat_status": dict(t.seat_status),
+                        "last_messages": dict(t.last_messages),
+                        "done": t not in e.terms,
+                    } for t in e.all_terms
+                },
+            } for e in self.enrollers()
+        }
+
+    #
+    # Helpers
+    #
+
+    def _probe(self, driver) -> bool:
+        """Whether a driver answered a trivial command lately"""
+
+        if driver is None:
+            return False
+
+        with self._probe_lock:
+            checked, ok, future = self._probes.get(id(driver), (0.0, True, None))
+
+            # last probe still hanging, so the browser's stuck
+            if future is not None and not future.done():
+                return time.monotonic() - checked < self.probe_timeout
+
+            # recent enough answer
+            if future is not None and time.monotonic() - checked < self.probe_interval:
+                return ok
+
+            future = self._executor.submit(lambda: driver.current_window_handle)
+            checked = time.monotonic()
+            self._probes[id(driver)] = (checked, ok, future)
+
+        try:
+            future.result(timeout=self.probe_timeout)
+            ok = True
+        except Exception:
+            ok = False
+        with self._probe_lock:
+            self._probes[id(driver)] = (checked, ok, future)
+        return ok
+
+    def _make_handler(self):
+        """Builds the request handler class bound to this server"""
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                try:
+                    if path == "/healthz":
+                        healthy, details = server.healthz()
+                        status = 200 if healthy else 503
+                        body, kind = json.dumps(details), "application/json"
+                    elif path == "/metrics":
+                        status, body, kind = 200, server.metrics(), "text/plain; version=0.0.4"
+                    elif path == "/state":
+                        status, body, kind = 200, json.dumps(server.state()), "application/json"
+                    else:
+                        status, body, kind = 404, "Not Found", "text/plain"
+                except Exception as e:
+                    status, body, kind = 500, f"{type(e).__name__}: {e}", "text/plain"
+
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,158 @@
+from collections import Counter
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException
+
+from .drivertools import get_wait
+
+class Locator():
+    """
+    A selector, and what to wait for before using it
+    - page is "portal" for the outer pages, or "omni" for ones inside OMNI's frame
+    - navigates means clicking it replaces the page, and every handle on it
+    - action is the PeopleSoft ICAction a click fires, for the HTTP fast path
+    """
+
+    def __init__(self, name: str, by: str, value: str,
+        condition=EC.element_to_be_clickable, page: str = "omni",
+        navigates: bool = False, action: str = None):
+        self.name = name
+        self.by = by
+        self.value = value
+        self.condition = condition
+        self.page = page
+        self.navigates = navigates
+        self.action = action
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    @property
+    def locator(self) -> tuple:
+        """(by, value), as Selenium wants it"""
+
+        return (self.by, self.value)
+
+    @property
+    def css(self) -> str:
+        """Same selector in CSS, for in-page waits (race_dom)"""
+
+        if self.by == By.ID:
+            return f'[id="{self.value}"]'
+        if self.by == By.CLASS_NAME:
+            return f".{self.value}"
+        if self.by == By.CSS_SELECTOR:
+            return self.value
+        raise Exception(f"Locator '{self.name}' has no CSS equivalent!")
+
+    def format(self, *args):
+        """Fills in a templated locator, i.e. one row of a grid"""
+
+        return Locator(
+            f"{self.name}[{','.join(map(str, args))}]", self.by, self.value.format(*args),
+            self.condition, self.page, self.navigates, self.action
+        )
+
+class Locators():
+    """Every element FSU_Enroller touches, so markup changes are a one-file fix"""
+
+    # CAS login and Duo
+    USERNAME = Locator("username", By.ID, 'username', EC.presence_of_element_located, page="portal")
+    PASSWORD = Locator("password", By.ID, 'password', EC.presence_of_element_located, page="portal")
+    LOGIN_BUTTON = Locator("login_button", By.ID, 'fsu-login-button', page="portal", navigates=True)
+    LOGIN_ERROR = Locator("login_error", By.ID, 'msg', EC.presence_of_element_located, page="portal")
+    DUO_FRAME = Locator("duo_frame", By.ID, 'duo_iframe', EC.presence_of_element_located, page="portal")
+
+    # myFSU dashboard, "Future" tab of the "My Courses" section, and the enroll link within it
+    DASHBOARD_TAB = Locator("dashboard_tab", By.ID,
+        'kgoui_Rcontent_I0_Rcolumn1_I1_Rcontent_I0_Rtabs1_label', page="portal")
+    ENROLL_LINK = Locator("enroll_link", By.XPATH,
+        "//img[@title='Enroll in a course']", page="portal", navigates=True)
+
+    # OMNI's frame, which everything below lives in
+    OMNI_FRAME = Locator("omni_frame", By.XPATH, '//*[@id="main_target_win0"]',
+        EC.presence_of_element_located, page="portal")
+
+    # Term select
+    TERM_GRID = Locator("term_grid", By.CLASS_NAME, 'PSLEVEL2GRID', EC.presence_of_element_located)
+    TERM_NAMES = Locator("term_names", By.CSS_SELECTOR, "span[id*='TERM_CAR$']",
+        EC.presence_of_element_located)
+    TERM_RADIO = Locator("term_radio", By.ID, "SSR_DUMMY_RECV1$sels${}$$0")
+    TERM_CONTINUE = Locator("term_continue", By.ID, 'DERIVED_SSS_SCT_SSR_PB_GO',
+        navigates=True, action='DERIVED_SSS_SCT_SSR_PB_GO')
+
+    # Cart, confirm and results
+    CART_GRID = Locator("cart_grid", By.ID, 'SSR_REGFORM_VW$scroll$0', EC.presence_of_element_located)
+    PROCEED = Locator("proceed", By.ID, 'DERIVED_REGFRM1_LINK_ADD_ENRL$82$',
+        navigates=True, action='DERIVED_REGFRM1_LINK_ADD_ENRL$82$')
+    SUBMIT = Locator("submit", By.ID, 'DERIVED_REGFRM1_SSR_PB_SUBMIT',
+        navigates=True, action='DERIVED_REGFRM1_SSR_PB_SUBMIT')
+    RESULTS_GRID = Locator("results_grid", By.ID, 'SSR_SS_ERD_ER$scroll$0', EC.presence_of_element_located)
+    START_OVER = Locator("start_over", By.ID, 'win0divDERIVED_REGFRM1_SSR_LINK_STARTOVER',
+        navigates=True, action='DERIVED_REGFRM1_SSR_LINK_STARTOVER')
+
+    # Class search section detail, read over HTTP by seat watchers
+    SECTION_NAME = Locator("section_name", By.ID, 'DERIVED_CLSRCH_DESCR200', EC.presence_of_element_located)
+    SECTION_STATUS = Locator("section_status", By.ID, 'SSR_CLS_DTL_WRK_SSR_DESCRSHORT',
+        EC.presence_of_element_located)
+    SECTION_CAPACITY = Locator("section_capacity", By.ID, 'SSR_CLS_DTL_WRK_ENRL_CAP',
+        EC.presence_of_element_located)
+    SECTION_ENROLLED = Locator("section_enrolled", By.ID, 'SSR_CLS_DTL_WRK_ENRL_TOT',
+        EC.presence_of_element_located)
+    SECTION_AVAILABLE = Locator("section_available", By.ID, 'SSR_CLS_DTL_WRK_AVAILABLE_SEATS',
+        EC.presence_of_element_located)
+    SECTION_WAIT_TOTAL = Locator("section_wait_total", By.ID, 'SSR_CLS_DTL_WRK_WAIT_TOT',
+        EC.presence_of_element_located)
+
+class ElementCache():
+    """
+    Element handles for one tab, reused until the page they came from goes away
+    - Clicking a navigating locator drops every handle on that page
+    - Reused handles are checked with a single call, and looked up again if stale
+    - Counts lookups and reuses per locator
+    """
+
+    def __init__(self, driver: webdriver):
+        """Initialize ElementCache"""
+
+        self.driver = driver
+        self.handles = {}
+        self.lookups = Counter()
+        self.reuses = Counter()
+
+    def get(self, locator: Locator):
+        """Returns the element for a locator, waiting on its condition if we have to look it up"""
+
+        # cheap check that the handle's page is still there
+        element, _ = self.handles.get(locator.name, (None, None))
+        if element is not None:
+            try:
+                element.is_enabled()
+                self.reuses[locator.name] += 1
+                return element
+            except (StaleElementReferenceException, NoSuchElementException):
+                del self.handles[locator.name]
+
+        self.lookups[locator.name] += 1
+        element = get_wait(self.driver).until(locator.condition(locator.locator))
+        self.handles[locator.name] = (element, locator.page)
+        return element
+
+    def click(self, locator: Locator):
+        """Clicks a locator's element, forgetting its page if that navigates away"""
+
+        # NOTE: The portal page holds OMNI's frame, so leaving it drops everything
+        element = self.get(locator)
+        if locator.navigates:
+            self.invalidate(locator.page if locator.page != "portal" else None)
+        element.click()
+
+    def invalidate(self, page: str = None):
+        """Forgets handles on a page ("portal" or "omni"), or every handle"""
+
+        self.handles = {
+            name: (element, on) for name, (element, on) in self.handles.items()
+            if page is not None and on != page
+        }
@@ -0,0 +1,237 @@
+import time
+import threading
+from collections import deque
+
+from .discordlib import DiscordNotifier
+
+class PendingMessage(dict):
+    """
+    Placeholder for a message that may not have been sent yet.
+    - Filled in with Discord's response once the worker delivers it
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.ready = threading.Event()
+
+    def resolve(self, response: dict):
+        """Fills the handle in with Discord's response"""
+
+        if isinstance(response, dict):
+            self.update(response)
+        self.ready.set()
+
+class _Job():
+    """A single queued notifier call"""
+
+    def __init__(self, method: str, message: PendingMessage = None,
+        handle: PendingMessage = None, **kwargs):
+        self.method = method
+        self.message = message
+        self.handle = handle
+        self.kwargs = kwargs
+
+    @property
+    def key(self):
+        """Coalescing key; only updates to a message coalesce"""
+
+        if self.method.startswith("update_") and self.message is not None:
+            return (self.method, id(self.message))
+        return None
+
+class NotifierQueue():
+    """
+    Background delivery wrapper around a DiscordNotifier
+    - Exposes the same send/update/delete calls, but never blocks on HTTP
+    - Queued updates to the same message are coalesced into one
+    """
+
+    def __init__(self, notifier: DiscordNotifier, max_size: int = 100):
+        """Initialize NotifierQueue"""
+
+        # save vars
+        self.notifier = notifier
+        self.max_size = max_size
+
+        # queue state
+        self._jobs = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self.dropped = 0
+
+        # start up worker
+        self._worker = threading.Thread(
+            target=self._run, name="notifier-queue", daemon=True
+        )
+        self._worker.start()
+
+    def __getattr__(self, name):
+        # Anything we don't wrap (pings, id, token...) comes from the notifier
+        return getattr(self.notifier, name)
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting to be delivered"""
+
+        with self._cond:
+            return len(self._jobs) + (1 if self._busy else 0)
+
+    #
+    # Notifier API
+    #
+
+    def send_message(self, content: str):
+        """Queues a message, returns a pending handle"""
+
+        return self._put_send("send_message", content=content)
+
+    def send_embed(self, title: str, description: str,
+        image: str = None, color: int = DiscordNotifier.Colors.PRIMARY):
+        """Queues an embed, returns a pending handle"""
+
+        return self._put_send("send_embed", title=title,
+            description=description, image=image, color=color)
+
+    def send_file(self, content: str, filename: str, data: bytes):
+        """Queues a message with a file attached, returns a pending handle"""
+
+        return self._put_send("send_file", content=content, filename=filename, data=data)
+
+    def update_message(self, message: dict, content: str):
+        """Queues a message update"""
+
+        self._put(_Job("update_message", message, content=content))
+        return message
+
+    def update_embed(self, message: dict,
+        title: str = None, description: str = None,
+        image: str = None, color: int = None):
+        """Queues an embed update"""
+
+        self._put(_Job("update_embed", message, title=title,
+            description=description, image=image, color=color))
+        return message
+
+    def delete_message(self, message: dict):
+        """Queues a message delete"""
+
+        with self._cond:
+            # no point in updating something we're going to delete anyways
+            self._jobs = deque(
+                job for job in self._jobs
+                if job.key is None or job.message is not message
+            )
+        self._put(_Job("delete_message", message))
+
+    #
+    # Lifecycle
+    #
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until the queue drains or the deadline passes"""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"WARN: Notifier flush timed out, {len(self._jobs)} message(s) unsent!")
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Flushes, then stops the worker"""
+
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return flushed
+
+    #
+    # Helpers
+    #
+
+    def _put_send(self, method: str, **kwargs):
+        """Queues a send and returns its pending handle"""
+
+        handle = PendingMessage()
+        if not self._put(_Job(method, handle=handle, **kwargs)):
+            handle.resolve(None)
+        return handle
+
+    def _put(self, job: _Job) -> bool:
+        """Adds a job to the queue, coalescing where possible"""
+
+        with self._cond:
+
+            # closed queues go nowhere
+            if self._closed:
+                return False
+
+            # coalesce with a waiting update for the same message
+            if job.key is not None:
+                for queued in self._jobs:
+                    if queued.key == job.key:
+                        queued.kwargs.update(
+                            {k: v for k, v in job.kwargs.items() if v is not None}
+                        )
+                        return True
+
+            # never block the caller; drop if we're full
+            if len(self._jobs) >= self.max_size:
+                self.dropped += 1
+                print(f"\nWARN: Notifier queue full, dropping '{job.method}'!")
+                return False
+
+            self._jobs.append(job)
+            self._cond.notify_all()
+            return True
+
+    def _run(self):
+        """Worker loop, delivers jobs in order"""
+
+        while True:
+
+            # wait for work
+            with self._cond:
+                while not self._jobs and not self._closed:
+                    self._cond.wait()
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+                self._busy = True
+
+            # deliver it
+            try:
+                self._deliver(job)
+            except Exception as e:
+                print(f"\nWARN: Notifier failed to deliver '{job.method}': {e}")
+                if job.handle is not None:
+                    job.handle.resolve(None)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, job: _Job):
+        """Sends a single job using the wrapped notifier"""
+
+        # sends fill in their handle
+        if job.handle is not None:
+            job.handle.resolve(
+                getattr(self.notifier, job.method)(**job.kwargs)
+            )
+            return
+
+        # everything else needs a message that actually made it out
+        if 'id' not in job.message:
+            print(f"\nWARN: Skipping '{job.method}', message was never sent!")
+            return
+
+        # updates refresh the handle so later updates see current state
+        response = getattr(self.notifier, job.method)(job.message, **job.kwargs)
+        if job.method.startswith("update_") and isinstance(response, dict):
+            job.message.update(response)
@@ -0,0 +1,175 @@
+from html.parser import HTMLParser
+
+from .drivertools import GridRow
+
+# Tags that never have children
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Tags that start a new line when rendered, roughly like innerText
+BLOCK_TAGS = {'div', 'p', 'tr', 'table', 'tbody', 'li', 'ul', 'form', 'h1', 'h2', 'h3'}
+
+class Node():
+    """A tiny DOM node, just enough to read PeopleSoft pages"""
+
+    def __init__(self, tag: str, attrs: dict = None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+
+    def __repr__(self):
+        return f"<{self.tag} {self.attrs}>"
+
+    def iter(self):
+        """Walks every element below this one, depth first"""
+
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter()
+
+    def find(self, tag: str = None, **attrs):
+        """Returns the first descendant matching tag and exact attrs"""
+
+        return next(self.find_all(tag, **attrs), None)
+
+    def find_all(self, tag: str = None, **attrs):
+        """Yields every descendant matching tag and exact attrs"""
+
+        # NOTE: class is a keyword, so class_ is accepted in its place
+        if 'class_' in attrs:
+            attrs['class'] = attrs.pop('class_')
+        for node in self.iter():
+            if tag is not None and node.tag != tag:
+                continue
+            if all(node.attrs.get(k) == v for k, v in attrs.items()):
+                yield node
+
+    def text(self) -> str:
+        """Text content, with line breaks roughly where a browser puts them"""
+
+        parts = []
+        self._text(parts)
+        lines = "".join(parts).split("\n")
+        return "\n".join(
+            " ".join(line.split()) for line in lines if line.strip()
+        )
+
+    def _text(self, parts: list):
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == 'br':
+                parts.append("\n")
+            elif child.tag not in ('script', 'style'):
+                child._text(parts)
+                if child.tag in BLOCK_TAGS:
+                    parts.append("\n")
+
+class _TreeBuilder(HTMLParser):
+    """Builds a Node tree, forgiving of unclosed tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        # pop back to the matching tag, ignoring strays
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def parse_html(html: str) -> Node:
+    """Parses a page into a Node tree"""
+
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def read_grid_html(page: Node, parent_id: str, row_type: type = GridRow):
+    """
+    Reads a PeopleSoft grid out of parsed HTML
+    - Same rows as drivertools.read_grid, but with no browser involved
+    - Returns None if the grid isn't on the page
+    """
+
+    parent = page.find(id=parent_id)
+    table = parent.find('table', class_='PSLEVEL1GRID') if parent else None
+    if table is None:
+        return None
+
+    # Browsers add a tbody if the server didn't send one, so don't rely on it
+    body = table.find('tbody') or table
+    rows = []
+    for tr in body.find_all('tr'):
+        cells = []
+        for td in tr.find_all('td'):
+            span = td.find('span')
+            div = next((
+                d for d in td.find_all('div')
+                if d.parent is not None and d.parent.tag == 'div'
+            ), None)
+            img = td.find('img')
+            cells.append({
+                "text": td.text(),
+                "span": span.text() if span else None,
+                "div": div.text() if div else None,
+                "img": img.attrs.get('alt', "") if img else None,
+            })
+        rows.append(row_type(tr.text(), cells))
+    return rows
+
+def form_fields(page: Node, form_name: str = 'win0'):
+    """
+    Collects what a browser would submit for a form
+    - Returns (action, fields), or (None, None) if the form isn't there
+    """
+
+    form = page.find('form', name=form_name)
+    if form is None:
+        return None, None
+
+    fields = {}
+    for node in form.iter():
+        name = node.attrs.get('name')
+        if not name or 'disabled' in node.attrs:
+            continue
+
+        if node.tag == 'input':
+            kind = node.attrs.get('type', 'text').lower()
+            if kind in ('submit', 'button', 'image', 'reset', 'file'):
+                continue
+            if kind in ('checkbox', 'radio') and 'checked' not in node.attrs:
+                continue
+            fields[name] = node.attrs.get('value', 'on' if kind in ('checkbox', 'radio') else '')
+
+        elif node.tag == 'select':
+            options = list(node.find_all('option'))
+            chosen = next((o for o in options if 'selected' in o.attrs), options[0] if options else None)
+            if chosen is not None:
+                fields[name] = chosen.attrs.get('value', chosen.text())
+
+        elif node.tag == 'textarea':
+            fields[name] = node.text()
+
+    return form.attrs.get('action', ''), fields
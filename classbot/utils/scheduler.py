@@ -0,0 +1,168 @@
+import json
+import time
+import random
+from collections import deque
+from datetime import datetime
+
+class PollWindow():
+    """
+    A period where we poll more aggressively
+    - "HH:MM-HH:MM" repeats daily, "<iso start>/<iso end>" is one-off
+    """
+
+    def __init__(self, spec: str):
+        """Initialize PollWindow"""
+
+        self.spec = spec.strip()
+        if "/" in self.spec:
+            start, end = self.spec.split("/")
+            self.start = datetime.fromisoformat(start)
+            self.end = datetime.fromisoformat(end)
+            self.daily = False
+        elif "-" in self.spec:
+            start, end = self.spec.split("-")
+            self.start = datetime.strptime(start, "%H:%M").time()
+            self.end = datetime.strptime(end, "%H:%M").time()
+            self.daily = True
+        else:
+            raise Exception(f"Invalid poll window: '{spec}'")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.spec!r})"
+
+    def contains(self, now: datetime) -> bool:
+        """Whether a time falls inside this window"""
+
+        if not self.daily:
+            return self.start <= now <= self.end
+
+        # daily windows may wrap past midnight
+        t = now.time()
+        if self.start <= self.end:
+            return self.start <= t <= self.end
+        return t >= self.start or t <= self.end
+
+class PollDecision():
+    """A chosen delay, and why we chose it"""
+
+    def __init__(self, delay: float, reason: str, latency: float, error_rate: float):
+        self.time = time.time()
+        self.delay = delay
+        self.reason = reason
+        self.latency = latency
+        self.error_rate = error_rate
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.__dict__}"
+
+class PollScheduler():
+    """
+    Picks the delay between enrollment loops from how the portal is doing
+    - Backs off (with jitter) when cycles are slow or failing
+    - Tightens towards the floor when things are healthy
+    - Polls at the window floor during configured aggressive windows
+    """
+
+    def __init__(self, base: float, floor: float, ceiling: float,
+        jitter: float = 0.2, windows: list = None, window_floor: float = 0.0,
+        log_path: str = None, history: int = 500):
+        """Initialize PollScheduler"""
+
+        # settings
+        self.floor = floor
+        self.ceiling = max(ceiling, floor)
+        self.jitter = jitter
+        self.windows = windows or []
+        self.window_floor = window_floor
+        self.log_path = log_path
+
+        # state
+        self.delay = min(max(base, floor), self.ceiling)
+        self.latency = None
+        self.baseline = None
+        self.error_rate = 0.0
+
+        # the stream of decisions, newest last
+        self.decisions = deque(maxlen=history)
+        self._listeners = []
+
+    def record(self, latency: float, error: bool = False):
+        """Feeds in how long a cycle took, and whether it failed"""
+
+        # exponentially weighted averages, so we react quickly but not wildly
+        self.latency = latency if self.latency is None \
+            else 0.7 * self.latency + 0.3 * latency
+        self.error_rate = 0.8 * self.error_rate + (0.2 if error else 0.0)
+
+        # baseline is the best we've seen, drifting up slowly so it can recover
+        if not error:
+            self.baseline = latency if self.baseline is None \
+                else min(latency, self.baseline * 1.01)
+
+    def next_delay(self) -> PollDecision:
+        """Chooses how long to wait before the next cycle"""
+
+        # aggressive windows trump everything else
+        window = self._active_window()
+        if window is not None:
+            decision = self._decide(self.window_floor, f"inside window {window.spec}")
+
+        # failing: back off hard
+        elif self.error_rate > 0.3:
+            self.delay = min(self.ceiling, self.delay * 2)
+            decision = self._decide(self._jittered(self.delay),
+                f"error rate {self.error_rate:.0%}, backing off")
+
+        # slow: back off gently
+        elif self.baseline and self.latency > self.baseline * 2:
+            self.delay = min(self.ceiling, self.delay * 1.5)
+            decision = self._decide(self._jittered(self.delay),
+                f"cycles {self.latency / self.baseline:.1f}x slower than baseline, backing off")
+
+        # healthy: tighten up
+        else:
+            self.delay = max(self.floor, self.delay * 0.75)
+            decision = self._decide(self._jittered(self.delay), "healthy, tightening")
+
+        return decision
+
+    def subscribe(self, callback):
+        """Calls callback(decision) for every decision made from now on"""
+
+        self._listeners.append(callback)
+
+    #
+    # Helpers
+    #
+
+    def _active_window(self):
+        """Returns the window we're in, if any"""
+
+        now = datetime.now()
+        return next((w for w in self.windows if w.contains(now)), None)
+
+    def _jittered(self, delay: float) -> float:
+        """Spreads a delay by +/- jitter, never below the floor"""
+
+        spread = delay * self.jitter
+        return min(self.ceiling, max(self.floor, delay + random.uniform(-spread, spread)))
+
+    def _decide(self, delay: float, reason: str) -> PollDecision:
+        """Records and publishes a decision"""
+
+        decision = PollDecision(delay, reason, self.latency, self.error_rate)
+        self.decisions.append(decision)
+
+        for callback in self._listeners:
+            callback(decision)
+
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(decision.__dict__) + "\n")
+
+        return decision
+
+def parse_windows(spec: str) -> list:
+    """Parses a comma separated list of poll windows"""
+
+    return [PollWindow(s) for s in (spec or "").split(",") if s.strip()]
@@ -0,0 +1,65 @@
+import os
+import json
+import base64
+import hashlib
+
+from cryptography.fernet import Fernet, InvalidToken
+
+class SessionStore():
+    """
+    Encrypted on-disk cache of logged in browser sessions
+    - One file per account, so supervised workers don't step on each other
+    - Encrypted with Fernet, using a key derived from SESSION_KEY
+    """
+
+    def __init__(self, directory: str, key: str):
+        """Initialize SessionStore"""
+
+        # Error checking
+        if not key:
+            raise Exception("SessionStore needs a key, refusing to store cookies in plaintext!")
+
+        # save vars
+        self.directory = directory
+        self.fernet = Fernet(
+            base64.urlsafe_b64encode(hashlib.sha256(key.encode()).digest())
+        )
+
+    def save(self, username: str, session: dict):
+        """Encrypts and writes a session to disk"""
+
+        os.makedirs(self.directory, exist_ok=True)
+        token = self.fernet.encrypt(json.dumps(session).encode())
+
+        # write then rename, so a crash never leaves a half-written file
+        path = self._path(username)
+        with open(path + ".tmp", "wb") as f:
+            f.write(token)
+        os.chmod(path + ".tmp", 0o600)
+        os.replace(path + ".tmp", path)
+
+    def load(self, username: str):
+        """Reads a session from disk, returns None if missing or unreadable"""
+
+        try:
+            with open(self._path(username), "rb") as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return None
+        except (InvalidToken, ValueError):
+            print(f"WARN: Cached session for '{username}' is unreadable, ignoring it.")
+            return None
+
+    def clear(self, username: str):
+        """Removes a cached session"""
+
+        try:
+            os.remove(self._path(username))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, username: str) -> str:
+        """File a user's session lives in"""
+
+        name = hashlib.sha256(username.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.session")
@@ -0,0 +1,175 @@
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+class Histogram():
+    """Keeps the most recent samples of a span, for percentiles"""
+
+    def __init__(self, size: int = 2048):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of the recent samples"""
+
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[idx]
+
+class Tracer():
+    """
+    Times phases of the enroller
+    - Spans feed in-memory histograms, and optionally a JSONL file
+    - Nested spans are recorded with their parent's name
+    """
+
+    def __init__(self, log_path: str = None, tags: dict = None):
+        """Initialize Tracer"""
+
+        # save vars
+        self.tags = tags or {}
+        self.histograms = {}
+
+        # optional jsonl output
+        self._lock = threading.Lock()
+        self._log = open(log_path, "a", buffering=1) if log_path else None
+
+        # per-thread stack of open spans
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Times the body of a with block"""
+
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self.record(name, duration, parent=parent, error=error, **attrs)
+
+    @contextmanager
+    def capture(self):
+        """Collects {span: total duration} of spans finished on this thread inside the block"""
+
+        captured = {}
+        captures = self._captures()
+        captures.append(captured)
+        try:
+            yield captured
+        finally:
+            captures.remove(captured)
+
+    def record(self, name: str, duration: float, **attrs):
+        """Adds a finished span"""
+
+        for captured in self._captures():
+            captured[name] = captured.get(name, 0.0) + duration
+
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).add(duration)
+            if self._log:
+                self._log.write(json.dumps({
+                    "ts": time.time(),
+                    "span": name,
+                    "duration": round(duration, 6),
+                    **self.tags,
+                    **{k: v for k, v in attrs.items() if v is not None}
+                }) + "\n")
+
+    @property
+    def current(self):
+        """Name of the innermost open span on this thread, if any"""
+
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @property
+    def stack(self) -> list:
+        """Names of the spans open on this thread, outermost first"""
+
+        return list(self._stack())
+
+    def summary(self, limit: int = 8) -> str:
+        """Compact p50/p95/p99 table of the slowest spans, by total time"""
+
+        with self._lock:
+            rows = sorted(
+                self.histograms.items(),
+                key=lambda kv: kv[1].total, reverse=True
+            )[:limit]
+            lines = [f"{'span':<16}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for name, hist in rows:
+                lines.append(
+                    f"{name[:16]:<16}" + "".join(
+                        f"{hist.percentile(p):>7.2f}" for p in (50, 95, 99)
+                    )
+                )
+        return "\n".join(lines)
+
+    def snapshot(self) -> dict:
+        """{span: {count, sum, 50, 95, 99}} of every span so far, for exporting"""
+
+        with self._lock:
+            return {
+                name: {
+                    "count": hist.count,
+                    "sum": hist.total,
+                    **{p: hist.percentile(p) for p in (50, 95, 99)}
+                } for name, hist in self.histograms.items()
+            }
+
+    def close(self):
+        """Closes the log file, spans recorded after this are only kept in memory"""
+
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _captures(self) -> list:
+        if not hasattr(self._local, "captures"):
+            self._local.captures = []
+        return self._local.captures
+
+class TracedProxy():
+    """Wraps an object so every method call is a span"""
+
+    def __init__(self, target, tracer: Tracer, prefix: str):
+        self._target = target
+        self._tracer = tracer
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr) or isinstance(attr, type) or name.startswith("_"):
+            return attr
+
+        def traced(*args, **kwargs):
+            with self._tracer.span(f"{self._prefix}.{name}"):
+                return attr(*args, **kwargs)
+        return traced
@@ -0,0 +1,153 @@
+import time
+import threading
+import requests
+
+class RateLimitBucket():
+    """Tracks Discord's view of a single rate limit bucket"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.__dict__}"
+
+    def wait_time(self) -> float:
+        """Seconds to wait before this bucket has budget again"""
+
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        return max(0.0, self.reset_at - time.monotonic())
+
+    def consume(self):
+        """Spends one request from the local budget estimate"""
+
+        if self.remaining is not None and self.remaining > 0:
+            self.remaining -= 1
+
+    def update(self, headers: dict):
+        """Refreshes bucket state from X-RateLimit-* headers"""
+
+        if 'X-RateLimit-Limit' in headers:
+            self.limit = int(headers['X-RateLimit-Limit'])
+        if 'X-RateLimit-Remaining' in headers:
+            self.remaining = int(headers['X-RateLimit-Remaining'])
+        if 'X-RateLimit-Reset-After' in headers:
+            self.reset_at = time.monotonic() + \
+                float(headers['X-RateLimit-Reset-After'])
+
+class WebhookTransport():
+    """
+    Keep-alive, rate limit aware HTTP transport for Discord webhooks
+    - One pooled requests.Session for every call
+    - Sends are scheduled against Discord's X-RateLimit-* budget
+    - 429s are waited out and retried
+    """
+
+    def __init__(self, max_retries: int = 3, timeout: float = 10):
+        """Initialize WebhookTransport"""
+
+        # save vars
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        # one session, so we reuse our TLS connection
+        self.session = requests.Session()
+
+        # route -> bucket name, bucket name -> bucket
+        self._routes = {}
+        self._buckets = {}
+        self._global_reset_at = 0.0
+        self._lock = threading.Lock()
+
+        # stats
+        self.sent = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def request(self, method: str, url: str, route: str, **kwargs):
+        """Sends a request, waiting on the route's bucket if needed"""
+
+        for attempt in range(self.max_retries + 1):
+
+            # wait until we have budget
+            self._wait_for(route)
+
+            # send it
+            response = self.session.request(
+                method, url, timeout=self.timeout, **kwargs
+            )
+            self.sent += 1
+            self._update(route, response)
+
+            # if we got limited anyways, wait it out and retry
+            if response.status_code == 429:
+                self.throttled += 1
+                retry_after = self._retry_after(response)
+                if response.headers.get('X-RateLimit-Global'):
+                    self._global_reset_at = time.monotonic() + retry_after
+                print(f"\nWARN: Discord rate limited '{route}', retrying in {retry_after:.2f}s")
+                if attempt < self.max_retries:
+                    self._sleep(retry_after)
+                    continue
+
+            return response
+
+        return response
+
+    def close(self):
+        """Closes the pooled session"""
+
+        self.session.close()
+
+    #
+    # Helpers
+    #
+
+    def _bucket(self, route: str):
+        """Returns the bucket for a route, if we know it yet"""
+
+        name = self._routes.get(route)
+        return self._buckets.get(name) if name else None
+
+    def _wait_for(self, route: str):
+        """Blocks until both the global and route limits allow a send"""
+
+        with self._lock:
+            bucket = self._bucket(route)
+            delay = max(
+                self._global_reset_at - time.monotonic(),
+                bucket.wait_time() if bucket else 0.0
+            )
+            if bucket:
+                bucket.consume()
+        if delay > 0:
+            self._sleep(delay)
+
+    def _update(self, route: str, response):
+        """Reads rate limit headers off of a response"""
+
+        name = response.headers.get('X-RateLimit-Bucket')
+        if not name:
+            return
+        with self._lock:
+            self._routes[route] = name
+            bucket = self._buckets.setdefault(name, RateLimitBucket(name))
+            bucket.update(response.headers)
+
+    def _retry_after(self, response) -> float:
+        """Works out how long a 429 wants us to wait"""
+
+        # body is most precise, header is a fallback
+        try:
+            return float(response.json()['retry_after'])
+        except Exception:
+            return float(response.headers.get('Retry-After', 1))
+
+    def _sleep(self, seconds: float):
+        """Sleeps, keeping count of time spent waiting"""
+
+        self.waited += seconds
+        time.sleep(seconds)
@@ -0,0 +1,25 @@
+import pytest
+
+from classbot.bench import prepare_env
+
+# classbot.utils reads its config on import, so fill it in before any test module does
+prepare_env()
+
+from classbot.fakes.fakehook import FakeWebhookServer
+from classbot.fakes.fakesoft import FakePeopleSoft
+
+@pytest.fixture
+def peoplesoft():
+    """A fake PeopleSoft, serving the cart"""
+
+    server = FakePeopleSoft().start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def webhook():
+    """A fake Discord webhook, with a small rate limit bucket"""
+
+    server = FakeWebhookServer(limit=3, window=0.5).start()
+    yield server
+    server.stop()
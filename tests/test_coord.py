@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from classbot.coord import Coordinator, connect
+from classbot.coord.sqlite import SQLiteBackend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "coord.db"))
+    yield backend
+    backend.close()
+
+def test_lease_is_exclusive(backend):
+    assert backend.acquire("k", "a", 10)
+    assert not backend.acquire("k", "b", 10)
+    assert backend.owner("k") == "a"
+
+def test_lease_expires(backend):
+    assert backend.acquire("k", "a", 0.05)
+    time.sleep(0.1)
+
+    assert backend.owner("k") is None
+    assert not backend.renew("k", "a", 10)
+    assert backend.acquire("k", "b", 10)
+
+def test_only_the_owner_renews_or_releases(backend):
+    backend.acquire("k", "a", 10)
+
+    assert not backend.renew("k", "b", 10)
+    assert not backend.release("k", "b")
+    assert backend.renew("k", "a", 20)
+    assert 10 < backend.pttl("k") <= 20
+    assert backend.release("k", "a")
+    assert backend.pttl("k") == 0.0
+
+def test_members(backend):
+    backend.acquire("node:a", "a", 10)
+    backend.acquire("node:b", "b", 0.05)
+    time.sleep(0.1)
+
+    assert backend.members("node:") == ["a"]
+
+def test_events_are_capped(backend):
+    for i in range(250):
+        backend.publish("c", {"i": i})
+    events = backend.recent("c")
+
+    assert len(events) == 200
+    assert events[-1][1] == {"i": 249}
+
+def test_connect_sqlite(tmp_path):
+    backend = connect(f"sqlite:///{tmp_path / 'coord.db'}")
+
+    assert isinstance(backend, SQLiteBackend)
+    backend.close()
+
+def test_one_submitter_per_term(tmp_path):
+    path = str(tmp_path / "coord.db")
+    a = Coordinator(SQLiteBackend(path), "student", "a", ttl=10)
+    b = Coordinator(SQLiteBackend(path), "student", "b", ttl=10)
+
+    assert a.lock_submit("fall")
+    assert not b.lock_submit("fall")
+    assert a.lock_submit("fall")
+    assert b.submitter("fall") == "a"
+
+    a.unlock_submit("fall")
+    assert b.lock_submit("fall")
+    a.close()
+    b.close()
+
+def test_close_hands_over_leases(tmp_path):
+    path = str(tmp_path / "coord.db")
+    a = Coordinator(SQLiteBackend(path), "student", "a", ttl=10)
+    b = Coordinator(SQLiteBackend(path), "student", "b", ttl=10)
+    a.lock_submit("fall")
+
+    assert sorted(b.backend.members("classbot:student:node:")) == ["a", "b"]
+    a.close()
+    assert b.lock_submit("fall")
+    b.close()
+
+def test_nodes_take_turns(tmp_path):
+    path = str(tmp_path / "coord.db")
+    a = Coordinator(SQLiteBackend(path), "student", "a", ttl=10)
+    b = Coordinator(SQLiteBackend(path), "student", "b", ttl=10)
+    b._beat_at = 0.0
+
+    assert b.nodes == ["a", "b"]
+    assert b.turn("fall", 10) == 0.0
+    assert 0 < a.turn("fall", 10) <= 5
+    a.close()
+    b.close()
+
+def test_events_reach_other_nodes(tmp_path):
+    path = str(tmp_path / "coord.db")
+    a = Coordinator(SQLiteBackend(path), "student", "a", ttl=10)
+    b = Coordinator(SQLiteBackend(path), "student", "b", ttl=10)
+    a.publish("seat_open", "fall", course="COP3014")
+
+    assert a.poll() == []
+    events = b.poll()
+    assert [(e["kind"], e["course"]) for e in events] == [("seat_open", "COP3014")]
+    assert b.poll() == []
+    a.close()
+    b.close()
@@ -0,0 +1,69 @@
+import pytest
+import requests
+
+from classbot.scripts.fsu_fastpath import FSU_FastPath, FastPathExpired
+from classbot.scripts.fsu_enroll import FSU_Enroller, EmptyCartException
+
+def check_cart(cart_rows):
+    FSU_Enroller.check_cart(None, cart_rows)
+
+def fastpath(peoplesoft) -> FSU_FastPath:
+    """A fast path seeded the way from_driver would, off the cart page"""
+
+    response = requests.get(peoplesoft.cart_url, cookies={peoplesoft.cookie_name: peoplesoft.token})
+    return FSU_FastPath(response.url, response.text, [peoplesoft.cookie])
+
+def test_full_classes_report_errors(peoplesoft):
+    results = fastpath(peoplesoft).cycle(check_cart)
+
+    assert set(results) == {"COP3014", "MAC2311"}
+    assert not any(r["enrolled"] for r in results.values())
+    assert "class is full" in results["COP3014"]["message"]
+    assert peoplesoft.page == "cart"
+
+def test_open_seat_enrolls(peoplesoft):
+    peoplesoft.open_seat("MAC 2311")
+    results = fastpath(peoplesoft).cycle(check_cart)
+
+    assert results["MAC2311"]["enrolled"]
+    assert not results["COP3014"]["enrolled"]
+    assert peoplesoft.enrolled == ["MAC 2311"]
+
+def test_cycles_back_to_back(peoplesoft):
+    path = fastpath(peoplesoft)
+    path.cycle(check_cart)
+    peoplesoft.open_seat("COP 3014")
+    results = path.cycle(check_cart)
+
+    assert results["COP3014"]["enrolled"]
+
+def test_gate_skips_submit_and_refreshes_next_time(peoplesoft):
+    path = fastpath(peoplesoft)
+
+    assert path.cycle(check_cart, gate=lambda rows: False) == {}
+    assert path.stale
+    assert peoplesoft.page == "cart"
+
+    peoplesoft.open_seat("COP 3014")
+    results = path.cycle(check_cart, gate=lambda rows: any(r.status == "open" for r in rows))
+    assert results["COP3014"]["enrolled"]
+
+def test_expired_session_falls_back(peoplesoft):
+    path = fastpath(peoplesoft)
+    peoplesoft.expire()
+
+    with pytest.raises(FastPathExpired):
+        path.cycle(check_cart)
+
+def test_network_error_falls_back(peoplesoft):
+    path = fastpath(peoplesoft)
+    peoplesoft.stop()
+
+    with pytest.raises(FastPathExpired):
+        path.cycle(check_cart)
+
+def test_empty_cart(peoplesoft):
+    peoplesoft.cart = []
+
+    with pytest.raises(EmptyCartException):
+        fastpath(peoplesoft).cycle(check_cart)
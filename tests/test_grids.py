@@ -0,0 +1,64 @@
+import pytest
+
+from classbot.fakes.fakesoft import FakePeopleSoft, SUCCESS_MSG
+from classbot.scripts.fsu_enroll import FSU_Enroller, EmptyCartException
+from classbot.utils.drivertools import CartRow, ResultRow
+from classbot.utils.pshtml import parse_html, read_grid_html
+
+def rendered(page: str, **state) -> str:
+    """A fake PeopleSoft page, without serving it"""
+
+    fake = FakePeopleSoft()
+    fake.httpd.server_close()
+    for key, value in state.items():
+        setattr(fake, key, value)
+    fake.page = page
+    return fake.render()
+
+def test_cart_rows():
+    page = parse_html(rendered("cart", open={"MAC 2311"}))
+    header, *rows = read_grid_html(page, "SSR_REGFORM_VW$scroll$0", CartRow)
+
+    assert [r.course_code for r in rows] == ["COP3014", "MAC2311"]
+    assert [r.status for r in rows] == ["closed", "open"]
+
+def test_result_rows():
+    page = parse_html(rendered("results", last_results=[
+        ("COP 3014", SUCCESS_MSG), ("MAC 2311", "Error: Unable to add class - class is full."),
+    ]))
+    header, *rows = read_grid_html(page, "SSR_SS_ERD_ER$scroll$0", ResultRow)
+
+    assert [r.course_code for r in rows] == ["COP3014", "MAC2311"]
+    assert [r.enrolled for r in rows] == [True, False]
+    assert rows[1].message == "Error: Unable to add class - class is full."
+
+def test_result_message_drops_markup():
+    row = ResultRow("", [
+        {"span": "COP 3014", "div": None},
+        {"span": None, "div": "<b>Error:</b> Class is full.\nMore details"},
+    ])
+
+    assert row.course_code == "COP3014"
+    assert row.message.strip() == "Class is full."
+    assert not row.enrolled
+
+def test_cart_row_without_status():
+    row = CartRow("", [{"span": None, "img": None}, {"span": "COP 3014", "img": None}])
+
+    assert row.course_code == "COP3014"
+    assert row.status is None
+
+def test_check_cart_empty():
+    page = parse_html(rendered("cart", cart=[]))
+    rows = read_grid_html(page, "SSR_REGFORM_VW$scroll$0", CartRow)
+
+    with pytest.raises(EmptyCartException):
+        FSU_Enroller.check_cart(None, rows)
+
+def test_check_cart_with_classes():
+    page = parse_html(rendered("cart"))
+    FSU_Enroller.check_cart(None, read_grid_html(page, "SSR_REGFORM_VW$scroll$0", CartRow))
+
+def test_check_cart_too_few_rows():
+    with pytest.raises(EmptyCartException):
+        FSU_Enroller.check_cart(None, [CartRow("Class", [])])
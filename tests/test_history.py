@@ -0,0 +1,28 @@
+from classbot.history import AttemptHistory, connect
+
+def test_loops_and_attempts_are_saved(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = AttemptHistory(path, flush_interval=0.05)
+    history.record("alice", 1.5, {"cart": 0.5}, {"COP3014": "closed", "MAC2311": "open"},
+        {"MAC2311": {"enrolled": True, "message": "Success"}})
+    history.record("alice", 1.0, {"cart": 0.4}, {"COP3014": "closed"}, {})
+
+    assert history.close()
+    conn = connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM loops").fetchone() == (2,)
+    assert conn.execute(
+        "SELECT course, status, submitted, enrolled FROM attempts ORDER BY loop_id, course"
+    ).fetchall() == [
+        ("COP3014", "closed", 0, 0),
+        ("MAC2311", "open", 1, 1),
+        ("COP3014", "closed", 0, 0),
+    ]
+    conn.close()
+
+def test_full_queue_drops(tmp_path):
+    history = AttemptHistory(str(tmp_path / "history.db"), flush_interval=60, max_size=2)
+    for _ in range(5):
+        history.record("alice", 1.0, {}, {}, {})
+
+    assert history.dropped == 3
+    history.close()
@@ -0,0 +1,87 @@
+import threading
+
+from classbot.utils import DiscordNotifier, NotifierQueue
+from classbot.utils.webhook import WebhookTransport
+
+class StubNotifier():
+    """Records calls, and holds the first one until released"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def send_embed(self, **kwargs):
+        self.release.wait(5)
+        self.calls.append(("send_embed", kwargs))
+        return {"id": str(len(self.calls))}
+
+    def update_embed(self, message, **kwargs):
+        self.calls.append(("update_embed", kwargs))
+        return dict(message, **{k: v for k, v in kwargs.items() if v is not None})
+
+    def delete_message(self, message):
+        self.calls.append(("delete_message", message["id"]))
+
+def test_sends_resolve_their_handle():
+    stub = StubNotifier()
+    stub.release.set()
+    queue = NotifierQueue(stub)
+    message = queue.send_embed(title="a", description="b")
+
+    assert queue.close()
+    assert message["id"] == "1"
+
+def test_updates_coalesce():
+    stub = StubNotifier()
+    queue = NotifierQueue(stub)
+    message = queue.send_embed(title="a", description="b")
+    for i in range(5):
+        queue.update_embed(message, description=f"loop {i}")
+    queue.update_embed(message, title="done")
+    stub.release.set()
+
+    assert queue.close()
+    updates = [kwargs for method, kwargs in stub.calls if method == "update_embed"]
+    assert len(updates) == 1
+    assert updates[0]["description"] == "loop 4"
+    assert updates[0]["title"] == "done"
+
+def test_delete_drops_queued_updates():
+    stub = StubNotifier()
+    queue = NotifierQueue(stub)
+    message = queue.send_embed(title="a", description="b")
+    queue.update_embed(message, description="never sent")
+    queue.delete_message(message)
+    stub.release.set()
+
+    assert queue.close()
+    assert [method for method, _ in stub.calls] == ["send_embed", "delete_message"]
+
+def test_full_queue_drops():
+    stub = StubNotifier()
+    queue = NotifierQueue(stub, max_size=2)
+    handles = [queue.send_embed(title=str(i), description="") for i in range(5)]
+    stub.release.set()
+
+    assert queue.close()
+    assert queue.dropped >= 2
+    assert handles[-1].ready.is_set()
+
+def test_webhook_rate_limits_are_waited_out(webhook):
+    transport = WebhookTransport()
+    notifier = DiscordNotifier(webhook.webhook_url(), transport=transport, url_base=webhook.url_base)
+    messages = [notifier.send_embed(title=str(i), description="") for i in range(7)]
+
+    assert [m["id"] for m in messages] == [str(i) for i in range(1, 8)]
+    assert len(webhook.messages) == 7
+    assert transport.waited > 0
+    transport.close()
+
+def test_webhook_update_and_delete(webhook):
+    notifier = DiscordNotifier(webhook.webhook_url(), url_base=webhook.url_base)
+    message = notifier.send_message("hello")
+    notifier.update_message(message, "edited")
+
+    assert webhook.messages[message["id"]]["content"] == "edited"
+    notifier.delete_message(message)
+    assert message["id"] not in webhook.messages
@@ -0,0 +1,56 @@
+from classbot.scripts.fsu_recovery import RecoveryPolicy, State, Action, BUDGETS, LADDERS
+
+def test_cart_ladder_escalates():
+    policy = RecoveryPolicy()
+    actions = [policy.next_action(State.CART) for _ in range(4)]
+
+    assert actions == [Action.FRAME, Action.REFRESH, Action.NAV, Action.LOGIN]
+
+def test_ladder_stays_on_last_rung():
+    policy = RecoveryPolicy()
+    for _ in range(len(LADDERS[State.CART])):
+        policy.next_action(State.CART)
+
+    assert policy.next_action(State.CART) == Action.LOGIN
+
+def test_budget_runs_out():
+    policy = RecoveryPolicy()
+    actions = [policy.next_action(State.NAV) for _ in range(BUDGETS[State.NAV])]
+
+    assert None not in actions
+    assert policy.next_action(State.NAV) is None
+
+def test_budget_overrides():
+    policy = RecoveryPolicy({"cart": 1})
+
+    assert policy.next_action(State.CART) == Action.FRAME
+    assert policy.next_action(State.CART) is None
+
+def test_budgets_are_per_state():
+    policy = RecoveryPolicy({"duo": 1})
+    policy.next_action(State.DUO)
+
+    assert policy.next_action(State.CART) == Action.FRAME
+    assert policy.next_action(State.DUO) is None
+
+def test_progress_resets_budgets():
+    policy = RecoveryPolicy({"cart": 2})
+    policy.next_action(State.CART)
+    policy.next_action(State.CART)
+
+    assert policy.progressed() is not None
+    assert policy.next_action(State.CART) == Action.FRAME
+    assert policy.recover_times.count == 1
+
+def test_progress_without_failures():
+    policy = RecoveryPolicy()
+
+    assert policy.progressed() is None
+    assert policy.summary() == ""
+
+def test_summary_counts_actions():
+    policy = RecoveryPolicy()
+    policy.next_action(State.CART)
+    policy.progressed()
+
+    assert "frame `1`" in policy.summary()
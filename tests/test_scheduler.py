@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from classbot.utils.scheduler import PollScheduler, PollWindow
+
+def scheduler(**kwargs) -> PollScheduler:
+    return PollScheduler(**dict(dict(base=2, floor=1, ceiling=30, jitter=0), **kwargs))
+
+def test_tightens_to_floor_when_healthy():
+    sched = scheduler()
+    for _ in range(20):
+        sched.record(0.5)
+        decision = sched.next_delay()
+
+    assert decision.delay == 1
+    assert decision.reason == "healthy, tightening"
+
+def test_backs_off_on_errors_up_to_ceiling():
+    sched = scheduler()
+    delays = []
+    for _ in range(10):
+        sched.record(0.5, error=True)
+        delays.append(sched.next_delay().delay)
+
+    assert delays[-1] == 30
+    assert delays == sorted(delays)
+    assert "backing off" in sched.decisions[-1].reason
+
+def test_backs_off_when_slow():
+    sched = scheduler()
+    sched.record(0.5)
+    sched.next_delay()
+    for _ in range(5):
+        sched.record(5.0)
+    decision = sched.next_delay()
+
+    assert "slower than baseline" in decision.reason
+    assert decision.delay > 1
+
+def test_jitter_stays_in_bounds():
+    sched = scheduler(jitter=0.5)
+    for _ in range(50):
+        sched.record(0.5)
+        assert 1 <= sched.next_delay().delay <= 30
+
+def test_window_uses_window_floor():
+    now = datetime.now()
+    window = PollWindow(f"{(now - timedelta(hours=1)).isoformat()}/{(now + timedelta(hours=1)).isoformat()}")
+    sched = scheduler(windows=[window], window_floor=0.25)
+    sched.record(0.5, error=True)
+
+    assert sched.next_delay().delay == 0.25
+
+def test_daily_window_wraps_midnight():
+    window = PollWindow("23:00-01:00")
+
+    assert window.contains(datetime(2023, 1, 1, 23, 30))
+    assert window.contains(datetime(2023, 1, 1, 0, 30))
+    assert not window.contains(datetime(2023, 1, 1, 12, 0))